@@ -0,0 +1,276 @@
+# benchmark.py
+# Genera una base de datos sintética con volúmenes reales y mide las
+# operaciones principales por sus caminos no interactivos. El resultado se
+# guarda en JSON para comparar corridas antes y después de un cambio.
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import time
+from datetime import date, timedelta
+
+import conexion_db
+from config_db import migrar
+from conexion_db import obtener_conexion, transaccion
+from dinero import Dinero
+from fechas import a_dia
+from personas import DESCUENTO_SOCIO_INVITADO
+
+# Cuotas en centavos, como se guardan en la base
+DEPORTES = (("Futbol", Dinero(100000)), ("Tenis", Dinero(80000)), ("Natacion", Dinero(60000)),
+            ("Hockey", Dinero(90000)))
+CUOTA_SOCIAL = Dinero(300000)
+METODOS_PAGO = ("Efectivo", "Credito", "Debito", "Transferencia")
+NOMBRES = ("Juan", "María", "José", "Ana", "Luis", "Lucía", "Carlos", "Sofía", "Martín", "Valentina",
+           "Diego", "Camila", "Jorge", "Julieta", "Pablo", "Florencia", "Tomás", "Agustina")
+APELLIDOS = ("González", "Rodríguez", "Gómez", "Fernández", "López", "Díaz", "Martínez", "Pérez",
+             "García", "Sánchez", "Romero", "Sosa", "Álvarez", "Torres", "Ruiz", "Ramírez", "Núñez")
+TAMANO_LOTE = 50000
+DNI_SOCIOS = 20000000
+DNI_INVITADOS = 40000000
+DNI_NO_SOCIOS = 60000000
+
+
+def _en_lotes(filas):
+    lote = []
+    for fila in filas:
+        lote.append(fila)
+        if len(lote) >= TAMANO_LOTE:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+
+def _insertar(conexion, consulta, filas):
+    for lote in _en_lotes(filas):
+        with transaccion(conexion):
+            conexion.executemany(consulta, lote)
+
+
+def generar_datos(conexion, socios, no_socios, pagos, anios, semilla=1):
+    # Llena una base recién migrada. Devuelve los volúmenes generados.
+    azar = random.Random(semilla)
+    hoy = date.today()
+    inicio = hoy.replace(year=hoy.year - anios, day=1)
+    dias_historia = (hoy - inicio).days
+
+    with transaccion(conexion):
+        conexion.executemany("""
+            INSERT INTO deportes (nombre, dias, horarios, profesor, cupos, cuota)
+            VALUES (?, 'Lunes y Miércoles', '18:00', 'Profesor', ?, ?)
+        """, [(nombre, socios + no_socios, cuota) for nombre, cuota in DEPORTES])
+
+    def personas():
+        for i in range(socios):
+            inscripcion = inicio + timedelta(days=azar.randrange(dias_historia))
+            yield (str(DNI_SOCIOS + i), azar.choice(NOMBRES), azar.choice(APELLIDOS), "Calle Falsa 123",
+                   str(1100000000 + i), f"socio{i}@club.com", inscripcion.isoformat(), CUOTA_SOCIAL,
+                   a_dia(inscripcion + timedelta(days=30)))
+    _insertar(conexion, """
+        INSERT INTO socios (dni, nombre, apellido, domicilio, telefono, email, fecha_inscripcion, cuota_social, fecha_vencimiento)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, personas())
+
+    # Invitados: cada socio invita de 0 a 3 personas (el máximo permitido)
+    invitados = []
+    for i in range(socios):
+        for _ in range(azar.choice((0, 0, 0, 1, 1, 2, 3))):
+            invitados.append((azar.choice(NOMBRES), azar.choice(APELLIDOS),
+                              str(DNI_INVITADOS + len(invitados)), str(DNI_SOCIOS + i)))
+    _insertar(conexion, """
+        INSERT INTO invitados (nombre, apellido, dni, socio_dni) VALUES (?, ?, ?, ?)
+    """, invitados)
+
+    _insertar(conexion, """
+        INSERT INTO no_socios (dni, nombre, apellido, telefono, email) VALUES (?, ?, ?, ?, ?)
+    """, ((str(DNI_NO_SOCIOS + i), azar.choice(NOMBRES), azar.choice(APELLIDOS),
+           str(1500000000 + i), f"nosocio{i}@mail.com") for i in range(no_socios)))
+
+    # Inscripciones: un cuarto de los socios y de los no socios en algún deporte
+    inscripciones = []
+    for dni, descuento in ([(str(DNI_SOCIOS + i), DESCUENTO_SOCIO_INVITADO) for i in range(0, socios, 4)]
+                           + [(str(DNI_NO_SOCIOS + i), 0) for i in range(0, no_socios, 4)]):
+        nombre, cuota = azar.choice(DEPORTES)
+        inscripciones.append((dni, nombre, cuota.con_descuento(descuento),
+                              a_dia(hoy + timedelta(days=azar.randrange(-30, 30)))))
+    _insertar(conexion, """
+        INSERT INTO inscripciones (dni_socio, nombre, cuota, fecha_vencimiento) VALUES (?, ?, ?, ?)
+    """, inscripciones)
+
+    # Historia de pagos repartida en los años pedidos
+    def historia():
+        for _ in range(pagos):
+            fecha_pago = inicio + timedelta(days=azar.randrange(dias_historia + 1))
+            if azar.random() < 0.6:
+                dni, monto, tipo_pago, tipo_persona = (
+                    str(DNI_SOCIOS + azar.randrange(socios)), CUOTA_SOCIAL, "Cuota Social", "Socio")
+            else:
+                nombre, cuota = azar.choice(DEPORTES)
+                if azar.random() < 0.7:
+                    dni, monto, tipo_persona = (str(DNI_SOCIOS + azar.randrange(socios)),
+                                                cuota.con_descuento(DESCUENTO_SOCIO_INVITADO), "Socio")
+                else:
+                    dni, monto, tipo_persona = str(DNI_NO_SOCIOS + azar.randrange(no_socios)), cuota, "No Socio"
+                tipo_pago = f"Cuota {nombre}"
+            yield (dni, monto, tipo_pago, azar.choice(METODOS_PAGO), a_dia(fecha_pago), tipo_persona,
+                   a_dia(fecha_pago) + 30)
+    _insertar(conexion, """
+        INSERT INTO rendicion_cuentas (dni, monto, tipo_pago, metodo_pago, fecha_pago, tipo_persona, fecha_vencimiento)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """, historia())
+
+    conexion.execute("ANALYZE")
+    conexion.commit()
+    return {"socios": socios, "invitados": len(invitados), "no_socios": no_socios,
+            "inscripciones": len(inscripciones), "rendicion_cuentas": pagos, "anios": anios}
+
+
+def medir(operacion, repeticiones):
+    # Devuelve estadísticas en milisegundos; la salida por pantalla se descarta
+    tiempos = []
+    for _ in range(repeticiones):
+        with contextlib.redirect_stdout(io.StringIO()):
+            inicio = time.perf_counter()
+            operacion()
+            tiempos.append((time.perf_counter() - inicio) * 1000)
+    tiempos.sort()
+    return {
+        "repeticiones": repeticiones,
+        "min_ms": round(tiempos[0], 3),
+        "mediana_ms": round(statistics.median(tiempos), 3),
+        "p95_ms": round(tiempos[min(len(tiempos) - 1, int(len(tiempos) * 0.95))], 3),
+        "media_ms": round(statistics.fmean(tiempos), 3),
+    }
+
+
+def correr_benchmarks(repeticiones):
+    # Importaciones acá: los módulos del club se cargan después de fijar la base
+    from club_deportivo import ClubDeportivo
+    from main import validar_credenciales
+    from servicios import ServicioClub
+
+    club = ClubDeportivo("admin")
+    servicio = ServicioClub()
+    mes_actual = date.today().strftime("%m-%Y")
+    # Cada pago usa un no socio distinto que todavía no está inscrito
+    candidatos = iter([fila[0] for fila in obtener_conexion().execute("""
+        SELECT dni FROM no_socios n
+        WHERE NOT EXISTS (SELECT 1 FROM inscripciones i WHERE i.dni_socio = n.dni)
+        LIMIT ?
+    """, (repeticiones * 10,))])
+    deportes = iter(DEPORTES * (repeticiones * 10))
+
+    operaciones = {
+        "login": lambda: validar_credenciales("admin", "admin123"),
+        "tiene_permiso": lambda: club.tiene_permiso("rendicion_cuentas"),
+        "pagar_cuota_deportiva": lambda: servicio.pagar_cuota_deportiva(
+            next(candidatos), next(deportes)[0], "Efectivo"),
+        "listar_deportes": club.listar_deportes,
+        "listar_deportes_conteos": lambda: club.listar_deportes(solo_conteos=True),
+        "obtener_rendimiento_mes": lambda: club.obtener_rendimiento_mes(mes_actual),
+        "generar_reporte_mes_txt": lambda: club.generar_reporte_mes_txt(mes_actual),
+        "rendimiento_general": club.rendimiento_general,
+    }
+    # Las operaciones livianas se repiten más para que la medición sea estable
+    multiplicador = {"login": 100, "tiene_permiso": 1000, "pagar_cuota_deportiva": 10}
+    return {nombre: medir(operacion, repeticiones * multiplicador.get(nombre, 1))
+            for nombre, operacion in operaciones.items()}
+
+
+def verificar(conexion):
+    # Los menús imprimen los errores en lugar de lanzarlos (y medir() descarta
+    # la salida): se comparan sus resultados con consultas directas para que
+    # una operación rota no pase por rápida. Devuelve la lista de fallas.
+    from rendicion import rango_mes
+    from servicios import ServicioClub
+
+    servicio = ServicioClub(conexion)
+    fallas = []
+    mes_actual = date.today().strftime("%m-%Y")
+    desde, hasta = rango_mes(mes_actual)
+    esperado_mes = conexion.execute(
+        "SELECT COALESCE(SUM(monto), 0) FROM rendicion_cuentas WHERE fecha_pago BETWEEN ? AND ?",
+        (a_dia(desde), a_dia(hasta))).fetchone()[0]
+    if servicio.liquidacion_mensual(mes_actual).total_mes != esperado_mes:
+        fallas.append("liquidación del mes distinta de la suma de sus pagos")
+    if servicio.rendimiento_general()[1] != conexion.execute(
+            "SELECT COALESCE(SUM(monto), 0) FROM rendicion_cuentas").fetchone()[0]:
+        fallas.append("rendimiento general distinto de la suma de los pagos")
+    try:
+        with open(f"reporte_{mes_actual}.txt", encoding="utf-8") as archivo:
+            if f"Total de todos los pagos en el mes: {Dinero(esperado_mes):.2f}" not in archivo.read():
+                fallas.append("el reporte del mes no tiene el total esperado")
+    except OSError:
+        fallas.append("no se generó el reporte del mes")
+    sobreventa = conexion.execute("""
+        SELECT COUNT(*) FROM deportes d
+        WHERE d.inscritos <> (SELECT COUNT(*) FROM inscripciones i WHERE i.nombre = d.nombre)
+           OR d.inscritos > d.cupos
+    """).fetchone()[0]
+    if sobreventa:
+        fallas.append(f"{sobreventa} deportes con contador de inscritos inconsistente o sobrevendidos")
+    return fallas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de la base de datos del club.")
+    parser.add_argument("--directorio", default="benchmark_club",
+                        help="Carpeta de trabajo (base, reportes y tickets)")
+    parser.add_argument("--socios", type=int, default=100000)
+    parser.add_argument("--no-socios", type=int, default=20000)
+    parser.add_argument("--pagos", type=int, default=2000000, help="Filas de rendicion_cuentas")
+    parser.add_argument("--anios", type=int, default=3, help="Años de historia de pagos")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--reusar", action="store_true",
+                        help="Usar la base ya generada en el directorio")
+    parser.add_argument("--salida", default="benchmark.json", help="Archivo JSON de resultados")
+    args = parser.parse_args()
+
+    salida = os.path.abspath(args.salida)
+    os.makedirs(args.directorio, exist_ok=True)
+    os.chdir(args.directorio)
+    resultado = {
+        "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "plataforma": platform.platform(),
+    }
+
+    existe = os.path.exists(conexion_db.RUTA_DB)
+    if existe and not args.reusar:
+        for sufijo in ("", "-wal", "-shm"):
+            if os.path.exists(conexion_db.RUTA_DB + sufijo):
+                os.remove(conexion_db.RUTA_DB + sufijo)
+    conexion = obtener_conexion()
+    migrar(conexion)
+    if not (existe and args.reusar):
+        print("Generando datos...")
+        inicio = time.perf_counter()
+        resultado["volumenes"] = generar_datos(
+            conexion, args.socios, args.no_socios, args.pagos, args.anios)
+        resultado["generacion_s"] = round(time.perf_counter() - inicio, 2)
+
+    print("Midiendo operaciones...")
+    resultado["operaciones"] = correr_benchmarks(args.repeticiones)
+    with open(salida, "w", encoding="utf-8") as archivo:
+        json.dump(resultado, archivo, indent=2, ensure_ascii=False)
+
+    for nombre, medicion in resultado["operaciones"].items():
+        print(f"{nombre:<26} mediana {medicion['mediana_ms']:>10.3f} ms   p95 {medicion['p95_ms']:>10.3f} ms")
+    print(f"Resultados en {salida}")
+
+    fallas = verificar(obtener_conexion())
+    for falla in fallas:
+        print(f"ERROR: {falla}")
+    if fallas:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
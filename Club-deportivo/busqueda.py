@@ -0,0 +1,52 @@
+# busqueda.py
+import re
+from collections import namedtuple
+
+from conexion_db import obtener_conexion
+
+LIMITE_RESULTADOS = 20
+
+Resultado = namedtuple("Resultado", "tipo dni nombre apellido")
+
+# tabla -> (tabla FTS5, tipo de persona). Las tablas FTS5 se crean en
+# config_db.migracion_busqueda y los triggers las mantienen al día.
+TABLAS_BUSQUEDA = {
+    "socios": ("socios_fts", "Socio"),
+    "no_socios": ("no_socios_fts", "No Socio"),
+    "invitados": ("invitados_fts", "Invitado"),
+    "profesores": ("profesores_fts", "Profesor"),
+}
+
+# bm25() depende de las estadísticas de cada tabla FTS5 (cantidad de filas,
+# largo promedio): los puntajes de tablas distintas no se pueden comparar.
+# Cada tabla se ordena por su propio bm25 y los resultados se intercalan por
+# puesto dentro de su tabla; a igual puesto, en el orden de TABLAS_BUSQUEDA.
+CONSULTA_BUSQUEDA = "SELECT tipo, dni, nombre, apellido FROM (" + " UNION ALL ".join(f"""
+    SELECT tipo, dni, nombre, apellido, {orden} AS orden,
+           row_number() OVER (ORDER BY rango) AS puesto
+    FROM (SELECT '{tipo}' AS tipo, t.dni, t.nombre, t.apellido, bm25({fts}) AS rango
+          FROM {fts}
+          JOIN {tabla} t ON t.id = {fts}.rowid
+          WHERE {fts} MATCH :consulta
+          ORDER BY rango LIMIT :limite)
+""" for orden, (tabla, (fts, tipo)) in enumerate(TABLAS_BUSQUEDA.items())) + """)
+    ORDER BY puesto, orden LIMIT :limite"""
+
+PATRON_PALABRA = re.compile(r"\w+")
+
+
+def consulta_fts(texto):
+    # Cada palabra se busca como prefijo y todas deben aparecer: "per ju" -> "per"* "ju"*
+    # Las comillas evitan que el texto se interprete como sintaxis de FTS5.
+    return " ".join(f'"{palabra}"*' for palabra in PATRON_PALABRA.findall(texto))
+
+
+def buscar_personas(texto, conexion=None, limite=LIMITE_RESULTADOS):
+    # Busca por nombre, apellido, DNI, email o teléfono, sin distinguir
+    # mayúsculas ni tildes; los mejores resultados primero
+    consulta = consulta_fts(texto)
+    if not consulta:
+        return []
+    conexion = conexion or obtener_conexion()
+    filas = conexion.execute(CONSULTA_BUSQUEDA, {"consulta": consulta, "limite": limite}).fetchall()
+    return [Resultado(*fila) for fila in filas]
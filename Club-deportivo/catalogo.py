@@ -0,0 +1,85 @@
+# catalogo.py
+import threading
+from collections import namedtuple
+from types import MappingProxyType
+
+from conexion_db import obtener_conexion, transaccion
+from dinero import Dinero
+
+Deporte = namedtuple("Deporte", "nombre dias horarios profesor cupos cuota")
+
+
+class CatalogoDeportes:
+    # Copia en memoria de la tabla deportes. Se carga una vez y se reemplaza
+    # entera en cada cambio (nunca se modifica en el lugar), así los lectores
+    # de cualquier hilo ven siempre un catálogo completo y coherente.
+    # Las escrituras van primero a la base y después al catálogo.
+    def __init__(self):
+        self._deportes = None
+        self._versiones = {}
+        self._candado = threading.Lock()
+
+    def recargar(self, conexion=None):
+        conexion = conexion or obtener_conexion()
+        version = conexion.execute("PRAGMA data_version").fetchone()[0]
+        filas = conexion.execute(
+            "SELECT nombre, dias, horarios, profesor, cupos, cuota FROM deportes ORDER BY nombre").fetchall()
+        with self._candado:
+            self._deportes = MappingProxyType(
+                {fila[0]: Deporte(*fila[:5], Dinero(fila[5])) for fila in filas})
+            self._versiones = {id(conexion): version}
+        return self._deportes
+
+    @property
+    def deportes(self):
+        return self._deportes if self._deportes is not None else self.recargar()
+
+    def nombres(self):
+        return tuple(self.deportes)
+
+    def obtener(self, nombre):
+        deporte = self.deportes.get(nombre)
+        if deporte is None:
+            # Puede haberlo dado de alta otro proceso: se relee una vez
+            deporte = self.recargar().get(nombre)
+        return deporte
+
+    def vigente(self, nombre, conexion=None):
+        # Como obtener(), para cobrar: si otra conexión (otro puesto u otro
+        # proceso) confirmó cambios desde la última lectura, PRAGMA
+        # data_version cambió y el catálogo se relee. Mientras no cambie, el
+        # precio y el cupo salen de memoria sin leer la tabla.
+        conexion = conexion or obtener_conexion()
+        version = conexion.execute("PRAGMA data_version").fetchone()[0]
+        if self._deportes is None or self._versiones.get(id(conexion)) != version:
+            self.recargar(conexion)
+        return self.obtener(nombre)
+
+    def validar(self, nombre):
+        nombre = nombre.strip().capitalize()
+        if self.obtener(nombre) is None:
+            if not self.deportes:
+                raise ValueError("No hay deportes configurados.")
+            raise ValueError(f"El deporte debe ser uno de: {', '.join(self.nombres())}.")
+        return nombre
+
+    def guardar(self, nombre, dias, horarios, profesor, cupos, cuota, conexion=None):
+        # Alta o modificación: se escribe en la base y, confirmado, en el catálogo
+        with transaccion(conexion) as conexion:
+            conexion.execute("""
+                INSERT INTO deportes (nombre, dias, horarios, profesor, cupos, cuota)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(nombre)
+                DO UPDATE SET dias=excluded.dias, horarios=excluded.horarios, profesor=excluded.profesor,
+                              cupos=excluded.cupos, cuota=excluded.cuota
+            """, (nombre, dias, horarios, profesor, cupos, cuota))
+        deporte = Deporte(nombre, dias, horarios, profesor, cupos, Dinero(cuota))
+        actuales = self.deportes
+        with self._candado:
+            deportes = dict(actuales)
+            deportes[nombre] = deporte
+            self._deportes = MappingProxyType(dict(sorted(deportes.items())))
+        return deporte
+
+
+CATALOGO = CatalogoDeportes()
@@ -1,39 +1,55 @@
 import sqlite3
-from datetime import datetime, timedelta
-import re
+import sys
+from datetime import datetime
+from catalogo import CATALOGO
+from conexion_db import obtener_conexion
+from dinero import Dinero
+from fechas import formatear_dia
+from permisos import PERMISOS, cargar_permisos, version_local, version_permisos
+from servicios import MAX_INVITADOS_POR_SOCIO, ErrorOperacion, ServicioClub
+from trazas import trazar
+from validaciones import ErrorValidacion, validar_campo
 
 
 class ClubDeportivo:
     def __init__(self, usuario):
         self.usuario = usuario
-        self.rol = self.obtener_rol_usuario()
-        self.deportes = {
-            "Futbol": {"dias": "", "horarios": "", "profesor": "", "cupos": 0, "cuota": 0.0, "inscritos": []},
-            "Tenis": {"dias": "", "horarios": "", "profesor": "", "cupos": 0, "cuota": 0.0, "inscritos": []},
-            "Natacion": {"dias": "", "horarios": "", "profesor": "", "cupos": 0, "cuota": 0.0, "inscritos": []}
-        }
+        self.rol = None
+        self.permisos = frozenset()
+        self._version_permisos = None
+        self.cargar_permisos()
+        self.servicio = ServicioClub()
+        self.tickets = self.servicio.tickets
+        self.deportes = CATALOGO
 
     def conectar_db(self):
+        # Devuelve la conexión compartida del hilo; `with` sigue confirmando o
+        # deshaciendo la transacción, pero ya no abre una conexión nueva.
         try:
-            return sqlite3.connect('club_deportes.db')
+            return obtener_conexion()
         except sqlite3.Error as e:
             print(f"Error al conectar con la base de datos: {e}")
             return None
 
+    def cargar_permisos(self):
+        # Rol y permisos se cargan una vez por sesión y se recargan solo si
+        # cambió la versión de los datos
+        conexion = self.conectar_db()
+        self._version_permisos = version_permisos(conexion)
+        self.rol, self.permisos = cargar_permisos(conexion, self.usuario)
+
+    def revisar_permisos(self):
+        # Cambios confirmados por otras conexiones (PRAGMA data_version): se
+        # revisan al volver al menú principal, no en cada consulta de permiso
+        if version_permisos(self.conectar_db()) != self._version_permisos:
+            self.cargar_permisos()
+
     def obtener_rol_usuario(self):
-        with self.conectar_db() as conexion:
-            cursor = conexion.cursor()
-            cursor.execute('''
-                SELECT roles.nombre
-                FROM usuarios
-                JOIN roles ON usuarios.rol_id = roles.id
-                WHERE usuarios.usuario = ?
-            ''', (self.usuario,))
-            rol = cursor.fetchone()
-            return rol[0] if rol else None
+        return self.rol
 
     def menu_principal(self):
         while True:
+            self.revisar_permisos()
             print("\n--- Menú Principal ---")
             print("1. Gestionar Profesores")
             print("2. Deportes")
@@ -58,16 +74,20 @@ class ClubDeportivo:
                 print("Opción no válida o permiso insuficiente.")
 
     def tiene_permiso(self, permiso):
-        with self.conectar_db() as conexion:
-            cursor = conexion.cursor()
-            cursor.execute('''
-            SELECT permisos.{}
-            FROM permisos
-            JOIN usuarios ON permisos.rol_id = usuarios.rol_id
-            WHERE usuarios.usuario = ?
-        '''.format(permiso), (self.usuario,))
-        permiso_otorgado = cursor.fetchone()
-        return permiso_otorgado[0] == 1 if permiso_otorgado else False
+        if permiso not in PERMISOS:
+            raise ValueError(f"Permiso desconocido: {permiso}")
+        # Solo el contador del proceso: sin consultas a la base
+        if version_local() != self._version_permisos[0]:
+            self.cargar_permisos()
+        return permiso in self.permisos
+
+    def pedir_campo(self, esquema, campo, mensaje):
+        # Pide un dato y lo valida con el esquema compartido; None si es inválido
+        try:
+            return validar_campo(esquema, campo, input(mensaje))
+        except ErrorValidacion as e:
+            print(f"Error: {e}")
+            return None
 
     def gestion_profesores(self):
         while True:
@@ -88,108 +108,65 @@ class ClubDeportivo:
             else:
                 print("Opción inválida, intente nuevamente.")
 
+    @trazar()
     def agregar_profesor(self):
         try:
-            # Validar el DNI
-            dni = input("DNI del profesor: ")
-            if not dni.isdigit() or len(dni) != 8:  # Asumiendo un DNI de 8 dígitos numéricos
-                print("Error: El DNI debe ser un número de 8 dígitos.")
+            dni = self.pedir_campo("profesor", "dni", "DNI del profesor: ")
+            if dni is None:
                 return
-
-            # Validar el nombre (permitir tildes y caracteres especiales)
-            nombre = input("Nombre: ").strip().capitalize()
-            if not re.match("^[a-zA-ZáéíóúÁÉÍÓÚñÑ ]+$", nombre) or len(nombre) < 2:
-                print(
-                    "Error: El nombre debe contener solo letras (incluyendo tildes y ñ) y tener al menos 2 caracteres.")
+            nombre = self.pedir_campo("profesor", "nombre", "Nombre: ")
+            if nombre is None:
                 return
-
-            # Validar el apellido
-            apellido = input("Apellido: ").strip().capitalize()
-            if not re.match("^[a-zA-ZáéíóúÁÉÍÓÚñÑ ]+$", apellido) or len(apellido) < 2:
-                print(
-                    "Error: El apellido debe contener solo letras (incluyendo tildes y ñ) y tener al menos 2 caracteres.")
+            apellido = self.pedir_campo("profesor", "apellido", "Apellido: ")
+            if apellido is None:
                 return
-
-            # Validar teléfono
-            telefono = input("Teléfono: ")
-            if not telefono.isdigit() or len(telefono) < 7:
-                print(
-                    "Error: El teléfono debe ser un número válido de al menos 7 dígitos.")
+            telefono = self.pedir_campo("profesor", "telefono", "Teléfono: ")
+            if telefono is None:
                 return
-
-            # Validar domicilio
-            domicilio = input("Domicilio: ")
-            if len(domicilio) < 5:
-                print("Error: El domicilio debe tener al menos 5 caracteres.")
+            domicilio = self.pedir_campo("profesor", "domicilio", "Domicilio: ")
+            if domicilio is None:
                 return
-
-            # Validar la fecha de ingreso
-            fecha_ingreso = input("Fecha de ingreso (dd/mm/yyyy): ")
-            try:
-                fecha_ingreso_dt = datetime.strptime(
-                    fecha_ingreso, "%d/%m/%Y").date()
-            except ValueError:
-                print(
-                    "Error: El formato de la fecha de ingreso es incorrecto. Debe ser dd/mm/yyyy.")
+            fecha_ingreso_dt = self.pedir_campo(
+                "profesor", "fecha_ingreso", "Fecha de ingreso (dd/mm/yyyy): ")
+            if fecha_ingreso_dt is None:
                 return
-
-            # Validar el deporte
-            deporte = input("Deporte (Futbol, Tenis, Natacion): ").capitalize()
-            if deporte not in ["Futbol", "Tenis", "Natacion"]:
-                print("Error: El deporte debe ser Futbol, Tenis o Natacion.")
+            deporte = self.pedir_campo(
+                "profesor", "deporte", f"Deporte ({', '.join(CATALOGO.nombres())}): ")
+            if deporte is None:
                 return
 
-            # Inserta el nuevo profesor en la base de datos
-            with self.conectar_db() as conexion:
-                cursor = conexion.cursor()
-                cursor.execute('''
-                    INSERT INTO profesores (dni, nombre, apellido, telefono, domicilio, fecha_ingreso, deporte)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                ''', (dni, nombre, apellido, telefono, domicilio, fecha_ingreso_dt, deporte))
-
-                conexion.commit()
-                print("Profesor agregado exitosamente.")
+            self.servicio.agregar_profesor(
+                dni, nombre, apellido, telefono, domicilio, fecha_ingreso_dt, deporte)
+            print("Profesor agregado exitosamente.")
 
-        except sqlite3.IntegrityError:
-            print("Error: Ya existe un profesor con ese DNI.")
+        except (ErrorOperacion, ErrorValidacion) as e:
+            print(f"Error: {e}")
         except Exception as e:
             print(f"Error al agregar profesor: {e}")
 
+    @trazar()
     def eliminar_profesor(self):
         dni = input("DNI del profesor a eliminar: ")
-        with self.conectar_db() as conexion:
-            try:
-                cursor = conexion.cursor()
-                cursor.execute("DELETE FROM profesores WHERE dni=?", (dni,))
-
-                if cursor.rowcount > 0:
-                    print("Profesor eliminado exitosamente.")
-                else:
-                    print("No se encontró ningún profesor con ese DNI.")
-
-                conexion.commit()
-
-            except Exception as e:
-                print(f"Error al eliminar profesor: {e}")
+        try:
+            if self.servicio.eliminar_profesor(dni):
+                print("Profesor eliminado exitosamente.")
+            else:
+                print("No se encontró ningún profesor con ese DNI.")
+        except Exception as e:
+            print(f"Error al eliminar profesor: {e}")
 
+    @trazar()
     def listar_profesores(self):
         try:
-            with self.conectar_db() as conexion:
-                # Crear un cursor a partir de la conexión
-                cursor = conexion.cursor()
-
-                # Ejecutar la consulta
-                cursor.execute(
-                    "SELECT dni, nombre, apellido, telefono, domicilio, fecha_ingreso, deporte FROM profesores")
-                profesores = cursor.fetchall()
-
-                if profesores:
+            hay_profesores = False
+            for profesor in self.servicio.listar_profesores():
+                if not hay_profesores:
                     print("\n--- Lista de Profesores ---")
-                    for profesor in profesores:
-                        print(f"DNI: {profesor[0]}, Nombre: {profesor[1]} {profesor[2]}, Teléfono: {profesor[3]}, "
-                              f"Domicilio: {profesor[4]}, Fecha de ingreso: {profesor[5]}, Deporte: {profesor[6]}")
-                else:
-                    print("No hay profesores registrados.")
+                    hay_profesores = True
+                print(f"DNI: {profesor[0]}, Nombre: {profesor[1]} {profesor[2]}, Teléfono: {profesor[3]}, "
+                      f"Domicilio: {profesor[4]}, Fecha de ingreso: {profesor[5]}, Deporte: {profesor[6]}")
+            if not hay_profesores:
+                print("No hay profesores registrados.")
         except Exception as e:
             print(f"Error al listar los profesores: {e}")
 
@@ -198,7 +175,8 @@ class ClubDeportivo:
             print("\n--- Menú de Deportes ---")
             print("1. Configurar Deportes")
             print("2. Listar Deportes")
-            print("3. Volver")
+            print("3. Ocupación de Deportes (solo conteos)")
+            print("4. Volver")
             opcion = input("Seleccione una opción: ")
 
             if opcion == '1':
@@ -206,133 +184,116 @@ class ClubDeportivo:
             elif opcion == '2':
                 self.listar_deportes()
             elif opcion == '3':
+                self.listar_deportes(solo_conteos=True)
+            elif opcion == '4':
                 break
             else:
                 print("Opción inválida, intente nuevamente.")
 
+    @trazar()
     def configurar_deportes(self):
         while True:
             print("\n--- Configurar Deportes ---")
+            existentes = ', '.join(self.deportes.nombres()) or "ninguno"
             deporte = input(
-                "Seleccione el deporte a configurar (Futbol, Tenis, Natacion) o 'Salir' para volver: ").capitalize()
+                f"Deporte a configurar (existentes: {existentes}), uno nuevo o 'Salir' para volver: ").strip()
 
             if deporte.lower() == 'salir':
                 break
-            elif deporte in self.deportes:
-                try:
-                    # Validar y capturar días y horarios
-                    dias = input("Días: ").strip()
-                    if not dias:
-                        raise ValueError("Los días no pueden estar vacíos.")
-
-                    horarios = input("Horarios: ").strip()
-                    if not horarios:
-                        raise ValueError(
-                            "Los horarios no pueden estar vacíos.")
-
-                    # Validar y capturar nombre del profesor
-                    profesor = input(
-                        "Nombre y apellido del profesor: ").strip()
-                    if not profesor:
-                        raise ValueError(
-                            "El nombre del profesor no puede estar vacío.")
-
-                    # Validar y capturar cupos
-                    try:
-                        cupos = int(input("Cupos máximos: "))
-                        if cupos <= 0:
-                            raise ValueError(
-                                "Los cupos deben ser un número entero positivo.")
-                    except ValueError:
-                        print(
-                            "Error: Ingrese un número entero válido para los cupos.")
-                        continue
-
-                    # Validar y capturar cuota deportiva
-                    try:
-                        cuota = float(
-                            input(f"Cuota deportiva para {deporte}: "))
-                        if cuota < 0:
-                            raise ValueError(
-                                "La cuota debe ser un número positivo.")
-                    except ValueError:
-                        print(
-                            "Error: Ingrese un valor numérico válido para la cuota.")
-                        continue
-
-                    # Actualizar en la base de datos
-                    try:
-                        with self.conectar_db() as conexion:
-
-                            if conexion is None:
-                                print(
-                                    "No se pudo establecer la conexión a la base de datos.")
-                                return
-
-                            cursor = conexion.cursor()
-
-                            cursor.execute('''
-                                INSERT INTO deportes (nombre, dias, horarios, profesor, cupos, cuota)
-                                VALUES (?, ?, ?, ?, ?, ?)
-                                ON CONFLICT(nombre)
-                                DO UPDATE SET dias=?, horarios=?, profesor=?, cupos=?, cuota=?
-                            ''', (deporte, dias, horarios, profesor, cupos, cuota, dias, horarios, profesor, cupos, cuota))
-
-                            conexion.commit()
-                            print(
-                                f"{deporte} configurado exitosamente en la base de datos.")
+            try:
+                deporte = validar_campo("deporte", "nombre", deporte)
+            except ErrorValidacion as e:
+                print(f"Deporte no válido: {e.mensaje}")
+                continue
+            if self.deportes.obtener(deporte) is None:
+                confirmar = input(
+                    f"{deporte} no existe. ¿Desea agregarlo como deporte nuevo? (S/N): ").strip().upper()
+                if confirmar != "S":
+                    continue
+
+            dias = input("Días: ").strip()
+            horarios = input("Horarios: ").strip()
+            profesor = input("Nombre y apellido del profesor: ").strip()
+
+            # Validar y capturar cupos
+            try:
+                cupos = int(input("Cupos máximos: "))
+            except ValueError:
+                print("Error: Ingrese un número entero válido para los cupos.")
+                continue
 
-                    except Exception as e:
-                        print(
-                            f"Error al configurar deporte en la base de datos: {e}")
+            # Validar y capturar cuota deportiva
+            try:
+                cuota = Dinero.desde_pesos(input(f"Cuota deportiva para {deporte}: "))
+            except ValueError:
+                print("Error: Ingrese un valor numérico válido para la cuota.")
+                continue
 
-                    # Actualizar datos en el sistema
-                    self.deportes[deporte] = {
-                        'dias': dias,
-                        'horarios': horarios,
-                        'profesor': profesor,
-                        'cupos': cupos,
-                        'cuota': cuota
-                    }
+            # El catálogo se actualiza junto con la base de datos
+            try:
+                self.servicio.configurar_deporte(
+                    deporte, dias, horarios, profesor, cupos, cuota)
+                print(f"{deporte} configurado exitosamente en la base de datos.")
+            except ErrorOperacion as e:
+                print(f"Entrada inválida: {e}")
+            except Exception as e:
+                print(f"Error al configurar deporte en la base de datos: {e}")
 
-                except ValueError as ve:
-                    print(f"Entrada inválida: {ve}")
+    @trazar()
+    def listar_deportes(self, solo_conteos=False):
+        try:
+            conexion = self.conectar_db()
+            if conexion is None:
+                print("No se pudo establecer la conexión a la base de datos.")
+                return
 
+            cursor = conexion.cursor()
+            if solo_conteos:
+                cursor.execute(
+                    "SELECT nombre, cupos, inscritos FROM deportes ORDER BY nombre")
             else:
-                print("Deporte no válido. Intente nuevamente.")
+                # Una sola consulta: cada fila trae el deporte, su contador de
+                # inscritos y un DNI inscrito (NULL si no hay ninguno)
+                cursor.execute("""
+                    SELECT d.nombre, d.dias, d.horarios, d.profesor, d.cupos, d.cuota,
+                           d.inscritos, i.dni_socio
+                    FROM deportes d
+                    LEFT JOIN inscripciones i ON i.nombre = d.nombre
+                    ORDER BY d.nombre
+                """)
 
-    def listar_deportes(self):
-        try:
-            with self.conectar_db() as conexion:
-                if conexion is None:
-                    print("No se pudo establecer la conexión a la base de datos.")
-                    return
+            hay_deportes = False
+            deporte_actual = None
+            while True:
+                filas = cursor.fetchmany(500)
+                if not filas:
+                    break
+                hay_deportes = True
+
+                # Se arma el lote completo y se escribe de una vez
+                lineas = []
+                for fila in filas:
+                    if solo_conteos:
+                        nombre, cupos, inscritos = fila
+                        lineas.append(f"{nombre}: {inscritos}/{cupos} inscritos\n")
+                        continue
 
-                cursor = conexion.cursor()
-                cursor.execute(
-                    "SELECT nombre, dias, horarios, profesor, cupos, cuota FROM deportes")
-                deportes = cursor.fetchall()
-
-                if not deportes:
-                    print("No hay deportes configurados.")
-                    return
-
-                for deporte in deportes:
-                    nombre, dias, horarios, profesor, cupos, cuota = deporte
-                    print(f"\nDeporte: {nombre}\nDías: {dias}\nHorarios: {
-                        horarios}\nProfesor: {profesor}\nCupos: {cupos}\nCuota: {cuota}")
-
-                    # Obtener los inscritos para el deporte actual
-                    cursor.execute(
-                        "SELECT dni_socio FROM inscripciones WHERE nombre = ?", (nombre,))
-                    inscritos = cursor.fetchall()
-
-                    if inscritos:
-                        print("Inscritos:")
-                        for inscrito in inscritos:
-                            print(f"  DNI del inscrito: {inscrito[0]}")
-                    else:
-                        print("  No hay inscritos.")
+                    nombre, dias, horarios, profesor, cupos, cuota, inscritos, dni = fila
+                    if nombre != deporte_actual:
+                        deporte_actual = nombre
+                        lineas.append(
+                            f"\nDeporte: {nombre}\nDías: {dias}\nHorarios: {horarios}\n"
+                            f"Profesor: {profesor}\nCupos: {cupos}\nCuota: {Dinero(cuota)}\n"
+                            f"Inscritos: {inscritos}/{cupos}\n")
+                        if dni is None:
+                            lineas.append("  No hay inscritos.\n")
+                    if dni is not None:
+                        lineas.append(f"  DNI del inscrito: {dni}\n")
+                sys.stdout.write("".join(lineas))
+
+            if not hay_deportes:
+                print("No hay deportes configurados.")
+            sys.stdout.flush()
 
         except Exception as e:
             print(f"Error al listar los deportes: {e}")
@@ -345,7 +306,10 @@ class ClubDeportivo:
             print("3. gestionar No Socio")
             print("4. Pagar Cuota Deportiva")
             print("5. Listar Deportes")
-            print("6. Volver")
+            print("6. Reimprimir Ticket")
+            print("7. Cuotas Vencidas y por Vencer")
+            print("8. Buscar Persona")
+            print("9. Volver")
             opcion = input("Seleccione una opción: ")
 
             if opcion == '1':
@@ -359,6 +323,12 @@ class ClubDeportivo:
             elif opcion == '5':
                 self.listar_deportes()
             elif opcion == '6':
+                self.reimprimir_ticket()
+            elif opcion == '7':
+                self.vencimientos()
+            elif opcion == '8':
+                self.buscar_persona()
+            elif opcion == '9':
                 print("Saliendo del menú de gestión de cuotas y socios...")
                 break
             else:
@@ -386,149 +356,111 @@ class ClubDeportivo:
                 print("Saliendo del menú de gestión de socios...")
                 break
 
+    @trazar()
     def registrar_socio(self):
         try:
-            dni = input("DNI del socio: ").strip()
-            if not dni.isdigit() or len(dni) < 7 or len(dni) > 8:
-                print("Error: El DNI debe ser un número de 7 u 8 dígitos.")
+            dni = self.pedir_campo("socio", "dni", "DNI del socio: ")
+            if dni is None:
                 return
-        # Validar el nombre (permitir tildes y caracteres especiales)
-            nombre = input("Nombre: ").strip().capitalize()
-            if not re.match("^[a-zA-ZáéíóúÁÉÍÓÚñÑ ]+$", nombre) or len(nombre) < 2:
-                print(
-                    "Error: El nombre debe contener solo letras (incluyendo tildes y ñ) y tener al menos 2 caracteres.")
+            nombre = self.pedir_campo("socio", "nombre", "Nombre: ")
+            if nombre is None:
                 return
-
-            # Validar el apellido
-            apellido = input("Apellido: ").strip().capitalize()
-            if not re.match("^[a-zA-ZáéíóúÁÉÍÓÚñÑ ]+$", apellido) or len(apellido) < 2:
-                print(
-                    "Error: El apellido debe contener solo letras (incluyendo tildes y ñ) y tener al menos 2 caracteres.")
+            apellido = self.pedir_campo("socio", "apellido", "Apellido: ")
+            if apellido is None:
                 return
-            domicilio = input("Domicilio: ").strip().capitalize()
-            telefono = input("Teléfono: ").strip()
-            if not domicilio or not telefono.isdigit():
-                print(
-                    "Error: El domicilio no puede estar vacío y el teléfono debe contener solo números.")
+            domicilio = self.pedir_campo("socio", "domicilio", "Domicilio: ")
+            if domicilio is None:
                 return
-            email = input("Email: ").strip()
-            if "@" not in email or "." not in email.split("@")[-1]:
-                print("Error: El email ingresado no tiene un formato válido.")
+            telefono = self.pedir_campo("socio", "telefono", "Teléfono: ")
+            if telefono is None:
                 return
-            fecha_inscripcion = input(
-                "Fecha de inscripción (dd/mm/yyyy): ").strip()
-            try:
-                fecha_inscripcion_dt = datetime.strptime(
-                    fecha_inscripcion, "%d/%m/%Y").date()
-            except ValueError:
-                print("Error: Formato de fecha inválido. Debe ser dd/mm/yyyy.")
+            email = self.pedir_campo("socio", "email", "Email: ")
+            if email is None:
                 return
-            try:
-                cuota_social = float(input("Cuota social: "))
-                if cuota_social <= 0:
-                    print("Error: La cuota social debe ser un número positivo.")
-                    return
-            except ValueError:
-                print("Error: La cuota social debe ser un número.")
+            fecha_inscripcion_dt = self.pedir_campo(
+                "socio", "fecha_inscripcion", "Fecha de inscripción (dd/mm/yyyy): ")
+            if fecha_inscripcion_dt is None:
+                return
+            cuota_social = self.pedir_campo(
+                "socio", "cuota_social", "Cuota social: ")
+            if cuota_social is None:
+                return
+            metodo_pago = self.pedir_campo(
+                "socio", "metodo_pago", "Método de pago (Efectivo, Debito, Credito, Transferencia): ")
+            if metodo_pago is None:
                 return
 
-            # Solicitar el método de pago
-            metodo_pago = input(
-                "Método de pago (Efectivo, Debito, Credito, Transferencia): ").capitalize()
-            fecha_vencimiento = fecha_inscripcion_dt + timedelta(days=30)
-            with self.conectar_db() as conexion:
-                cursor = conexion.cursor()
-                cursor.execute("""
-                    INSERT INTO socios (dni, nombre, apellido, domicilio, telefono, email, fecha_inscripcion, cuota_social, fecha_vencimiento)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (dni, nombre, apellido, domicilio, telefono, email, fecha_inscripcion_dt, cuota_social, fecha_vencimiento))
-
-                # Registrar el pago de la cuota social en la tabla rendicion_cuentas
-                fecha_pago = datetime.now().date()  # Fecha del pago (hoy)
-                cursor.execute("""
-                    INSERT INTO rendicion_cuentas (dni, monto, tipo_pago, metodo_pago, fecha_pago, tipo_persona, fecha_vencimiento)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (dni, cuota_social, "Cuota Social", metodo_pago, fecha_pago, "Socio", fecha_vencimiento))
-                conexion.commit()
-                print(
-                    f"Socia/o {nombre} {apellido} registrado exitosamente y su pago de cuota social registrado en la rendición de cuentas.")
-                # Generar el ticket de pago automáticamente
-                self.generar_ticket_pago(
-                    dni, cuota_social, "Cuota Social", metodo_pago, fecha_pago, fecha_vencimiento, "Socio")
-                print("Ticket de pago generado exitosamente.")
+            pago = self.servicio.registrar_socio(
+                dni, nombre, apellido, domicilio, telefono, email,
+                fecha_inscripcion_dt, cuota_social, metodo_pago)
+            print(
+                f"Socia/o {nombre} {apellido} registrado exitosamente y su pago de cuota social registrado en la rendición de cuentas.")
+            # Generar el ticket de pago automáticamente
+            self.generar_ticket_pago(pago)
+        except (ErrorOperacion, ErrorValidacion) as e:
+            print(f"Error: {e}")
         except Exception as e:
             print(f"Error al registrar socio: {e}")
 
+    @trazar()
     def modificar_socio(self):
         try:
             dni = input("Ingrese el DNI del socio a modificar: ")
+            socio = self.servicio.buscar_socio(dni)
+            if not socio:
+                print("Socio no encontrado.")
+                return
 
-            with self.conectar_db() as conexion:
-                cursor = conexion.cursor()
-                cursor.execute("SELECT * FROM socios WHERE dni = ?", (dni,))
-                socio = cursor.fetchone()
-
-                if socio:
-                    # Solicitar nuevos datos, o mantener los existentes si no se ingresan
-                    nombre = input(f"Nombre ({socio[2]}): ") or socio[2]
-                    apellido = input(f"Apellido ({socio[3]}): ") or socio[3]
-                    domicilio = input(f"Domicilio ({socio[4]}): ") or socio[4]
-                    telefono = input(f"Teléfono ({socio[5]}): ") or socio[5]
-                    email = input(f"Email ({socio[6]}): ") or socio[6]
-                    cuota_social = float(
-                        input(f"Cuota social ({socio[8]}): ") or socio[8])
-                    cursor.execute("""
-                        UPDATE socios
-                        SET nombre = ?, apellido = ?, domicilio = ?, telefono = ?, email = ?, cuota_social = ?
-                        WHERE dni = ?
-                    """, (nombre, apellido, domicilio, telefono, email, cuota_social, dni))
-                    conexion.commit()
-                    print(f"Datos de socio {nombre} {apellido} actualizados.")
-                else:
-                    print("Socio no encontrado.")
+            # Solicitar nuevos datos; los campos vacíos conservan el valor actual
+            cambios = {}
+            for campo, etiqueta in (("nombre", "Nombre"), ("apellido", "Apellido"),
+                                    ("domicilio", "Domicilio"), ("telefono", "Teléfono"),
+                                    ("email", "Email")):
+                valor = input(f"{etiqueta} ({getattr(socio, campo)}): ")
+                if valor:
+                    cambios[campo] = valor
+            cuota_social = input(f"Cuota social ({socio.cuota_social}): ")
+            if cuota_social:
+                cambios["cuota_social"] = validar_campo("socio", "cuota_social", cuota_social)
+
+            self.servicio.modificar_socio(dni, **cambios)
+            socio = self.servicio.buscar_socio(dni)
+            print(f"Datos de socio {socio.nombre} {socio.apellido} actualizados.")
+        except (ErrorOperacion, ErrorValidacion) as e:
+            print(f"Error: {e}")
         except Exception as e:
             print(f"Error al modificar socio: {e}")
 
+    @trazar()
     def eliminar_socio(self):
         try:
             dni = input("Ingrese el DNI del socio a eliminar: ")
-            with self.conectar_db() as conexion:
-                cursor = conexion.cursor()
-                cursor.execute("SELECT * FROM socios WHERE dni = ?", (dni,))
-                socio = cursor.fetchone()
-                if socio:
-                    confirmacion = input(f"¿Está seguro de que desea eliminar al socio con DNI {
-                                         dni}? (s/n): ").lower()
-                    if confirmacion == 's':
-                        try:
-                            cursor.execute(
-                                "DELETE FROM socios WHERE dni = ?", (dni,))
-                            conexion.commit()
-                            print(f"Socio con DNI {
-                                  dni} eliminado exitosamente.")
-                        except Exception as e:
-                            print(f"Error al eliminar socio: {e}")
-                    else:
-                        print("Eliminación cancelada.")
-                else:
-                    print(f"No se encontró un socio con el DNI {dni}.")
+            if not self.servicio.buscar_socio(dni):
+                print(f"No se encontró un socio con el DNI {dni}.")
+                return
+            confirmacion = input(
+                f"¿Está seguro de que desea eliminar al socio con DNI {dni}? (s/n): ").lower()
+            if confirmacion == 's':
+                self.servicio.eliminar_socio(dni)
+                print(f"Socio con DNI {dni} eliminado exitosamente.")
+            else:
+                print("Eliminación cancelada.")
         except Exception as e:
             print(f"Error al eliminar socio: {e}")
 
+    @trazar()
     def listar_socios(self):
         try:
-            with self.conectar_db() as conexion:
-                cursor = conexion.cursor()
-                cursor.execute("SELECT * FROM socios")
-                socios = cursor.fetchall()
-
-                if socios:
+            # Se recorre el cursor sin cargar toda la tabla en memoria
+            hay_socios = False
+            for socio in self.servicio.listar_socios():
+                if not hay_socios:
                     print("Lista de socios:")
-                    for socio in socios:
-                        print(f"ID: {socio[0]}, DNI: {socio[1]}, Nombre: {socio[2]}, Apellido: {socio[3]}, "
-                              f"Domicilio: {socio[4]}, Teléfono: {socio[5]}, Email: {socio[6]}")
-                else:
-                    print("No hay socios registrados.")
+                    hay_socios = True
+                print(f"ID: {socio[0]}, DNI: {socio[1]}, Nombre: {socio[2]}, Apellido: {socio[3]}, "
+                      f"Domicilio: {socio[4]}, Teléfono: {socio[5]}, Email: {socio[6]}")
+            if not hay_socios:
+                print("No hay socios registrados.")
         except Exception as e:
             print(f"Error al listar socios: {e}")
 
@@ -552,119 +484,68 @@ class ClubDeportivo:
             else:
                 print("Opción inválida, intente nuevamente.")
 
+    @trazar()
     def registrar_invitado(self):
-        dni_socio = input("DNI del socio que invita: ")
-
-        # Validar que el DNI del socio contenga solo números y tenga una longitud típica
-        if not dni_socio.isdigit() or not (7 <= len(dni_socio) <= 8):
-            print(
-                "Error: El DNI del socio debe contener solo números y tener entre 7 y 8 dígitos.")
+        dni_socio = self.pedir_campo(
+            "invitado", "socio_dni", "DNI del socio que invita: ")
+        if dni_socio is None:
             return
 
         try:
-            with self.conectar_db() as conexion:
-                cursor = conexion.cursor()
-
-                # Verificar si el socio existe
-                cursor.execute(
-                    "SELECT dni FROM socios WHERE dni = ?", (dni_socio,))
-                socio = cursor.fetchone()
-                if not socio:
-                    print("Error: Socio no encontrado.")
-                    return
+            # Verificar antes de pedir los datos que el socio exista y tenga lugar
+            num_invitados = self.servicio.cantidad_invitados(dni_socio)
+            if num_invitados is None:
+                print("Error: Socio no encontrado.")
+                return
+            if num_invitados >= MAX_INVITADOS_POR_SOCIO:
+                print(f"Error: El socio ya tiene el máximo de {MAX_INVITADOS_POR_SOCIO} invitados.")
+                return
 
-                # Verificar que el socio no tenga más de 3 invitados
-                cursor.execute(
-                    "SELECT COUNT(*) FROM invitados WHERE socio_dni = ?", (dni_socio,))
-                num_invitados = cursor.fetchone()[0]
-                if num_invitados >= 3:
-                    print("Error: El socio ya tiene el máximo de 3 invitados.")
-                    return
-
-                # Validar el nombre (permitir tildes y caracteres especiales)
-                nombre = input("Nombre: ").strip().capitalize()
-                if not re.match("^[a-zA-ZáéíóúÁÉÍÓÚñÑ ]+$", nombre) or len(nombre) < 2:
-                    print(
-                        "Error: El nombre debe contener solo letras (incluyendo tildes y ñ) y tener al menos 2 caracteres.")
-                    return
-
-                # Validar el apellido
-                apellido = input("Apellido: ").strip().capitalize()
-                if not re.match("^[a-zA-ZáéíóúÁÉÍÓÚñÑ ]+$", apellido) or len(apellido) < 2:
-                    print(
-                        "Error: El apellido debe contener solo letras (incluyendo tildes y ñ) y tener al menos 2 caracteres.")
-                    return
-
-                dni = input("DNI del invitado: ")
-                if not dni.isdigit() or not (7 <= len(dni) <= 8):
-                    print(
-                        "Error: El DNI del invitado debe contener solo números y tener entre 7 y 8 dígitos.")
-                    return
-
-                # Verificar si el invitado ya está registrado
-                cursor.execute(
-                    "SELECT dni FROM invitados WHERE dni = ?", (dni,))
-                invitado_existente = cursor.fetchone()
-                if invitado_existente:
-                    print("Error: El DNI del invitado ya está registrado.")
-                    return
+            nombre = self.pedir_campo("invitado", "nombre", "Nombre: ")
+            if nombre is None:
+                return
+            apellido = self.pedir_campo("invitado", "apellido", "Apellido: ")
+            if apellido is None:
+                return
+            dni = self.pedir_campo("invitado", "dni", "DNI del invitado: ")
+            if dni is None:
+                return
 
-                # Insertar el nuevo invitado en la base de datos
-                cursor.execute("""
-                    INSERT INTO invitados (nombre, apellido, dni, socio_dni)
-                    VALUES (?, ?, ?, ?)
-                """, (nombre, apellido, dni, dni_socio))
-                conexion.commit()
-                print("Invitado registrado exitosamente.")
+            self.servicio.registrar_invitado(dni_socio, dni, nombre, apellido)
+            print("Invitado registrado exitosamente.")
 
+        except (ErrorOperacion, ErrorValidacion) as e:
+            print(f"Error: {e}")
         except Exception as e:
             print(f"Error al registrar invitado: {e}")
 
+    @trazar()
     def eliminar_invitado(self):
-        dni_invitado = input(
-            "Ingrese el DNI del invitado que desea eliminar: ")
-        if not dni_invitado.isdigit():
-            print("Error: El DNI debe contener solo números.")
+        dni_invitado = self.pedir_campo(
+            "invitado", "dni", "Ingrese el DNI del invitado que desea eliminar: ")
+        if dni_invitado is None:
             return
         try:
-            with self.conectar_db() as conexion:
-                cursor = conexion.cursor()
-                cursor.execute(
-                    "SELECT dni FROM invitados WHERE dni = ?", (dni_invitado,))
-                invitado = cursor.fetchone()
-
-                if not invitado:
-                    print("Error: El invitado no está registrado.")
-                    return
-                cursor.execute(
-                    "DELETE FROM invitados WHERE dni = ?", (dni_invitado,))
-                conexion.commit()
-                print(f"Invitado con DNI {
-                      dni_invitado} eliminado exitosamente.")
-
+            if not self.servicio.eliminar_invitado(dni_invitado):
+                print("Error: El invitado no está registrado.")
+                return
+            print(f"Invitado con DNI {dni_invitado} eliminado exitosamente.")
         except Exception as e:
             print(f"Error al eliminar el invitado: {e}")
 
+    @trazar()
     def listar_invitados(self):
         try:
-            # Usar el contexto de `with` para la conexión y el cursor
-            with self.conectar_db() as conexion:
-                cursor = conexion.cursor()
-
-                # Consultar todos los invitados registrados en la base de datos
-                cursor.execute(
-                    "SELECT dni, nombre, apellido, socio_dni FROM invitados")
-                invitados = cursor.fetchall()
-
-                if not invitados:
-                    print("No hay invitados registrados.")
-                    return
-
-                print("Lista de invitados registrados:")
-                for invitado in invitados:
-                    dni_invitado, nombre, apellido, dni_socio = invitado
-                    print(f"DNI: {dni_invitado} | Nombre: {nombre} | Apellido: {
-                          apellido} | Socio que invita (DNI): {dni_socio}")
+            hay_invitados = False
+            for invitado in self.servicio.listar_invitados():
+                if not hay_invitados:
+                    print("Lista de invitados registrados:")
+                    hay_invitados = True
+                dni_invitado, nombre, apellido, dni_socio = invitado
+                print(f"DNI: {dni_invitado} | Nombre: {nombre} | Apellido: {
+                      apellido} | Socio que invita (DNI): {dni_socio}")
+            if not hay_invitados:
+                print("No hay invitados registrados.")
 
         except Exception as e:
             print(f"Error al listar los invitados: {e}")
@@ -690,214 +571,108 @@ class ClubDeportivo:
             else:
                 print("Opcion no valida. Por favor, seleccione una opcion valida.")
 
+    @trazar()
     def registrar_no_socio(self):
         try:
-            dni = input("DNI del no socio: ")
-
-            # Validación para asegurarse de que el DNI sea numérico y tenga una longitud adecuada
-            if not dni.isdigit() or not (7 <= len(dni) <= 8):
-                print(
-                    "Error: El DNI debe contener solo números y tener entre 7 y 8 dígitos.")
+            dni = self.pedir_campo("no_socio", "dni", "DNI del no socio: ")
+            if dni is None:
+                return
+            if self.servicio.existe_no_socio(dni):
+                print("Error: El DNI ya está registrado como no socio.")
                 return
 
-            # Conectar a la base de datos
-            with self.conectar_db() as conexion:
-                cursor = conexion.cursor()
+            nombre = self.pedir_campo("no_socio", "nombre", "Nombre: ")
+            if nombre is None:
+                return
+            apellido = self.pedir_campo("no_socio", "apellido", "Apellido: ")
+            if apellido is None:
+                return
+            telefono = self.pedir_campo("no_socio", "telefono", "Teléfono: ")
+            if telefono is None:
+                return
+            email = self.pedir_campo("no_socio", "email", "Email: ")
+            if email is None:
+                return
 
-                # Verificar si el no socio ya está registrado
-                cursor.execute(
-                    "SELECT dni FROM no_socios WHERE dni = ?", (dni,))
-                no_socio_existente = cursor.fetchone()
-                if no_socio_existente:
-                    print("Error: El DNI ya está registrado como no socio.")
-                    return
-
-                # Validar el nombre (permitir tildes y caracteres especiales)
-                nombre = input("Nombre: ").strip().capitalize()
-                if not re.match("^[a-zA-ZáéíóúÁÉÍÓÚñÑ ]+$", nombre) or len(nombre) < 2:
-                    print(
-                        "Error: El nombre debe contener solo letras (incluyendo tildes y ñ) y tener al menos 2 caracteres.")
-                    return
-
-                # Validar el apellido
-                apellido = input("Apellido: ").strip().capitalize()
-                if not re.match("^[a-zA-ZáéíóúÁÉÍÓÚñÑ ]+$", apellido) or len(apellido) < 2:
-                    print(
-                        "Error: El apellido debe contener solo letras (incluyendo tildes y ñ) y tener al menos 2 caracteres.")
-                    return
-
-                # Solicitar y validar el teléfono
-                telefono = input("Teléfono: ")
-                if not telefono.isdigit() or len(telefono) < 7:
-                    print(
-                        "Error: El teléfono debe contener solo números y tener al menos 7 dígitos.")
-                    return
-
-                # Solicitar y validar el email
-                email = input("Email: ")
-                if not re.match(r"[^@]+@[^@]+\.[^@]+", email):
-                    print("Error: El formato del email es incorrecto.")
-                    return
-
-                # Insertar en la base de datos si todas las validaciones son correctas
-                cursor.execute("""
-                    INSERT INTO no_socios (dni, nombre, apellido, telefono, email)
-                    VALUES (?, ?, ?, ?, ?)
-                """, (dni, nombre, apellido, telefono, email))
-                conexion.commit()
-                print(f"No socio {nombre} {apellido} registrado exitosamente.")
+            self.servicio.registrar_no_socio(dni, nombre, apellido, telefono, email)
+            print(f"No socio {nombre} {apellido} registrado exitosamente.")
+        except (ErrorOperacion, ErrorValidacion) as e:
+            print(f"Error: {e}")
         except Exception as e:
             print(f"Error al registrar no socio: {e}")
 
+    @trazar()
     def eliminar_no_socio(self):
-        dni_no_socio = input(
-            "Ingrese el DNI del no socio que desea eliminar: ")
-        if not dni_no_socio.isdigit():
-            print("Error: El DNI debe contener solo números.")
+        dni_no_socio = self.pedir_campo(
+            "no_socio", "dni", "Ingrese el DNI del no socio que desea eliminar: ")
+        if dni_no_socio is None:
             return
         try:
-            with self.conectar_db() as conexion:
-                cursor = conexion.cursor()
-                cursor.execute(
-                    "SELECT dni FROM no_socios WHERE dni = ?", (dni_no_socio,))
-                no_socio = cursor.fetchone()
-                if not no_socio:
-                    print("Error: El no socio no está registrado.")
-                    return
-                cursor.execute(
-                    "DELETE FROM no_socios WHERE dni = ?", (dni_no_socio,))
-                conexion.commit()
-                print(f"No socio con DNI {
-                      dni_no_socio} eliminado exitosamente.")
+            if not self.servicio.eliminar_no_socio(dni_no_socio):
+                print("Error: El no socio no está registrado.")
+                return
+            print(f"No socio con DNI {dni_no_socio} eliminado exitosamente.")
         except Exception as e:
             print(f"Error al eliminar el no socio: {e}")
 
+    @trazar()
     def listar_no_socios(self):
         try:
-            with self.conectar_db() as conexion:
-                cursor = conexion.cursor()
-
-                cursor.execute("SELECT * FROM no_socios")
-                no_socios = cursor.fetchall()
-
-                if no_socios:
+            hay_no_socios = False
+            for no_socio in self.servicio.listar_no_socios():
+                if not hay_no_socios:
                     print("Lista de no socios:")
-                    for no_socio in no_socios:
-                        print(f"ID: {no_socio[0]}, DNI: {no_socio[1]}, Nombre: {no_socio[2]}, Apellido: {
-                              no_socio[3]}, Teléfono: {no_socio[4]}, Email: {no_socio[5]}")
-                else:
-                    print("No hay no socios registrados.")
+                    hay_no_socios = True
+                print(f"ID: {no_socio[0]}, DNI: {no_socio[1]}, Nombre: {no_socio[2]}, Apellido: {
+                      no_socio[3]}, Teléfono: {no_socio[4]}, Email: {no_socio[5]}")
+            if not hay_no_socios:
+                print("No hay no socios registrados.")
         except Exception as e:
             print(f"Error al listar no socios: {e}")
 
+    @trazar()
     def pagar_cuota_deportiva(self):
-        with self.conectar_db() as conexion:
-            cursor = conexion.cursor()
-            dni = input("DNI del socio, invitado o no socio: ")
-
-            # Verificar si el usuario es socio, invitado o no socio
-            cursor.execute("SELECT dni FROM socios WHERE dni = ?", (dni,))
-            socio = cursor.fetchone()
-
-            if socio:
-                tipo_persona = "Socio"
-                descuento = 0.30
-            else:
-                cursor.execute(
-                    "SELECT socio_dni FROM invitados WHERE dni = ?", (dni,))
-                invitado = cursor.fetchone()
-                if invitado:
-                    tipo_persona = "Invitado"
-                    descuento = 0.30
-                else:
-                    tipo_persona = "No Socio"
-                    descuento = 0.00
-
-            # Solicitar el deporte y obtener el monto de la cuota y cupo disponible
-            deporte = input(
-                "Ingrese el nombre del deporte (Futbol, Tenis, Natacion): ").capitalize()
-            cursor.execute(
-                "SELECT cuota, cupos FROM deportes WHERE nombre = ?", (deporte,))
-            deporte_info = cursor.fetchone()
-
-            if not deporte_info:
-                print(f"Deporte {deporte} no encontrado.")
-                return
-
-            cuota_deporte, cupos_totales = deporte_info
-
-            # Verificar si el usuario ya está inscrito en el deporte
-            cursor.execute(
-                "SELECT COUNT(*) FROM inscripciones WHERE dni_socio = ? AND nombre = ?", (dni, deporte))
-            inscrito = cursor.fetchone()[0]
-
-            if inscrito > 0:
-                print(f"El usuario con DNI {dni} ya está inscrito en {
-                      deporte}. No se puede inscribir nuevamente.")
-                return
-
-            # Contar el número de inscritos en el deporte para verificar los cupos
-            cursor.execute(
-                "SELECT COUNT(*) FROM inscripciones WHERE nombre = ?", (deporte,))
-            inscritos_actuales = cursor.fetchone()[0]
-
-            if inscritos_actuales >= cupos_totales:
-                print(f"No hay cupos disponibles para {deporte}.")
-                return
+        dni = self.pedir_campo(
+            "pago", "dni", "DNI del socio, invitado o no socio: ")
+        if dni is None:
+            return
+        deporte = self.pedir_campo(
+            "pago", "deporte", f"Ingrese el nombre del deporte ({', '.join(CATALOGO.nombres())}): ")
+        if deporte is None:
+            return
 
-            # Calcular el monto a pagar con descuento si aplica
-            monto_a_pagar = cuota_deporte * (1 - descuento)
+        try:
+            # Tipo de persona, descuento, inscripción previa y cupo disponible
+            cotizacion = self.servicio.cotizar_cuota_deportiva(dni, deporte)
 
             # Validar el método de pago
-            metodos_validos = ['Efectivo', 'Credito',
-                               'Debito', 'Transferencia']
             while True:
-                metodo_pago = input(
-                    "Ingrese el método de pago (Efectivo, Credito, Debito, Transferencia): ").capitalize()
-                if metodo_pago in metodos_validos:
+                metodo_pago = self.pedir_campo(
+                    "pago", "metodo_pago", "Ingrese el método de pago (Efectivo, Credito, Debito, Transferencia): ")
+                if metodo_pago is not None:
                     print(f"Método de pago '{
                           metodo_pago}' seleccionado correctamente.")
                     break
-                else:
-                    print("Método de pago no válido. Por favor, ingrese uno de los siguientes métodos: Efectivo, Tarjeta de Crédito, Tarjeta de Débito, Transferencia.")
 
             # Confirmar si desea realizar el pago
             confirmar_pago = input(f"El monto a pagar para {deporte} es de {
-                                   monto_a_pagar:.2f}. ¿Desea proceder con el pago? (S/N): ").strip().upper()
+                                   cotizacion.monto:.2f}. ¿Desea proceder con el pago? (S/N): ").strip().upper()
             if confirmar_pago != "S":
                 print("Pago cancelado.")
                 return
 
-            # Establecer fecha de pago y fecha de vencimiento
-            fecha_pago = datetime.now().date()
-            fecha_vencimiento = fecha_pago + timedelta(days=30)
+            pago = self.servicio.pagar_cuota_deportiva(dni, deporte, metodo_pago,
+                                                       monto_cotizado=cotizacion.monto)
+            print(f"El pago de la cuota de {deporte} por {
+                  pago.tipo_persona} ha sido registrado exitosamente. Monto: {pago.monto:.2f}")
+            print(f"Fecha de vencimiento de la cuota: {pago.fecha_vencimiento}")
 
-            try:
-                # Registrar el pago en la tabla de rendición de cuentas
-                cursor.execute("""
-                    INSERT INTO rendicion_cuentas (dni, monto, tipo_pago, metodo_pago, fecha_pago, fecha_vencimiento, tipo_persona)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (dni, monto_a_pagar, f"Cuota {deporte}", metodo_pago, fecha_pago, fecha_vencimiento, tipo_persona))
-
-                # Registrar en inscripciones
-                cursor.execute("""
-                    INSERT INTO inscripciones (dni_socio, nombre, cuota)
-                    VALUES (?, ?, ?)
-                """, (dni, deporte, monto_a_pagar))
-
-                # Confirmar los cambios en la base de datos
-                conexion.commit()
-                print(f"El pago de la cuota de {deporte} por {
-                      tipo_persona} ha sido registrado exitosamente. Monto: {monto_a_pagar:.2f}")
-                print(f"Fecha de vencimiento de la cuota: {fecha_vencimiento}")
-
-                # Generar el ticket de pago automáticamente
-                self.generar_ticket_pago(dni, monto_a_pagar, f"Cuota {
-                                         deporte}", metodo_pago, fecha_pago, fecha_vencimiento, tipo_persona)
-                print("Ticket de pago generado exitosamente.")
-            except Exception as e:
-                print(f"Error al registrar el pago de la cuota deportiva: {e}")
-                conexion.rollback()
+            # Generar el ticket de pago automáticamente
+            self.generar_ticket_pago(pago)
+        except (ErrorOperacion, ErrorValidacion) as e:
+            print(e)
+        except Exception as e:
+            print(f"Error al registrar el pago de la cuota deportiva: {e}")
 
     def rendir_cuentas(self):
         while True:
@@ -906,7 +681,10 @@ class ClubDeportivo:
             print("2: Ver rendimiento del último mes")
             print("3: Rendimiento general de todos los pagos")
             print("4: Generar reporte completo y buscar por mes")
-            print("5: Salir")
+            print("5: Exportar datos (CSV/JSONL)")
+            print("6: Generar reportes de varios meses (anual)")
+            print("7: Facturación mensual de cuotas")
+            print("8: Salir")
             opcion = input("Seleccione una opción: ")
 
             if opcion == '1':
@@ -922,220 +700,239 @@ class ClubDeportivo:
                     "Ingrese el mes en formato MM-AAAA para el reporte: ")
                 self.generar_reporte_mes_txt(mes)
             elif opcion == '5':
+                self.exportar_datos()
+            elif opcion == '6':
+                self.generar_reporte_rango_txt()
+            elif opcion == '7':
+                self.facturacion_mensual()
+            elif opcion == '8':
                 print("Saliendo del menú.")
                 break
             else:
                 print("Opción no válida, intenta nuevamente.")
 
+    @trazar()
     def obtener_rendimiento_mes(self, mes=None):
-        with self.conectar_db() as conexion:
-            cursor = conexion.cursor()
-            try:
-                if mes:
-                    primer_dia_mes = datetime.strptime(
-                        mes, "%m-%Y").replace(day=1)
-                else:
-                    fecha_actual = datetime.now()
-                    primer_dia_mes = fecha_actual.replace(day=1)
-
-                ultimo_dia_mes = (primer_dia_mes + timedelta(days=32)
-                                  ).replace(day=1) - timedelta(days=1)
-
-                # Reiniciar el total para el mes
-                total_mes = 0
-
-                # Mostrar pagos de cuota social
-                cursor.execute("""
-                    SELECT dni, monto, tipo_pago, metodo_pago, fecha_pago, tipo_persona
-                    FROM rendicion_cuentas
-                    WHERE tipo_pago = 'Cuota Social' AND fecha_pago BETWEEN ? AND ?
-                    ORDER BY fecha_pago DESC
-                """, (primer_dia_mes.strftime("%Y-%m-%d"), ultimo_dia_mes.strftime("%Y-%m-%d")))
-                pagos_sociales = cursor.fetchall()
-
-                if pagos_sociales:
-                    print("\n--- Rendición de Cuentas Mensual - Cuota Social ---")
-                    for pago in pagos_sociales:
-                        self.mostrar_detalle_pago(pago)
-
-                # Mostrar pagos de cuota deportiva
-                cursor.execute("""
-                    SELECT dni, monto, tipo_pago, metodo_pago, fecha_pago, tipo_persona
-                    FROM rendicion_cuentas
-                    WHERE tipo_pago LIKE 'Cuota %' AND tipo_pago != 'Cuota Social' AND fecha_pago BETWEEN ? AND ?
-                    ORDER BY fecha_pago DESC
-                """, (primer_dia_mes.strftime("%Y-%m-%d"), ultimo_dia_mes.strftime("%Y-%m-%d")))
-                pagos_deportivos = cursor.fetchall()
-
-                if pagos_deportivos:
-                    print("\n--- Rendición de Cuentas Mensual - Cuota Deportiva ---")
-                    for pago in pagos_deportivos:
-                        self.mostrar_detalle_pago(pago)
-
-                # Resumen de pagos del mes (sin duplicar el total)
-                cursor.execute("""
-                    SELECT tipo_pago, SUM(monto)
-                    FROM rendicion_cuentas
-                    WHERE fecha_pago BETWEEN ? AND ?
-                    GROUP BY tipo_pago
-                """, (primer_dia_mes.strftime("%Y-%m-%d"), ultimo_dia_mes.strftime("%Y-%m-%d")))
-                resumen = cursor.fetchall()
-
-                print("\n--- Resumen de Pagos del Mes ---")
-                for tipo_pago, total in resumen:
-                    print(f"{tipo_pago}: {total:.2f}")
-                    total_mes += total
-
-                # Mostrar el total del mes
-                print(f"\nTotal de todos los pagos en el mes: ${
-                      total_mes:.2f}")
-            except Exception as e:
-                print(f"Error al obtener la rendición de cuentas: {e}")
+        try:
+            liquidacion = self.servicio.liquidacion_mensual(mes)
+
+            # Mostrar pagos de cuota social
+            if liquidacion.pagos_sociales:
+                print("\n--- Rendición de Cuentas Mensual - Cuota Social ---")
+                for pago in liquidacion.pagos_sociales:
+                    self.mostrar_detalle_pago(pago)
+
+            # Mostrar pagos de cuota deportiva
+            if liquidacion.pagos_deportivos:
+                print("\n--- Rendición de Cuentas Mensual - Cuota Deportiva ---")
+                for pago in liquidacion.pagos_deportivos:
+                    self.mostrar_detalle_pago(pago)
+
+            # Resumen de pagos del mes
+            print("\n--- Resumen de Pagos del Mes ---")
+            for tipo_pago, total in liquidacion.resumen():
+                print(f"{tipo_pago}: {total:.2f}")
+
+            # Mostrar el total del mes
+            print(f"\nTotal de todos los pagos en el mes: ${
+                  liquidacion.total_mes:.2f}")
+        except Exception as e:
+            print(f"Error al obtener la rendición de cuentas: {e}")
 
+    @trazar()
     def rendimiento_general(self):
-        with self.conectar_db() as conexion:
-            cursor = conexion.cursor()
-            try:
-                cursor.execute("""
-                    SELECT tipo_pago, SUM(monto)
-                    FROM rendicion_cuentas
-                    GROUP BY tipo_pago
-                """)
-                resumen = cursor.fetchall()
-                total_general = 0  # Variable para almacenar el total general
+        try:
+            resumen, total_general = self.servicio.rendimiento_general()
 
-                print("\n--- Rendimiento General ---")
-                for tipo_pago, total in resumen:
-                    print(f"{tipo_pago}: {total:.2f}")
-                    total_general += total  # Acumular el monto en total general
+            print("\n--- Rendimiento General ---")
+            for tipo_pago, total in resumen:
+                print(f"{tipo_pago}: {total:.2f}")
 
-                # Mostrar el total general
-                print(f"\nTotal general de todos los pagos: ${
-                    total_general:.2f}")
-            except Exception as e:
-                print(f"Error al obtener el rendimiento general: {e}")
+            # Mostrar el total general
+            print(f"\nTotal general de todos los pagos: ${
+                total_general:.2f}")
+        except Exception as e:
+            print(f"Error al obtener el rendimiento general: {e}")
 
     def mostrar_detalle_pago(self, pago):
         dni, monto, tipo_pago, metodo_pago, fecha_pago, tipo_persona = pago
-        fecha_pago_formateada = datetime.strptime(
-            fecha_pago, "%Y-%m-%d").strftime("%d/%m/%Y")
         print(f"\nDNI: {dni}")
         print(f"Tipo de Persona: {tipo_persona}")
         print(f"Tipo de Pago: {tipo_pago}")
         print(f"Método de Pago: {metodo_pago}")
-        print(f"Monto: ${monto:.2f}")
-        print(f"Fecha de Pago: {fecha_pago_formateada}")
+        print(f"Monto: ${Dinero(monto):.2f}")
+        print(f"Fecha de Pago: {formatear_dia(fecha_pago)}")
         print("-" * 30)
 
-        # Generar el ticket por cada pago
-        fecha_vencimiento = datetime.strptime(
-            fecha_pago, '%Y-%m-%d') + timedelta(days=30)
-        self.generar_ticket_pago(dni, monto, tipo_pago, metodo_pago, fecha_pago_formateada,
-                                 fecha_vencimiento.strftime("%d/%m/%Y"), tipo_persona)
-
+    @trazar()
     def generar_reporte_mes_txt(self, mes):
-        with self.conectar_db() as conexion:
-            cursor = conexion.cursor()
+        # Rendición (reportes y formato de pagos) también se importa al usarla
+        from rendicion import escribir_reporte_mes
+        try:
+            nombre_archivo = f"reporte_{mes}.txt"
+            escribir_reporte_mes(self.conectar_db(), mes, nombre_archivo)
+            print(f"Reporte generado correctamente en {nombre_archivo}")
+        except Exception as e:
+            print(f"Error al generar el reporte: {e}")
+
+    @trazar()
+    def generar_reporte_rango_txt(self):
+        desde = input("Mes inicial en formato MM-AAAA: ").strip()
+        hasta = input("Mes final en formato MM-AAAA: ").strip()
+        from rendicion import generar_reporte_rango
+        try:
+            nombre_archivo, total = generar_reporte_rango(desde, hasta)
+            print(f"Reportes mensuales generados. Consolidado en {
+                  nombre_archivo} (total: {total:.2f})")
+        except Exception as e:
+            print(f"Error al generar los reportes: {e}")
+
+    @trazar()
+    def facturacion_mensual(self):
+        mes = input("Mes a facturar en formato MM-AAAA (vacío para el actual): ").strip() or None
+        metodo_pago = self.pedir_campo(
+            "pago", "metodo_pago", "Método de pago de los cargos (Efectivo, Credito, Debito, Transferencia): ")
+        if metodo_pago is None:
+            return
+        try:
+            from facturacion import facturar_mes
+            resultado = facturar_mes(mes, metodo_pago, tickets=self.tickets)
+            if resultado.cargos == 0:
+                print(f"El período {resultado.periodo} ya estaba facturado; no hay cargos nuevos.")
+            else:
+                print(f"Período {resultado.periodo}: {resultado.cargos} cargos por ${resultado.total:.2f}.")
+            print(f"Tickets emitidos: {resultado.tickets}")
+        except ValueError:
+            print("Error: Formato de mes inválido. Use MM-AAAA.")
+        except Exception as e:
+            print(f"Error en la facturación mensual: {e}")
+
+    @trazar()
+    def exportar_datos(self):
+        # Exportación y facturación se importan al usarlas para que el menú
+        # principal aparezca sin esperar a que carguen
+        from exportacion import CONSULTAS as CONSULTAS_EXPORTACION, exportar
+        tabla = input(
+            f"Tabla a exportar ({', '.join(sorted(CONSULTAS_EXPORTACION))}): ").strip().lower()
+        if tabla not in CONSULTAS_EXPORTACION:
+            print("Error: Tabla no válida.")
+            return
+        formato = input("Formato (csv/jsonl): ").strip().lower() or "csv"
+        if formato not in ("csv", "jsonl"):
+            print("Error: El formato debe ser csv o jsonl.")
+            return
+
+        desde = hasta = None
+        if tabla == "rendicion_cuentas":
             try:
-                primer_dia_mes = datetime.strptime(mes, "%m-%Y").replace(day=1)
-                ultimo_dia_mes = (primer_dia_mes + timedelta(days=32)
-                                  ).replace(day=1) - timedelta(days=1)
-
-                # Nombre del archivo de reporte
-                nombre_archivo = f"reporte_{mes}.txt"
-
-                with open(nombre_archivo, 'w') as archivo:
-                    archivo.write(
-                        f"--- Reporte de Rendición de Cuentas para {mes} ---\n\n")
-
-                    total_mes = 0  # Variable para almacenar el total del mes
-
-                    # Obtener pagos de cuota social
-                    cursor.execute("""
-                        SELECT dni, monto, tipo_pago, metodo_pago, fecha_pago, tipo_persona
-                        FROM rendicion_cuentas
-                        WHERE tipo_pago = 'Cuota Social' AND fecha_pago BETWEEN ? AND ?
-                        ORDER BY fecha_pago DESC
-                    """, (primer_dia_mes.strftime("%Y-%m-%d"), ultimo_dia_mes.strftime("%Y-%m-%d")))
-                    pagos_sociales = cursor.fetchall()
-
-                    archivo.write("\n--- Detalles de Cuota Social ---\n")
-                    for pago in pagos_sociales:
-                        archivo.write(self.formatear_pago(pago))
-                        total_mes += pago[1]
-
-                    # Obtener pagos de cuota deportiva
-                    cursor.execute("""
-                        SELECT dni, monto, tipo_pago, metodo_pago, fecha_pago, tipo_persona
-                        FROM rendicion_cuentas
-                        WHERE tipo_pago LIKE 'Cuota %' AND tipo_pago != 'Cuota Social' AND fecha_pago BETWEEN ? AND ?
-                        ORDER BY fecha_pago DESC
-                    """, (primer_dia_mes.strftime("%Y-%m-%d"), ultimo_dia_mes.strftime("%Y-%m-%d")))
-                    pagos_deportivos = cursor.fetchall()
-
-                    archivo.write("\n--- Detalles de Cuota Deportiva ---\n")
-                    for pago in pagos_deportivos:
-                        archivo.write(self.formatear_pago(pago))
-                        total_mes += pago[1]
-
-                    # Resumen de pagos
-                    archivo.write("\n--- Resumen de Pagos del Mes ---\n")
-                    cursor.execute("""
-                        SELECT tipo_pago, SUM(monto)
-                        FROM rendicion_cuentas
-                        WHERE fecha_pago BETWEEN ? AND ?
-                        GROUP BY tipo_pago
-                    """, (primer_dia_mes.strftime("%Y-%m-%d"), ultimo_dia_mes.strftime("%Y-%m-%d")))
-                    resumen = cursor.fetchall()
-
-                    for tipo_pago, total in resumen:
-                        archivo.write(f"{tipo_pago}: {total:.2f}\n")
-
-                    archivo.write(f"\nTotal de todos los pagos en el mes: {
-                                  total_mes:.2f}\n")
-
-                print(f"Reporte generado correctamente en {nombre_archivo}")
+                texto = input("Fecha de pago desde (dd/mm/yyyy, vacío para todo): ").strip()
+                desde = datetime.strptime(texto, "%d/%m/%Y").date() if texto else None
+                texto = input("Fecha de pago hasta (dd/mm/yyyy, vacío para todo): ").strip()
+                hasta = datetime.strptime(texto, "%d/%m/%Y").date() if texto else None
+            except ValueError:
+                print("Error: Formato de fecha inválido. Debe ser dd/mm/yyyy.")
+                return
 
-            except Exception as e:
-                print(f"Error al generar el reporte: {e}")
+        comprimir = input("¿Comprimir con gzip? (s/n): ").strip().lower() == 's'
+        nombre_archivo = f"{tabla}.{formato}" + (".gz" if comprimir else "")
+        try:
+            filas = exportar(tabla, nombre_archivo, formato, desde, hasta,
+                             comprimir, conexion=self.conectar_db())
+            print(f"{filas} filas exportadas a {nombre_archivo}.")
+        except Exception as e:
+            print(f"Error al exportar los datos: {e}")
 
     def formatear_pago(self, pago):
-        dni, monto, tipo_pago, metodo_pago, fecha_pago, tipo_persona = pago
-        fecha_pago_formateada = datetime.strptime(
-            fecha_pago, "%Y-%m-%d").strftime("%d/%m/%Y")
-        return (f"DNI: {dni}\n"
-                f"Tipo de Persona: {tipo_persona}\n"
-                f"Tipo de Pago: {tipo_pago}\n"
-                f"Método de Pago: {metodo_pago}\n"
-                f"Monto: {monto:.2f}\n"
-                f"Fecha de Pago: {fecha_pago_formateada}\n"
-                f"{'-' * 30}\n")
-
-    def generar_ticket_pago(self, dni, monto, tipo_pago, metodo_pago, fecha_pago, fecha_vencimiento, tipo_persona):
+        from rendicion import formatear_pago
+        return formatear_pago(pago)
+
+    def generar_ticket_pago(self, pago):
         try:
-            ticket = f"""
-            ===========================================
-                    TICKET DE PAGO
-            ===========================================
-            DNI: {dni}
-            Tipo de Persona: {tipo_persona}
-            Tipo de Pago: {tipo_pago}
-            Método de Pago: {metodo_pago}
-            Monto Pagado: ${monto:.2f}
-            Fecha de Pago: {fecha_pago}
-            Fecha de Vencimiento: {fecha_vencimiento}
-            ===========================================
-            ¡Gracias por realizar el pago!
-            ===========================================
-            """
+            ticket, archivo = self.servicio.emitir_ticket(pago)
             print(ticket)
-
-            # Crear nombre del archivo de ticket
-            nombre_archivo = f"ticket_pago_{dni}_{tipo_pago.replace(' ', '_')}_{
-                metodo_pago.replace(' ', '_')}.txt"
-            with open(nombre_archivo, 'w', encoding='utf-8') as f:
-                f.write(ticket)
-            # Guardar el ticket en un archivo de texto
-            print(f"El ticket ha sido guardado en {nombre_archivo}.")
+            print(f"El ticket ha sido guardado en {archivo}.")
+            print("Ticket de pago generado exitosamente.")
         except Exception as e:
             print(f"Error al generar el ticket: {e}")
+
+    @trazar()
+    def reimprimir_ticket(self):
+        dni = input("DNI de la persona: ").strip()
+        try:
+            conexion = self.conectar_db()
+            tickets = self.tickets.listar_por_dni(conexion, dni)
+            if not tickets:
+                print(f"No hay tickets registrados para el DNI {dni}.")
+                return
+
+            print(f"\n--- Tickets del DNI {dni} ---")
+            for pago_id, tipo_pago, fecha_pago, monto in tickets:
+                if monto is None:
+                    # El ticket quedó guardado pero su pago ya no está en rendicion_cuentas
+                    print(f"N° {pago_id}: pago no encontrado")
+                else:
+                    print(f"N° {pago_id}: {tipo_pago} del {formatear_dia(fecha_pago)} (${monto:.2f})")
+
+            pago_id = input("Número de ticket a reimprimir: ").strip()
+            if not pago_id.isdigit():
+                print("Error: El número de ticket debe ser numérico.")
+                return
+            ticket = self.tickets.obtener(conexion, int(pago_id))
+            if ticket is None:
+                print("No se encontró el ticket solicitado.")
+                return
+            print(ticket)
+        except Exception as e:
+            print(f"Error al reimprimir el ticket: {e}")
+
+    @trazar()
+    def buscar_persona(self):
+        texto = input("Buscar por nombre, apellido, DNI, email o teléfono (se aceptan comienzos de palabra): ").strip()
+        if not texto:
+            print("Error: Ingrese al menos una palabra para buscar.")
+            return
+        try:
+            resultados = self.servicio.buscar_personas(texto)
+            if not resultados:
+                print("No se encontraron personas.")
+                return
+            print(f"\n--- Resultados para '{texto}' ---")
+            for resultado in resultados:
+                print(f"{resultado.tipo}: {resultado.apellido}, {resultado.nombre} (DNI {resultado.dni})")
+        except Exception as e:
+            print(f"Error al buscar personas: {e}")
+
+    @trazar()
+    def vencimientos(self):
+        dias = input("Mostrar también las que vencen dentro de cuántos días (Enter = 0): ").strip() or "0"
+        if not dias.isdigit():
+            print("Error: Ingrese un número entero de días.")
+            return
+        dias = int(dias)
+        try:
+            hoy = datetime.now().date()
+            lineas = []
+            total = 0
+            for vencimiento in self.servicio.vencimientos(dias):
+                estado = "VENCIDA" if vencimiento.fecha_vencimiento < hoy else "Por vencer"
+                lineas.append(
+                    f"DNI: {vencimiento.dni}, {vencimiento.concepto}, Vence: {
+                        vencimiento.fecha_vencimiento.strftime('%d/%m/%Y')}, "
+                    f"Monto: ${vencimiento.monto:.2f} ({estado})\n")
+                total += vencimiento.monto
+            if not lineas:
+                print("No hay cuotas vencidas ni por vencer.")
+                return
+            sys.stdout.write("".join(lineas))
+            print(f"{len(lineas)} cuotas, total a cobrar: ${total:.2f}")
+
+            if input("¿Desea renovarlas todas ahora? (S/N): ").strip().upper() != "S":
+                return
+            metodo_pago = self.pedir_campo(
+                "pago", "metodo_pago", "Método de pago (Efectivo, Credito, Debito, Transferencia): ")
+            if metodo_pago is None:
+                return
+            cantidad, cobrado = self.servicio.renovar_vencimientos(metodo_pago, dias)
+            print(f"{cantidad} cuotas renovadas. Total registrado: ${cobrado:.2f}")
+        except Exception as e:
+            print(f"Error al consultar los vencimientos: {e}")
@@ -0,0 +1,104 @@
+# conexion_db.py
+import atexit
+import itertools
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from instrumentacion import fabrica_conexion
+
+RUTA_DB = 'club_deportes.db'
+
+# Ajustes que se aplican una sola vez al abrir cada conexión
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -16000",      # ~16 MB de caché de páginas
+    "PRAGMA mmap_size = 268435456",    # 256 MB mapeados en memoria
+    "PRAGMA busy_timeout = 5000",      # esperar hasta 5 s si la base está bloqueada
+)
+
+_local = threading.local()
+_conexiones = []
+_candado = threading.Lock()
+_generacion = 0
+_savepoints = itertools.count(1)
+
+
+def _abrir_conexion(ruta):
+    conexion = sqlite3.connect(ruta, timeout=5, check_same_thread=False, factory=fabrica_conexion())
+    for pragma in PRAGMAS:
+        conexion.execute(pragma)
+    return conexion
+
+
+def obtener_conexion():
+    # Una conexión ajustada y reutilizada por hilo; se mantiene abierta
+    # para conservar la caché de páginas entre una acción y la siguiente.
+    conexion = getattr(_local, 'conexion', None)
+    if conexion is None or _local.generacion != _generacion:
+        conexion = _abrir_conexion(RUTA_DB)
+        _local.conexion = conexion
+        _local.generacion = _generacion
+        with _candado:
+            _conexiones.append(conexion)
+    return conexion
+
+
+@contextmanager
+def transaccion(conexion=None, inmediata=True):
+    # Transacción explícita; si ya hay una abierta se anida con un SAVEPOINT,
+    # de modo que una operación puede formar parte de un lote mayor.
+    conexion = conexion or obtener_conexion()
+    if conexion.in_transaction:
+        nombre = f"sp_{next(_savepoints)}"
+        conexion.execute(f"SAVEPOINT {nombre}")
+        try:
+            yield conexion
+        except BaseException:
+            conexion.execute(f"ROLLBACK TO {nombre}")
+            conexion.execute(f"RELEASE {nombre}")
+            raise
+        conexion.execute(f"RELEASE {nombre}")
+    else:
+        conexion.execute("BEGIN IMMEDIATE" if inmediata else "BEGIN")
+        try:
+            yield conexion
+        except BaseException:
+            conexion.rollback()
+            raise
+        conexion.commit()
+
+
+def abrir_conexion_lectura(ruta=None):
+    # Conexión propia de solo lectura, para procesos de trabajo que no comparten
+    # la conexión del hilo principal
+    conexion = sqlite3.connect(f"file:{ruta or RUTA_DB}?mode=ro", uri=True, timeout=5,
+                               factory=fabrica_conexion())
+    for pragma in PRAGMAS[2:]:
+        conexion.execute(pragma)
+    conexion.execute("PRAGMA query_only = 1")
+    return conexion
+
+
+def configurar_ruta_db(ruta):
+    # Cambia la base de datos usada por las conexiones del proceso
+    global RUTA_DB
+    cerrar_conexiones()
+    RUTA_DB = ruta
+
+
+def cerrar_conexiones():
+    # Las conexiones de otros hilos se reabren solas al detectar el cambio de generación
+    global _generacion
+    with _candado:
+        _generacion += 1
+        while _conexiones:
+            conexion = _conexiones.pop()
+            try:
+                conexion.close()
+            except sqlite3.Error:
+                pass
+
+
+atexit.register(cerrar_conexiones)
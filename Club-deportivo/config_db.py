@@ -1,5 +1,9 @@
 # config_db.py
-import sqlite3
+import re
+
+from conexion_db import obtener_conexion, transaccion
+from fechas import sql_a_dia
+from permisos import invalidar_permisos
 
 
 def crear_tablas(cursor):
@@ -136,13 +140,16 @@ def insertar_datos_iniciales(cursor):
     cursor.execute(
         "INSERT OR IGNORE INTO roles (nombre) VALUES ('Recepcionista')")
 
-    # Insertar permisos iniciales para cada rol
+    # Insertar permisos iniciales para cada rol (permisos no tiene clave única,
+    # así que solo se cargan si la tabla está vacía)
     cursor.execute('''
-    INSERT OR IGNORE INTO permisos (rol_id, gestion_profesores, menu_deportes, gestion_cuotas_y_socios, rendicion_cuentas)
-    VALUES 
+    INSERT INTO permisos (rol_id, gestion_profesores, menu_deportes, gestion_cuotas_y_socios, rendicion_cuentas)
+    SELECT * FROM (VALUES
         (1, 1, 1, 1, 1),  -- Administrador: acceso completo
         (2, 0, 0, 0, 1),  -- Contador: acceso a Rendición de Cuentas y Salir
         (3, 0, 0, 1, 0)   -- Recepcionista: acceso a Gestionar Cuotas y Socios y Salir.
+    )
+    WHERE NOT EXISTS (SELECT 1 FROM permisos)
     ''')
 
     # Insertar usuarios de ejemplo sin hashing de contraseñas
@@ -155,15 +162,353 @@ def insertar_datos_iniciales(cursor):
     ''')
 
 
-def inicializar_base_datos():
-    conexion = sqlite3.connect('club_deportes.db')
-    cursor = conexion.cursor()
+def migracion_esquema_inicial(cursor):
     crear_tablas(cursor)
     insertar_datos_iniciales(cursor)
-    conexion.commit()
-    conexion.close()
+
+
+def migracion_indices(cursor):
+    # Índices secundarios para los filtros de reportes, cupos e invitados
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_rendicion_fecha_pago ON rendicion_cuentas (fecha_pago)")
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_rendicion_tipo_fecha ON rendicion_cuentas (tipo_pago, fecha_pago)")
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_rendicion_dni ON rendicion_cuentas (dni)")
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_inscripciones_nombre ON inscripciones (nombre)")
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_inscripciones_dni_nombre ON inscripciones (dni_socio, nombre)")
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_invitados_socio_dni ON invitados (socio_dni)")
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_invitados_dni ON invitados (dni)")
+
+
+def migracion_tickets(cursor):
+    # Índice del almacén de tickets: ubicación de cada ticket en los segmentos
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS tickets (
+        pago_id INTEGER PRIMARY KEY,
+        dni TEXT NOT NULL,
+        segmento INTEGER NOT NULL,
+        desplazamiento INTEGER NOT NULL,
+        longitud INTEGER NOT NULL
+    )
+    ''')
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_tickets_dni ON tickets (dni)")
+
+
+def migracion_contadores_inscripciones(cursor):
+    # Contador de inscritos por deporte, mantenido por triggers: los controles
+    # de cupo y los listados de ocupación leen una columna en vez de contar
+    cursor.execute(
+        "ALTER TABLE deportes ADD COLUMN inscritos INTEGER NOT NULL DEFAULT 0")
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS trg_inscripciones_alta AFTER INSERT ON inscripciones
+    BEGIN
+        UPDATE deportes SET inscritos = inscritos + 1 WHERE nombre = NEW.nombre;
+    END
+    ''')
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS trg_inscripciones_baja AFTER DELETE ON inscripciones
+    BEGIN
+        UPDATE deportes SET inscritos = inscritos - 1 WHERE nombre = OLD.nombre;
+    END
+    ''')
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS trg_inscripciones_cambio AFTER UPDATE OF nombre ON inscripciones
+    WHEN OLD.nombre IS NOT NEW.nombre
+    BEGIN
+        UPDATE deportes SET inscritos = inscritos - 1 WHERE nombre = OLD.nombre;
+        UPDATE deportes SET inscritos = inscritos + 1 WHERE nombre = NEW.nombre;
+    END
+    ''')
+    reconciliar_contadores(cursor)
+
+
+def reconciliar_contadores(cursor):
+    # Recalcula los contadores desde inscripciones; devuelve los deportes
+    # corregidos como [(nombre, valor_anterior, valor_real)]
+    cursor.execute('''
+    SELECT d.nombre, d.inscritos, COUNT(i.nombre)
+    FROM deportes d
+    LEFT JOIN inscripciones i ON i.nombre = d.nombre
+    GROUP BY d.nombre
+    HAVING d.inscritos <> COUNT(i.nombre)
+    ''')
+    diferencias = cursor.fetchall()
+    cursor.executemany(
+        "UPDATE deportes SET inscritos = ? WHERE nombre = ?",
+        [(real, nombre) for nombre, _, real in diferencias])
+    return diferencias
+
+
+def migracion_vencimientos(cursor):
+    # Vencimiento de cada inscripción deportiva (tomado del último pago de esa
+    # cuota) e índices para buscar por fecha sin recorrer todas las filas
+    cursor.execute("ALTER TABLE inscripciones ADD COLUMN fecha_vencimiento TEXT")
+    cursor.execute('''
+    UPDATE inscripciones SET fecha_vencimiento = (
+        SELECT MAX(r.fecha_vencimiento) FROM rendicion_cuentas r
+        WHERE r.dni = inscripciones.dni_socio AND r.tipo_pago = 'Cuota ' || inscripciones.nombre
+    )
+    ''')
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_socios_vencimiento ON socios (fecha_vencimiento)")
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_inscripciones_vencimiento ON inscripciones (fecha_vencimiento)")
+
+
+def migracion_facturas(cursor):
+    # Un cargo por persona, concepto y período: la facturación mensual se
+    # puede repetir sin cobrar dos veces
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS facturas (
+        periodo TEXT NOT NULL,
+        dni TEXT NOT NULL,
+        concepto TEXT NOT NULL,
+        pago_id INTEGER NOT NULL REFERENCES rendicion_cuentas (id),
+        PRIMARY KEY (periodo, dni, concepto)
+    )
+    ''')
+
+
+def migracion_busqueda(cursor):
+    # Índices de texto completo (FTS5) sobre las personas, con contenido
+    # externo: la tabla FTS5 solo guarda el índice y los triggers la
+    # sincronizan. remove_diacritics hace que "perez" encuentre "Pérez".
+    columnas_por_tabla = {
+        "socios": ("dni", "nombre", "apellido", "email", "telefono"),
+        "no_socios": ("dni", "nombre", "apellido", "email", "telefono"),
+        "invitados": ("dni", "nombre", "apellido"),
+        "profesores": ("dni", "nombre", "apellido", "telefono"),
+    }
+    for tabla, columnas in columnas_por_tabla.items():
+        fts = f"{tabla}_fts"
+        lista = ", ".join(columnas)
+        nuevos = ", ".join(f"new.{columna}" for columna in columnas)
+        viejos = ", ".join(f"old.{columna}" for columna in columnas)
+        cursor.execute(f'''
+        CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+            {lista},
+            content='{tabla}', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        )
+        ''')
+        cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_{fts}_alta AFTER INSERT ON {tabla} BEGIN
+            INSERT INTO {fts} (rowid, {lista}) VALUES (new.id, {nuevos});
+        END
+        ''')
+        cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_{fts}_baja AFTER DELETE ON {tabla} BEGIN
+            INSERT INTO {fts} ({fts}, rowid, {lista}) VALUES ('delete', old.id, {viejos});
+        END
+        ''')
+        cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_{fts}_cambio AFTER UPDATE OF {lista} ON {tabla} BEGIN
+            INSERT INTO {fts} ({fts}, rowid, {lista}) VALUES ('delete', old.id, {viejos});
+            INSERT INTO {fts} (rowid, {lista}) VALUES (new.id, {nuevos});
+        END
+        ''')
+        cursor.execute(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')")
+
+
+def migracion_personas(cursor):
+    # Vista única de personas por DNI; si un DNI figura en varias tablas,
+    # `prioridad` indica cuál define su tipo (socio antes que invitado)
+    cursor.execute('''
+    CREATE VIEW IF NOT EXISTS personas AS
+        SELECT dni, 'Socio' AS tipo, NULL AS socio_dni, 1 AS prioridad FROM socios
+        UNION ALL
+        SELECT dni, 'Invitado', socio_dni, 2 FROM invitados
+        UNION ALL
+        SELECT dni, 'No Socio', NULL, 3 FROM no_socios
+    ''')
+
+
+def _reconstruir_tabla(cursor, tabla, columnas):
+    # SQLite no cambia el tipo de una columna: se crea la tabla con el tipo
+    # nuevo, se copian las filas convertidas y se reemplaza la anterior
+    # conservando ids, secuencia AUTOINCREMENT, índices y triggers.
+    # columnas: {columna: (tipo_nuevo, expresión de conversión)}
+    sql_tabla = cursor.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (tabla,)).fetchone()[0]
+    dependientes = [fila[0] for fila in cursor.execute(
+        "SELECT sql FROM sqlite_master WHERE tbl_name = ? AND type IN ('index', 'trigger') AND sql IS NOT NULL",
+        (tabla,))]
+    secuencia = cursor.execute(
+        "SELECT seq FROM sqlite_sequence WHERE name = ?", (tabla,)).fetchone()
+    nombres = [fila[1] for fila in cursor.execute(f"PRAGMA table_info({tabla})")]
+
+    # Una tabla ya reconstruida figura en sqlite_master con el nombre entre comillas
+    sql_tabla = re.sub(rf"""TABLE\s+(IF NOT EXISTS\s+)?["'`]?{tabla}\b["'`]?""", f"TABLE {tabla}_nueva",
+                       sql_tabla, count=1)
+    for columna, (tipo, _) in columnas.items():
+        sql_tabla, cambios = re.subn(rf"\b{columna}\s+\w+", f"{columna} {tipo}", sql_tabla, count=1)
+        if not cambios:
+            raise RuntimeError(f"No se encontró la columna {tabla}.{columna}")
+
+    cursor.execute(sql_tabla)
+    cursor.execute(f'''
+    INSERT INTO {tabla}_nueva ({", ".join(nombres)})
+    SELECT {", ".join(columnas[nombre][1] if nombre in columnas else nombre for nombre in nombres)}
+    FROM {tabla}
+    ''')
+    cursor.execute(f"DROP TABLE {tabla}")
+    cursor.execute(f"ALTER TABLE {tabla}_nueva RENAME TO {tabla}")
+    if secuencia:
+        cursor.execute("UPDATE sqlite_sequence SET seq = ? WHERE name = ?", (secuencia[0], tabla))
+    for sql in dependientes:
+        cursor.execute(sql)
+
+
+def migracion_centavos(cursor):
+    # Montos en centavos enteros (ver dinero.py): las sumas son exactas y se
+    # hacen con aritmética entera. legacy_alter_table evita que el RENAME
+    # revise las vistas y triggers que nombran a la tabla reemplazada.
+    def centavos(columna):
+        return ("INTEGER", f"CAST(round({columna} * 100) AS INTEGER)")
+
+    # Índices de rendicion_cuentas que reemplazan los de cobertura de abajo; se
+    # borran antes de copiar la tabla para no reconstruirlos
+    cursor.execute("DROP INDEX IF EXISTS idx_rendicion_fecha_pago")
+    cursor.execute("DROP INDEX IF EXISTS idx_rendicion_tipo_fecha")
+
+    cursor.execute("PRAGMA legacy_alter_table = ON")
+    try:
+        _reconstruir_tabla(cursor, "socios", {"cuota_social": centavos("cuota_social")})
+        _reconstruir_tabla(cursor, "deportes", {"cuota": centavos("cuota")})
+        _reconstruir_tabla(cursor, "rendicion_cuentas", {"monto": centavos("monto")})
+    finally:
+        cursor.execute("PRAGMA legacy_alter_table = OFF")
+    # inscripciones.cuota ya se declaraba INTEGER: alcanza con convertir los valores
+    cursor.execute("UPDATE inscripciones SET cuota = CAST(round(cuota * 100) AS INTEGER)")
+
+    # Índices de cobertura: SUM(monto) por tipo de pago, o por rango de fechas
+    # y tipo, se responde leyendo solo el índice
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_rendicion_fecha_tipo_monto ON rendicion_cuentas (fecha_pago, tipo_pago, monto)")
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_rendicion_tipo_monto ON rendicion_cuentas (tipo_pago, monto)")
+
+
+def migracion_fechas_enteras(cursor):
+    # Fechas de pago y de vencimiento como número de día (ver fechas.py): los
+    # índices por fecha son más chicos y comparar o sumar días es aritmética
+    # entera. Los índices y triggers de cada tabla se recrean al reconstruirla.
+    def dia(columna):
+        return ("INTEGER", sql_a_dia(columna))
+
+    cursor.execute("PRAGMA legacy_alter_table = ON")
+    try:
+        _reconstruir_tabla(cursor, "rendicion_cuentas", {"fecha_pago": dia("fecha_pago"),
+                                                         "fecha_vencimiento": dia("fecha_vencimiento")})
+        _reconstruir_tabla(cursor, "socios", {"fecha_vencimiento": dia("fecha_vencimiento")})
+        _reconstruir_tabla(cursor, "inscripciones", {"fecha_vencimiento": dia("fecha_vencimiento")})
+    finally:
+        cursor.execute("PRAGMA legacy_alter_table = OFF")
+
+
+# Migraciones en orden: la posición i (desde 1) lleva el esquema a la versión i.
+# Nunca modificar una migración publicada; los cambios nuevos se agregan al final.
+MIGRACIONES = [
+    migracion_esquema_inicial,
+    migracion_indices,
+    migracion_tickets,
+    migracion_contadores_inscripciones,
+    migracion_vencimientos,
+    migracion_facturas,
+    migracion_busqueda,
+    migracion_personas,
+    migracion_centavos,
+    migracion_fechas_enteras,
+]
+
+VERSION_ESQUEMA = len(MIGRACIONES)
+
+
+def version_esquema(conexion):
+    return conexion.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrar(conexion):
+    # Aplica las migraciones pendientes, cada una en su propia transacción
+    if conexion.in_transaction:
+        conexion.commit()
+    version = version_esquema(conexion)
+    aplicadas = 0
+    for numero in range(version + 1, VERSION_ESQUEMA + 1):
+        cursor = conexion.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            # Otra terminal pudo haber migrado mientras se esperaba el bloqueo
+            if version_esquema(conexion) >= numero:
+                conexion.rollback()
+                continue
+            MIGRACIONES[numero - 1](cursor)
+            cursor.execute(f"PRAGMA user_version = {numero}")
+            conexion.commit()
+        except Exception:
+            conexion.rollback()
+            raise
+        aplicadas += 1
+
+    if aplicadas:
+        # Actualizar estadísticas para que el planificador use los índices nuevos
+        conexion.execute("ANALYZE")
+        conexion.commit()
+        invalidar_permisos()
+    return aplicadas
+
+
+def asegurar_esquema(conexion=None):
+    # Para el arranque del programa: una lectura de user_version y solo si la
+    # base está atrasada (o recién creada) se aplican las migraciones
+    conexion = conexion or obtener_conexion()
+    version = version_esquema(conexion)
+    if version == VERSION_ESQUEMA:
+        return 0
+    if version > VERSION_ESQUEMA:
+        raise RuntimeError(f"La base de datos está en la versión {version}, "
+                           f"más nueva que la de este programa ({VERSION_ESQUEMA}).")
+    return migrar(conexion)
+
+
+def inicializar_base_datos():
+    conexion = obtener_conexion()
+    version_anterior = version_esquema(conexion)
+    aplicadas = migrar(conexion)
+    if aplicadas:
+        print(f"Base de datos actualizada de la versión {version_anterior} "
+              f"a la {VERSION_ESQUEMA}.")
+    else:
+        print(f"La base de datos ya está en la versión {VERSION_ESQUEMA}.")
     print("Base de datos inicializada con éxito.")
 
 
+def reconciliar():
+    conexion = obtener_conexion()
+    with transaccion(conexion):
+        diferencias = reconciliar_contadores(conexion.cursor())
+    if not diferencias:
+        print("Los contadores de inscritos están al día.")
+    for nombre, anterior, real in diferencias:
+        print(f"{nombre}: inscritos corregido de {anterior} a {real}.")
+
+
 if __name__ == "__main__":
+    # argparse solo hace falta por línea de comandos: main.py importa este
+    # módulo en cada arranque
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Crea o actualiza la base de datos del club.")
+    parser.add_argument("--reconciliar", action="store_true",
+                        help="Recalcular los contadores de inscritos de cada deporte")
+    args = parser.parse_args()
+
     inicializar_base_datos()
+    if args.reconciliar:
+        reconciliar()
@@ -0,0 +1,67 @@
+# dinero.py
+# Importes en centavos. En la base todo monto es un INTEGER de centavos: las
+# sumas son exactas y SQLite las resuelve con aritmética entera. Dinero es un
+# int (se guarda y se suma como tal) que se muestra en pesos: f"{monto:.2f}".
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+
+CENTAVOS_POR_PESO = 100
+
+
+class Dinero(int):
+    __slots__ = ()
+
+    @classmethod
+    def desde_pesos(cls, valor):
+        # "1500", "1500,50", 1500.5 o Decimal -> centavos; la mitad se redondea hacia arriba
+        if isinstance(valor, Dinero):
+            return valor
+        try:
+            pesos = Decimal(str(valor).strip().replace(",", "."))
+        except InvalidOperation:
+            raise ValueError(f"Importe no válido: {valor}")
+        if not pesos.is_finite():
+            raise ValueError(f"Importe no válido: {valor}")
+        return cls((pesos * CENTAVOS_POR_PESO).to_integral_value(rounding=ROUND_HALF_UP))
+
+    @property
+    def pesos(self):
+        return Decimal(int(self)).scaleb(-2)
+
+    def con_descuento(self, porcentaje):
+        # Descuento entero en por ciento, redondeado una sola vez al centavo
+        # (la mitad hacia arriba). Es la misma cuenta que sql_con_descuento().
+        return Dinero((int(self) * (100 - porcentaje) + 50) // 100)
+
+    def __add__(self, otro):
+        if isinstance(otro, int):
+            return Dinero(int(self) + int(otro))
+        return NotImplemented
+
+    __radd__ = __add__
+
+    def __sub__(self, otro):
+        if isinstance(otro, int):
+            return Dinero(int(self) - int(otro))
+        return NotImplemented
+
+    def __rsub__(self, otro):
+        if isinstance(otro, int):
+            return Dinero(int(otro) - int(self))
+        return NotImplemented
+
+    def __neg__(self):
+        return Dinero(-int(self))
+
+    def __format__(self, especificacion):
+        return format(self.pesos, especificacion or ".2f")
+
+    def __str__(self):
+        return format(self.pesos, ".2f")
+
+    def __repr__(self):
+        return f"Dinero({int(self)})"
+
+
+def sql_con_descuento(columna, porcentaje):
+    # Expresión SQL equivalente a Dinero.con_descuento para una columna en centavos
+    return f"(({columna}) * (100 - ({porcentaje})) + 50) / 100"
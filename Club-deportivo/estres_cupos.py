@@ -0,0 +1,102 @@
+# estres_cupos.py
+# Prueba de carga: varios puestos de recepción (procesos) pagan a la vez la
+# cuota del mismo deporte y se verifica que nunca se supere el cupo. Sale con
+# código 1 si hubo sobreventa, inscripciones repetidas o errores inesperados,
+# así sirve como prueba de regresión de ServicioClub._reservar_cupo.
+import argparse
+import os
+import tempfile
+import time
+from multiprocessing import Barrier, Pool
+
+import conexion_db
+from config_db import migrar
+from servicios import ErrorOperacion, ServicioClub
+
+DEPORTE = "Futbol"
+
+
+def _iniciar_puesto(ruta_db, barrera):
+    conexion_db.configurar_ruta_db(ruta_db)
+    global _servicio
+    _servicio = ServicioClub()
+    barrera.wait()
+
+
+def _pagar(dni):
+    try:
+        _servicio.pagar_cuota_deportiva(dni, DEPORTE, "Efectivo")
+        return "aceptado"
+    except ErrorOperacion as e:
+        if "cupos" in str(e):
+            return "sin cupo"
+        if "ya está inscrito" in str(e):
+            return "duplicado"
+        return "error"
+
+
+def preparar_base(ruta_db, cupos, personas):
+    conexion_db.configurar_ruta_db(ruta_db)
+    conexion = conexion_db.obtener_conexion()
+    migrar(conexion)
+    servicio = ServicioClub(conexion)
+    servicio.configurar_deporte(DEPORTE, "Lunes", "18:00", "Profesor", cupos, 1000)
+    with conexion_db.transaccion(conexion):
+        conexion.executemany(
+            "INSERT INTO no_socios (dni, nombre, apellido, telefono, email) VALUES (?, 'Prueba', 'Carga', '1234567', 'p@c.com')",
+            [(str(10000000 + i),) for i in range(personas)])
+    conexion_db.cerrar_conexiones()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de concurrencia sobre los cupos de un deporte.")
+    parser.add_argument("--puestos", type=int, default=8, help="Procesos pagando a la vez")
+    parser.add_argument("--cupos", type=int, default=50)
+    parser.add_argument("--personas", type=int, default=400, help="Intentos de inscripción")
+    parser.add_argument("--repetidos", type=int, default=50,
+                        help="Intentos extra con DNIs ya usados (deben rechazarse)")
+    args = parser.parse_args()
+
+    directorio = tempfile.mkdtemp(prefix="estres_cupos_")
+    ruta_db = os.path.join(directorio, "club.db")
+    preparar_base(ruta_db, args.cupos, args.personas)
+    dnis = [str(10000000 + i) for i in range(args.personas)]
+    dnis += dnis[:args.repetidos]
+
+    barrera = Barrier(args.puestos)
+    inicio = time.perf_counter()
+    with Pool(args.puestos, initializer=_iniciar_puesto, initargs=(ruta_db, barrera)) as puestos:
+        resultados = puestos.map(_pagar, dnis, chunksize=1)
+    segundos = time.perf_counter() - inicio
+
+    conexion_db.configurar_ruta_db(ruta_db)
+    conexion = conexion_db.obtener_conexion()
+    inscritos = conexion.execute(
+        "SELECT COUNT(*) FROM inscripciones WHERE nombre = ?", (DEPORTE,)).fetchone()[0]
+    pagos = conexion.execute(
+        "SELECT COUNT(*) FROM rendicion_cuentas WHERE tipo_pago = ?", (f"Cuota {DEPORTE}",)).fetchone()[0]
+    contador = conexion.execute(
+        "SELECT inscritos FROM deportes WHERE nombre = ?", (DEPORTE,)).fetchone()[0]
+    repetidos = conexion.execute("""
+        SELECT COUNT(*) FROM (SELECT dni_socio FROM inscripciones WHERE nombre = ?
+                              GROUP BY dni_socio HAVING COUNT(*) > 1)
+    """, (DEPORTE,)).fetchone()[0]
+    # Un "duplicado" solo es válido si ese DNI quedó efectivamente inscrito
+    inscriptos = {fila[0] for fila in conexion.execute(
+        "SELECT dni_socio FROM inscripciones WHERE nombre = ?", (DEPORTE,))}
+    duplicados_falsos = sum(1 for dni, estado in zip(dnis, resultados)
+                            if estado == "duplicado" and dni not in inscriptos)
+
+    print(f"Intentos: {len(dnis)} en {args.puestos} puestos ({segundos:.2f} s)")
+    for estado in ("aceptado", "sin cupo", "duplicado", "error"):
+        print(f"  {estado}: {resultados.count(estado)}")
+    print(f"Cupos: {args.cupos} - Inscritos: {inscritos} (contador {contador}) - Pagos registrados: {pagos}")
+
+    correcto = (inscritos == pagos == contador == resultados.count("aceptado") == min(args.cupos, args.personas)
+                and repetidos == 0 and duplicados_falsos == 0 and resultados.count("error") == 0)
+    print("OK: no hubo sobreventa." if correcto else "ERROR: el cupo no se respetó.")
+    raise SystemExit(0 if correcto else 1)
+
+
+if __name__ == "__main__":
+    main()
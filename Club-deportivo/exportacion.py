@@ -0,0 +1,120 @@
+# exportacion.py
+import argparse
+import csv
+import gzip
+import json
+from datetime import date, datetime
+
+from conexion_db import obtener_conexion
+from dinero import Dinero
+from fechas import COLUMNAS_FECHA, a_dia, iso_dia
+from trazas import trazar
+
+TAMANO_LOTE = 1000
+TAMANO_BUFFER = 1 << 16
+FORMATOS = ("csv", "jsonl")
+# Columnas guardadas en centavos; en el archivo van en pesos con dos decimales.
+# Las fechas guardadas como número de día (COLUMNAS_FECHA) van como AAAA-MM-DD.
+COLUMNAS_DINERO = ("monto", "cuota_social", "cuota")
+
+# Consultas de exportación: orden estable para que dos exportaciones sean comparables
+CONSULTAS = {
+    "socios": "SELECT * FROM socios ORDER BY id",
+    "no_socios": "SELECT * FROM no_socios ORDER BY id",
+    "invitados": "SELECT * FROM invitados ORDER BY id",
+    "profesores": "SELECT * FROM profesores ORDER BY id",
+    "rendicion_cuentas": "SELECT * FROM rendicion_cuentas ORDER BY id",
+}
+
+CONSULTA_PAGOS_POR_FECHA = """
+    SELECT * FROM rendicion_cuentas
+    WHERE fecha_pago BETWEEN ? AND ?
+    ORDER BY fecha_pago, id
+"""
+
+
+def _abrir_salida(ruta, comprimir):
+    if comprimir:
+        return gzip.open(ruta, 'wt', encoding='utf-8', newline='')
+    return open(ruta, 'w', encoding='utf-8', newline='', buffering=TAMANO_BUFFER)
+
+
+@trazar("exportacion")
+def exportar(tabla, ruta, formato="csv", desde=None, hasta=None, comprimir=None, conexion=None):
+    # Recorre el cursor por lotes: la memoria no depende del tamaño de la tabla
+    if tabla not in CONSULTAS:
+        raise ValueError(f"Tabla no exportable: {tabla}")
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato no soportado: {formato}")
+    if comprimir is None:
+        comprimir = ruta.endswith(".gz")
+    conexion = conexion or obtener_conexion()
+
+    cursor = conexion.cursor()
+    if tabla == "rendicion_cuentas" and (desde or hasta):
+        cursor.execute(CONSULTA_PAGOS_POR_FECHA, (
+            a_dia(desde or date.min), a_dia(hasta or date.max)))
+    else:
+        cursor.execute(CONSULTAS[tabla])
+    columnas = [descripcion[0] for descripcion in cursor.description]
+    posiciones_dinero = [i for i, columna in enumerate(columnas) if columna in COLUMNAS_DINERO]
+    posiciones_fecha = [i for i, columna in enumerate(columnas) if columna in COLUMNAS_FECHA]
+
+    filas_exportadas = 0
+    with _abrir_salida(ruta, comprimir) as salida:
+        if formato == "csv":
+            escritor = csv.writer(salida)
+            escritor.writerow(columnas)
+        while True:
+            filas = cursor.fetchmany(TAMANO_LOTE)
+            if not filas:
+                break
+            if posiciones_dinero or posiciones_fecha:
+                filas = [_convertir(fila, posiciones_dinero, posiciones_fecha, formato) for fila in filas]
+            if formato == "csv":
+                escritor.writerows(filas)
+            else:
+                salida.write("".join(
+                    json.dumps(dict(zip(columnas, fila)), ensure_ascii=False) + "\n"
+                    for fila in filas))
+            filas_exportadas += len(filas)
+    return filas_exportadas
+
+
+def _convertir(fila, posiciones_dinero, posiciones_fecha, formato):
+    fila = list(fila)
+    for posicion in posiciones_dinero:
+        if fila[posicion] is not None:
+            pesos = Dinero(fila[posicion]).pesos
+            fila[posicion] = str(pesos) if formato == "csv" else float(pesos)
+    for posicion in posiciones_fecha:
+        if fila[posicion] is not None:
+            fila[posicion] = iso_dia(fila[posicion])
+    return fila
+
+
+def _fecha(texto):
+    return datetime.strptime(texto, "%Y-%m-%d").date()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Exporta tablas del club a CSV o JSONL.")
+    parser.add_argument("tabla", choices=sorted(CONSULTAS))
+    parser.add_argument("archivo", help="Archivo de salida (.gz para comprimir)")
+    parser.add_argument("--formato", choices=FORMATOS, default="csv")
+    parser.add_argument("--desde", type=_fecha,
+                        help="Fecha de pago inicial AAAA-MM-DD (solo rendicion_cuentas)")
+    parser.add_argument("--hasta", type=_fecha,
+                        help="Fecha de pago final AAAA-MM-DD (solo rendicion_cuentas)")
+    parser.add_argument("--gzip", action="store_true", dest="comprimir", default=None,
+                        help="Comprimir la salida con gzip")
+    args = parser.parse_args()
+
+    filas = exportar(args.tabla, args.archivo, args.formato,
+                     args.desde, args.hasta, args.comprimir)
+    print(f"{filas} filas exportadas a {args.archivo}.")
+
+
+if __name__ == "__main__":
+    main()
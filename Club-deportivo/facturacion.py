@@ -0,0 +1,158 @@
+# facturacion.py
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+
+from conexion_db import obtener_conexion, transaccion
+from dinero import Dinero, sql_con_descuento
+from fechas import a_dia, a_fecha
+from rendicion import rango_mes
+from personas import DESCUENTO_SOCIO_INVITADO
+from servicios import DIAS_VENCIMIENTO
+from tickets import AlmacenTickets, renderizar_ticket
+from trazas import incorporar, iniciar_proceso_de_trabajo, recolectados, traza, trazar
+from validaciones import validar_campo
+
+TAMANO_LOTE_TICKETS = 500
+
+# Cargos del período que todavía no tienen factura. La tabla facturas tiene
+# clave (periodo, dni, concepto): volver a correr el mismo mes solo encuentra
+# lo que faltó, nunca cobra dos veces. Tampoco se factura lo que ya se pagó en
+# el mes por otra vía (en el mostrador, al dar de alta al socio o en una
+# renovación): cualquier pago del mismo concepto con fecha_pago en el período.
+PAGADO_EN_PERIODO = """
+    SELECT 1 FROM rendicion_cuentas r
+    WHERE r.dni = {dni} AND r.tipo_pago = {concepto} AND r.fecha_pago BETWEEN :desde AND :hasta
+"""
+
+CONSULTA_CARGOS_SOCIALES = f"""
+    SELECT s.dni, s.cuota_social, 'Cuota Social', 'Socio'
+    FROM socios s
+    WHERE NOT EXISTS (SELECT 1 FROM facturas f
+                      WHERE f.periodo = :periodo AND f.dni = s.dni AND f.concepto = 'Cuota Social')
+      AND NOT EXISTS ({PAGADO_EN_PERIODO.format(dni="s.dni", concepto="'Cuota Social'")})
+    ORDER BY s.id
+"""
+
+CONSULTA_CARGOS_DEPORTIVOS = f"""
+    WITH inscriptos AS (
+        SELECT i.rowid AS fila, i.dni_socio AS dni, i.nombre, d.cuota,
+               COALESCE((SELECT p.tipo FROM personas p WHERE p.dni = i.dni_socio
+                         ORDER BY p.prioridad LIMIT 1), 'No Socio') AS tipo_persona
+        FROM inscripciones i
+        JOIN deportes d ON d.nombre = i.nombre
+    )
+    SELECT dni,
+           {sql_con_descuento("cuota", "CASE WHEN tipo_persona = 'No Socio' THEN 0 ELSE :descuento END")},
+           'Cuota ' || nombre,
+           tipo_persona
+    FROM inscriptos c
+    WHERE NOT EXISTS (SELECT 1 FROM facturas f
+                      WHERE f.periodo = :periodo AND f.dni = c.dni AND f.concepto = 'Cuota ' || c.nombre)
+      AND NOT EXISTS ({PAGADO_EN_PERIODO.format(dni="c.dni", concepto="'Cuota ' || c.nombre")})
+    ORDER BY fila
+"""
+
+
+class ResultadoFacturacion:
+    def __init__(self, periodo, cargos, total, tickets):
+        self.periodo = periodo
+        self.cargos = cargos
+        self.total = total
+        self.tickets = tickets
+
+
+def _renderizar_lote(pagos):
+    # Se ejecuta en un proceso de trabajo: solo arma los textos y devuelve sus tramos
+    return [(pago_id, dni, renderizar_ticket(dni, monto, tipo_pago, metodo_pago,
+                                             a_fecha(fecha_pago), a_fecha(fecha_vencimiento), tipo_persona))
+            for pago_id, dni, monto, tipo_pago, metodo_pago, fecha_pago, fecha_vencimiento, tipo_persona
+            in pagos], recolectados()
+
+
+def emitir_tickets_pendientes(periodo, conexion=None, tickets=None, procesos=None):
+    # Tickets de las facturas del período que aún no se guardaron; se puede
+    # repetir sin duplicar si la emisión anterior quedó a medias
+    conexion = conexion or obtener_conexion()
+    tickets = tickets or AlmacenTickets()
+    pagos = conexion.execute("""
+        SELECT r.id, r.dni, r.monto, r.tipo_pago, r.metodo_pago, r.fecha_pago, r.fecha_vencimiento, r.tipo_persona
+        FROM facturas f
+        JOIN rendicion_cuentas r ON r.id = f.pago_id
+        WHERE f.periodo = ? AND NOT EXISTS (SELECT 1 FROM tickets t WHERE t.pago_id = f.pago_id)
+        ORDER BY r.id
+    """, (periodo,)).fetchall()
+    if not pagos:
+        return 0
+
+    lotes = [pagos[inicio:inicio + TAMANO_LOTE_TICKETS]
+             for inicio in range(0, len(pagos), TAMANO_LOTE_TICKETS)]
+    procesos = procesos or min(len(lotes), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=procesos, initializer=iniciar_proceso_de_trabajo) as ejecutor:
+        for renderizados, tramos in ejecutor.map(_renderizar_lote, lotes):
+            incorporar(tramos)
+            tickets.guardar_lote(conexion, renderizados)
+    return len(pagos)
+
+
+@trazar("facturacion")
+def facturar_mes(mes=None, metodo_pago="Debito", conexion=None, tickets=None, procesos=None):
+    # Genera los cargos del mes "MM-AAAA" para todos los socios e inscripciones
+    metodo_pago = validar_campo("pago", "metodo_pago", metodo_pago)
+    fecha_pago, fin_periodo = rango_mes(mes)
+    periodo = fecha_pago.strftime("%Y-%m")
+    fecha_vencimiento = fecha_pago + timedelta(days=DIAS_VENCIMIENTO)
+    conexion = conexion or obtener_conexion()
+    parametros = {"periodo": periodo, "descuento": DESCUENTO_SOCIO_INVITADO,
+                  "desde": a_dia(fecha_pago), "hasta": a_dia(fin_periodo)}
+
+    with traza("cargos"), transaccion(conexion):
+        cargos = conexion.execute(CONSULTA_CARGOS_SOCIALES, parametros).fetchall()
+        cargos += conexion.execute(CONSULTA_CARGOS_DEPORTIVOS, parametros).fetchall()
+
+        ultimo_id = conexion.execute(
+            "SELECT COALESCE(MAX(id), 0) FROM rendicion_cuentas").fetchone()[0]
+        conexion.executemany("""
+            INSERT INTO rendicion_cuentas (dni, monto, tipo_pago, metodo_pago, fecha_pago, tipo_persona, fecha_vencimiento)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, [(dni, monto, concepto, metodo_pago, a_dia(fecha_pago), tipo_persona,
+               a_dia(fecha_vencimiento)) for dni, monto, concepto, tipo_persona in cargos])
+        # La transacción tiene el bloqueo de escritura: los ids nuevos son los
+        # mayores a ultimo_id, en el mismo orden de los cargos
+        pago_ids = [fila[0] for fila in conexion.execute(
+            "SELECT id FROM rendicion_cuentas WHERE id > ? ORDER BY id", (ultimo_id,))]
+        conexion.executemany(
+            "INSERT INTO facturas (periodo, dni, concepto, pago_id) VALUES (?, ?, ?, ?)",
+            [(periodo, dni, concepto, pago_id) for (dni, _, concepto, _), pago_id in zip(cargos, pago_ids)])
+
+        # El cargo cubre el período: se adelantan los vencimientos que quedaron atrás
+        conexion.executemany(
+            "UPDATE socios SET fecha_vencimiento = max(fecha_vencimiento, ?) WHERE dni = ?",
+            [(a_dia(fecha_vencimiento), dni) for dni, _, concepto, _ in cargos
+             if concepto == "Cuota Social"])
+        conexion.executemany(
+            "UPDATE inscripciones SET fecha_vencimiento = max(COALESCE(fecha_vencimiento, 0), ?) "
+            "WHERE dni_socio = ? AND nombre = ?",
+            [(a_dia(fecha_vencimiento), dni, concepto.removeprefix("Cuota ")) for dni, _, concepto, _ in cargos
+             if concepto != "Cuota Social"])
+
+    emitidos = emitir_tickets_pendientes(periodo, conexion, tickets, procesos)
+    return ResultadoFacturacion(periodo, len(cargos), Dinero(sum(cargo[1] for cargo in cargos)), emitidos)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Facturación mensual de cuotas sociales y deportivas.")
+    parser.add_argument("mes", nargs="?", help="Mes a facturar MM-AAAA (por defecto el actual)")
+    parser.add_argument("--metodo", default="Debito", help="Método de pago de los cargos")
+    parser.add_argument("--procesos", type=int, help="Procesos para generar los tickets")
+    args = parser.parse_args()
+
+    resultado = facturar_mes(args.mes, args.metodo, procesos=args.procesos)
+    print(f"Período {resultado.periodo}: {resultado.cargos} cargos nuevos por ${resultado.total:.2f}.")
+    print(f"Tickets emitidos: {resultado.tickets}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+# fechas.py
+# Fechas de pago y de vencimiento como número de día: el mismo entero que
+# date.toordinal() (el 1 es el 01/01/0001). En la base son INTEGER, así los
+# rangos se comparan como enteros y sumar días es una suma. Un reporte repite
+# unas pocas fechas muchas veces: el texto de cada día se arma una sola vez.
+from datetime import date
+from functools import lru_cache
+
+FORMATO_PANTALLA = "%d/%m/%Y"
+FORMATO_ISO = "%Y-%m-%d"
+# Columnas guardadas como número de día
+COLUMNAS_FECHA = ("fecha_pago", "fecha_vencimiento")
+# julianday() de SQLite menos este desfase da el número de día de Python
+DESFASE_JULIANO = 1721424.5
+
+
+def a_dia(fecha):
+    return None if fecha is None else fecha.toordinal()
+
+
+def a_fecha(dia):
+    return None if dia is None else date.fromordinal(dia)
+
+
+@lru_cache(maxsize=4096)
+def formatear_dia(dia, formato=FORMATO_PANTALLA):
+    if dia is None:
+        return ""
+    return date.fromordinal(dia).strftime(formato)
+
+
+def iso_dia(dia):
+    return formatear_dia(dia, FORMATO_ISO)
+
+
+def sql_a_dia(columna):
+    # Expresión SQL que convierte una fecha en texto ("AAAA-MM-DD", con o sin
+    # hora) en número de día; NULL y textos que no son fechas quedan en NULL
+    return f"CAST(julianday(date({columna})) - {DESFASE_JULIANO} AS INTEGER)"
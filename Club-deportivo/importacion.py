@@ -0,0 +1,237 @@
+# importacion.py
+import argparse
+import csv
+import time
+from datetime import datetime, timedelta
+
+from conexion_db import obtener_conexion, transaccion
+from fechas import a_dia
+from personas import RESOLUTOR
+from servicios import DIAS_VENCIMIENTO, MAX_INVITADOS_POR_SOCIO
+from validaciones import ESQUEMAS, validar_lote
+
+TAMANO_LOTE = 5000
+LIMITE_PARAMETROS = 500  # valores por consulta IN (...)
+
+
+def _consultar_en_bloques(cursor, consulta, valores):
+    # Ejecuta `consulta` (con un marcador {} para la lista IN) en bloques
+    valores = list(valores)
+    for inicio in range(0, len(valores), LIMITE_PARAMETROS):
+        bloque = valores[inicio:inicio + LIMITE_PARAMETROS]
+        marcadores = ", ".join("?" * len(bloque))
+        cursor.execute(consulta.format(marcadores), bloque)
+        yield from cursor.fetchall()
+
+
+def _dnis_existentes(cursor, tabla, dnis):
+    return {fila[0] for fila in _consultar_en_bloques(
+        cursor, f"SELECT dni FROM {tabla} WHERE dni IN ({{}})", set(dnis))}
+
+
+# Inserción por lote: revisa duplicados contra la base y dentro del archivo,
+# inserta los válidos con executemany y devuelve [(registro, error)] rechazados.
+
+def _filtrar_duplicados(cursor, tabla, lote, vistos, posicion_dni=0):
+    existentes = _dnis_existentes(cursor, tabla, (r[1][posicion_dni] for r in lote))
+    aceptados, rechazados = [], []
+    for registro in lote:
+        dni = registro[1][posicion_dni]
+        if dni in existentes or dni in vistos:
+            rechazados.append((registro, f"El DNI {dni} ya está registrado."))
+        else:
+            vistos.add(dni)
+            aceptados.append(registro)
+    return aceptados, rechazados
+
+
+def _insertar_socios(cursor, lote, vistos):
+    aceptados, rechazados = _filtrar_duplicados(cursor, "socios", lote, vistos)
+    fecha_pago = a_dia(datetime.now().date())
+    socios, pagos = [], []
+    for _, (dni, nombre, apellido, domicilio, telefono, email, fecha_inscripcion,
+            cuota_social, metodo_pago) in aceptados:
+        fecha_vencimiento = a_dia(fecha_inscripcion + timedelta(days=DIAS_VENCIMIENTO))
+        socios.append((dni, nombre, apellido, domicilio, telefono, email,
+                       fecha_inscripcion.isoformat(), cuota_social, fecha_vencimiento))
+        pagos.append((dni, cuota_social, "Cuota Social", metodo_pago,
+                      fecha_pago, "Socio", fecha_vencimiento))
+    cursor.executemany("""
+        INSERT INTO socios (dni, nombre, apellido, domicilio, telefono, email, fecha_inscripcion, cuota_social, fecha_vencimiento)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, socios)
+    cursor.executemany("""
+        INSERT INTO rendicion_cuentas (dni, monto, tipo_pago, metodo_pago, fecha_pago, tipo_persona, fecha_vencimiento)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """, pagos)
+    return len(aceptados), rechazados
+
+
+def _insertar_no_socios(cursor, lote, vistos):
+    aceptados, rechazados = _filtrar_duplicados(cursor, "no_socios", lote, vistos)
+    cursor.executemany("""
+        INSERT INTO no_socios (dni, nombre, apellido, telefono, email)
+        VALUES (?, ?, ?, ?, ?)
+    """, [registro for _, registro in aceptados])
+    return len(aceptados), rechazados
+
+
+def _insertar_invitados(cursor, lote, vistos):
+    aceptados, rechazados = _filtrar_duplicados(
+        cursor, "invitados", lote, vistos, posicion_dni=1)
+
+    # Las mismas reglas que ServicioClub.registrar_invitado: el socio que
+    # invita debe existir y no superar el máximo de invitados, y el DNI del
+    # invitado no puede ser ya de un socio ni de un invitado (vista personas)
+    dnis_socios = {registro[0] for _, registro in aceptados}
+    socios = _dnis_existentes(cursor, "socios", dnis_socios)
+    cantidades = dict(_consultar_en_bloques(
+        cursor, "SELECT socio_dni, COUNT(*) FROM invitados WHERE socio_dni IN ({}) GROUP BY socio_dni",
+        dnis_socios))
+    registrados = {}
+    for dni, tipo in _consultar_en_bloques(
+            cursor, "SELECT dni, tipo FROM personas WHERE dni IN ({}) AND tipo <> 'No Socio' ORDER BY prioridad",
+            {registro[1] for _, registro in aceptados}):
+        registrados.setdefault(dni, tipo)
+    invitados = []
+    for item in aceptados:
+        socio_dni, dni, nombre, apellido = item[1]
+        if socio_dni not in socios:
+            rechazados.append((item, f"Socio {socio_dni} no encontrado."))
+            vistos.discard(dni)
+            continue
+        if dni in registrados:
+            rechazados.append((item, f"El DNI del invitado ya está registrado como {registrados[dni]}."))
+            vistos.discard(dni)
+            continue
+        cantidad = cantidades.get(socio_dni, 0)
+        if cantidad >= MAX_INVITADOS_POR_SOCIO:
+            rechazados.append(
+                (item, f"El socio {socio_dni} ya tiene el máximo de {MAX_INVITADOS_POR_SOCIO} invitados."))
+            vistos.discard(dni)
+            continue
+        cantidades[socio_dni] = cantidad + 1
+        invitados.append((nombre, apellido, dni, socio_dni))
+    cursor.executemany("""
+        INSERT INTO invitados (nombre, apellido, dni, socio_dni)
+        VALUES (?, ?, ?, ?)
+    """, invitados)
+    return len(invitados), rechazados
+
+
+def _insertar_profesores(cursor, lote, vistos):
+    aceptados, rechazados = _filtrar_duplicados(cursor, "profesores", lote, vistos)
+    cursor.executemany("""
+        INSERT INTO profesores (dni, nombre, apellido, telefono, domicilio, fecha_ingreso, deporte)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """, [registro[:5] + (registro[5].isoformat(), registro[6]) for _, registro in aceptados])
+    return len(aceptados), rechazados
+
+
+# tabla -> (esquema de validación, función de inserción por lote)
+IMPORTACIONES = {
+    "socios": ("socio", _insertar_socios),
+    "no_socios": ("no_socio", _insertar_no_socios),
+    "invitados": ("invitado", _insertar_invitados),
+    "profesores": ("profesor", _insertar_profesores),
+}
+
+
+class ResultadoImportacion:
+    def __init__(self, tabla, importadas, rechazadas, segundos, ruta_errores):
+        self.tabla = tabla
+        self.importadas = importadas
+        self.rechazadas = rechazadas
+        self.segundos = segundos
+        self.ruta_errores = ruta_errores
+
+    @property
+    def filas_por_segundo(self):
+        total = self.importadas + self.rechazadas
+        return total / self.segundos if self.segundos > 0 else float(total)
+
+
+def importar_csv(tabla, ruta, ruta_errores=None, tamano_lote=TAMANO_LOTE, conexion=None):
+    if tabla not in IMPORTACIONES:
+        raise ValueError(f"Tabla no soportada para importar: {tabla}")
+    esquema, insertar = IMPORTACIONES[tabla]
+    columnas = tuple(ESQUEMAS[esquema])
+    conexion = conexion or obtener_conexion()
+    ruta_errores = ruta_errores or f"{ruta}.errores.csv"
+
+    inicio = time.perf_counter()
+    importadas = 0
+    rechazadas = 0
+    vistos = set()
+
+    with open(ruta, newline='', encoding='utf-8-sig') as entrada, \
+            open(ruta_errores, 'w', newline='', encoding='utf-8') as salida_errores:
+        lector = csv.DictReader(entrada)
+        faltantes = [c for c in columnas if c not in (lector.fieldnames or ())]
+        if faltantes:
+            raise ValueError(
+                f"Faltan columnas en {ruta}: {', '.join(faltantes)}")
+        errores = csv.writer(salida_errores)
+        errores.writerow(("linea",) + columnas + ("error",))
+
+        def procesar(lineas, filas):
+            # Valida el lote completo de una vez y luego inserta los válidos
+            validos, invalidos = validar_lote(esquema, filas)
+            for indice, errores_fila in invalidos:
+                errores.writerow((lineas[indice],) + tuple(filas[indice].get(c) or '' for c in columnas)
+                                 + ("; ".join(errores_fila.values()),))
+            lote = [(indice, tuple(valores[c] for c in columnas))
+                    for indice, valores in validos]
+            cantidad, fallidos = insertar(cursor, lote, vistos)
+            for (indice, _), mensaje in fallidos:
+                errores.writerow((lineas[indice],) + tuple(filas[indice].get(c) or '' for c in columnas)
+                                 + (mensaje,))
+            return cantidad, len(invalidos) + len(fallidos)
+
+        # Toda la importación va en una sola transacción; si quien llama ya
+        # tiene una abierta, se anida con un SAVEPOINT en lugar de confirmarla
+        with transaccion(conexion):
+            cursor = conexion.cursor()
+            lineas = []
+            filas = []
+            for linea, fila in enumerate(lector, start=2):
+                lineas.append(linea)
+                filas.append(fila)
+                if len(filas) >= tamano_lote:
+                    cantidad, fallidas = procesar(lineas, filas)
+                    importadas += cantidad
+                    rechazadas += fallidas
+                    lineas = []
+                    filas = []
+            if filas:
+                cantidad, fallidas = procesar(lineas, filas)
+                importadas += cantidad
+                rechazadas += fallidas
+
+    # Las personas nuevas pueden cambiar cómo se clasifica un DNI ya consultado
+    # por esta misma conexión, que data_version no registra
+    RESOLUTOR.invalidar()
+
+    segundos = time.perf_counter() - inicio
+    return ResultadoImportacion(tabla, importadas, rechazadas, segundos, ruta_errores)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Importación masiva desde CSV (socios, no_socios, invitados, profesores).")
+    parser.add_argument("tabla", choices=sorted(IMPORTACIONES))
+    parser.add_argument("archivo", help="Archivo CSV con encabezados")
+    parser.add_argument("--errores", help="Archivo CSV para las filas rechazadas")
+    parser.add_argument("--lote", type=int, default=TAMANO_LOTE,
+                        help="Filas por executemany")
+    args = parser.parse_args()
+
+    resultado = importar_csv(args.tabla, args.archivo, args.errores, args.lote)
+    print(f"Importadas: {resultado.importadas}")
+    print(f"Rechazadas: {resultado.rechazadas} (ver {resultado.ruta_errores})")
+    print(f"Tiempo: {resultado.segundos:.2f} s "
+          f"({resultado.filas_por_segundo:.0f} filas/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+# instrumentacion.py
+# Medición de las sentencias SQL. Se activa con la variable de entorno
+# CLUB_SQL_INSTRUMENTACION=1; apagada, las conexiones son sqlite3.Connection
+# comunes y no hay ningún costo. Otras variables:
+#   CLUB_SQL_LENTAS_MS   umbral del registro de consultas lentas (100 por defecto)
+#   CLUB_SQL_LOG         archivo del registro de consultas lentas (sql_lentas.log)
+import atexit
+import itertools
+import os
+import re
+import signal
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque
+
+ACTIVADA = os.environ.get("CLUB_SQL_INSTRUMENTACION", "").lower() in ("1", "si", "true")
+UMBRAL_LENTAS_MS = float(os.environ.get("CLUB_SQL_LENTAS_MS", "100"))
+RUTA_LOG_LENTAS = os.environ.get("CLUB_SQL_LOG", "sql_lentas.log")
+MUESTRAS_POR_SENTENCIA = 1024
+SIN_PLAN = ("BEGIN", "COMMIT", "ROLLBACK", "SAVEPOINT", "RELEASE", "PRAGMA", "ANALYZE", "CREATE", "ALTER", "DROP")
+
+_ESPACIOS = re.compile(r"\s+")
+_candado = threading.Lock()
+_estadisticas = {}
+_planes_registrados = set()
+_claves = {}
+_registro_lentas = None
+
+
+class Estadistica:
+    __slots__ = ("cantidad", "total", "maximo", "filas", "muestras")
+
+    def __init__(self):
+        self.cantidad = 0
+        self.total = 0.0
+        self.maximo = 0.0
+        self.filas = 0
+        # Solo las últimas mediciones: memoria acotada aunque el proceso dure meses
+        self.muestras = deque(maxlen=MUESTRAS_POR_SENTENCIA)
+
+    def percentil(self, p):
+        muestras = sorted(self.muestras)
+        if not muestras:
+            return 0.0
+        return muestras[min(len(muestras) - 1, int(len(muestras) * p))]
+
+
+def _normalizar(sql):
+    # Las sentencias del programa son casi siempre las mismas cadenas: se
+    # normalizan una vez y se reutiliza el resultado
+    clave = _claves.get(sql)
+    if clave is None:
+        clave = _claves[sql] = _ESPACIOS.sub(" ", sql).strip()
+    return clave
+
+
+def _registrar(conexion, sql, parametros, segundos, filas):
+    clave = _normalizar(sql)
+    with _candado:
+        estadistica = _estadisticas.get(clave)
+        if estadistica is None:
+            estadistica = _estadisticas[clave] = Estadistica()
+        estadistica.cantidad += 1
+        estadistica.total += segundos
+        estadistica.filas += max(filas, 0)
+        estadistica.muestras.append(segundos)
+        if segundos > estadistica.maximo:
+            estadistica.maximo = segundos
+    if segundos * 1000 >= UMBRAL_LENTAS_MS:
+        _registrar_lenta(conexion, clave, parametros, segundos)
+
+
+def _registrar_lenta(conexion, sql, parametros, segundos):
+    global _registro_lentas
+    if _registro_lentas is None:
+        # logging se carga recién con la primera consulta lenta: no suma al arranque
+        import logging
+        registro = logging.getLogger("club.sql_lentas")
+        if not registro.handlers:
+            manejador = logging.FileHandler(RUTA_LOG_LENTAS, encoding="utf-8")
+            manejador.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            registro.addHandler(manejador)
+            registro.setLevel(logging.INFO)
+            registro.propagate = False
+        _registro_lentas = registro
+
+    mensaje = f"{segundos * 1000:.1f} ms | {sql} | parámetros: {str(parametros)[:200]}"
+    # El plan se pide una sola vez por sentencia, con un cursor sin medir
+    if sql not in _planes_registrados and not sql.upper().startswith(SIN_PLAN):
+        _planes_registrados.add(sql)
+        try:
+            plan = sqlite3.Cursor(conexion).execute(f"EXPLAIN QUERY PLAN {sql}", parametros).fetchall()
+            mensaje += "".join(f"\n    {detalle}" for _, _, _, detalle in plan)
+        except sqlite3.Error as e:
+            mensaje += f"\n    (sin plan: {e})"
+    _registro_lentas.info(mensaje)
+
+
+class CursorInstrumentado(sqlite3.Cursor):
+    # El tiempo de una sentencia incluye su ejecución y la lectura de sus
+    # filas; se registra al agotar el resultado, al ejecutar otra o al cerrar.
+    _pendiente = None
+
+    def _cerrar_pendiente(self):
+        pendiente = self._pendiente
+        if pendiente is not None:
+            self._pendiente = None
+            sql, parametros, segundos, filas = pendiente
+            _registrar(self.connection, sql, parametros, segundos, filas)
+
+    def _medir_lectura(self, lectura, *args):
+        inicio = time.perf_counter()
+        resultado = lectura(*args)
+        if self._pendiente is not None:
+            sql, parametros, segundos, filas = self._pendiente
+            leidas = len(resultado) if isinstance(resultado, list) else int(resultado is not None)
+            self._pendiente = (sql, parametros, segundos + time.perf_counter() - inicio, filas + leidas)
+        return resultado
+
+    def execute(self, sql, parametros=()):
+        self._cerrar_pendiente()
+        inicio = time.perf_counter()
+        super().execute(sql, parametros)
+        segundos = time.perf_counter() - inicio
+        filas = 0 if self.description is not None else self.rowcount
+        self._pendiente = (sql, parametros, segundos, filas)
+        if self.description is None:
+            self._cerrar_pendiente()
+        return self
+
+    def executemany(self, sql, secuencia):
+        # Se guarda el primer juego de parámetros para que EXPLAIN QUERY PLAN
+        # de un lote lento pueda ligar los marcadores; si `secuencia` es un
+        # generador, el primer elemento se vuelve a poner adelante
+        iterador = iter(secuencia)
+        primero = next(iterador, None)
+        if primero is not None:
+            secuencia = itertools.chain((primero,), iterador)
+        else:
+            secuencia = ()
+        self._cerrar_pendiente()
+        inicio = time.perf_counter()
+        super().executemany(sql, secuencia)
+        _registrar(self.connection, sql, primero if primero is not None else (),
+                   time.perf_counter() - inicio, self.rowcount)
+        return self
+
+    def fetchone(self):
+        fila = self._medir_lectura(super().fetchone)
+        if fila is None:
+            self._cerrar_pendiente()
+        return fila
+
+    def fetchmany(self, size=None):
+        tamano = self.arraysize if size is None else size
+        filas = self._medir_lectura(super().fetchmany, tamano)
+        if len(filas) < tamano:
+            self._cerrar_pendiente()
+        return filas
+
+    def fetchall(self):
+        filas = self._medir_lectura(super().fetchall)
+        self._cerrar_pendiente()
+        return filas
+
+    def __next__(self):
+        try:
+            return self._medir_lectura(super().__next__)
+        except StopIteration:
+            self._cerrar_pendiente()
+            raise
+
+    def close(self):
+        self._cerrar_pendiente()
+        super().close()
+
+    def __del__(self):
+        try:
+            self._cerrar_pendiente()
+        except Exception:
+            pass
+
+
+class ConexionInstrumentada(sqlite3.Connection):
+    def cursor(self, factory=CursorInstrumentado):
+        return super().cursor(factory)
+
+    def execute(self, sql, parametros=()):
+        return self.cursor().execute(sql, parametros)
+
+    def executemany(self, sql, secuencia):
+        return self.cursor().executemany(sql, secuencia)
+
+
+def fabrica_conexion():
+    # Clase de conexión para sqlite3.connect(factory=...)
+    return ConexionInstrumentada if ACTIVADA else sqlite3.Connection
+
+
+def resumen():
+    # [(sql, cantidad, total_ms, p50_ms, p95_ms, p99_ms, max_ms, filas)] por tiempo total
+    with _candado:
+        filas = [(sql, e.cantidad, e.total * 1000, e.percentil(0.50) * 1000, e.percentil(0.95) * 1000,
+                  e.percentil(0.99) * 1000, e.maximo * 1000, e.filas)
+                 for sql, e in _estadisticas.items()]
+    return sorted(filas, key=lambda fila: fila[2], reverse=True)
+
+
+def imprimir_resumen(salida=None, limite=30):
+    salida = salida or sys.stderr
+    filas = resumen()
+    if not filas:
+        return
+    salida.write("\n--- Resumen de sentencias SQL (por tiempo total) ---\n")
+    salida.write(f"{'Cant.':>8} {'Total ms':>10} {'p50':>8} {'p95':>8} {'p99':>8} {'Máx':>8} {'Filas':>9}  Sentencia\n")
+    for sql, cantidad, total, p50, p95, p99, maximo, filas_leidas in filas[:limite]:
+        salida.write(f"{cantidad:>8} {total:>10.1f} {p50:>8.2f} {p95:>8.2f} {p99:>8.2f} "
+                     f"{maximo:>8.2f} {filas_leidas:>9}  {sql[:100]}\n")
+
+
+def reiniciar():
+    with _candado:
+        _estadisticas.clear()
+
+
+if ACTIVADA:
+    atexit.register(imprimir_resumen)
+    # Resumen a pedido sin detener el proceso: kill -USR1 <pid>
+    if hasattr(signal, "SIGUSR1") and threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGUSR1, lambda *_: imprimir_resumen())
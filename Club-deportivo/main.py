@@ -1,5 +1,13 @@
-from club_deportivo import ClubDeportivo
-import sqlite3
+from config_db import asegurar_esquema
+from conexion_db import obtener_conexion
+
+
+def validar_credenciales(usuario, contraseña):
+    cursor = obtener_conexion().cursor()
+    cursor.execute('''
+    SELECT usuario FROM usuarios WHERE usuario = ? AND contraseña = ?
+    ''', (usuario, contraseña))
+    return cursor.fetchone() is not None
 
 
 def iniciar_sesion():
@@ -12,15 +20,7 @@ def iniciar_sesion():
             return None
 
         contraseña = input("Contraseña: ")
-        conexion = sqlite3.connect('club_deportes.db')
-        cursor = conexion.cursor()
-        cursor.execute('''
-        SELECT usuario FROM usuarios WHERE usuario = ? AND contraseña = ?
-        ''', (usuario, contraseña))
-        user = cursor.fetchone()
-        conexion.close()
-
-        if user:
+        if validar_credenciales(usuario, contraseña):
             print(f"Bienvenido, {usuario}.")
             return usuario
         else:
@@ -28,8 +28,16 @@ def iniciar_sesion():
 
 
 def main():
+    # Una base nueva o de una versión anterior se prepara sola; si ya está al
+    # día esto es una única lectura de PRAGMA user_version
+    aplicadas = asegurar_esquema()
+    if aplicadas:
+        print(f"Base de datos actualizada ({aplicadas} migraciones aplicadas).")
+
     usuario = iniciar_sesion()
     if usuario:
+        # Los menús (y todo lo que importan) se cargan recién después del login
+        from club_deportivo import ClubDeportivo
         club = ClubDeportivo(usuario)
         club.menu_principal()
 
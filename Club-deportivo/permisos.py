@@ -0,0 +1,54 @@
+# permisos.py
+
+# Columnas de la tabla permisos; son los únicos nombres de permiso aceptados
+PERMISOS = (
+    "gestion_profesores",
+    "menu_deportes",
+    "gestion_cuotas_y_socios",
+    "rendicion_cuentas",
+)
+
+# Contador local: se incrementa cada vez que este proceso modifica permisos o usuarios
+_version_local = 0
+
+
+def invalidar_permisos():
+    global _version_local
+    _version_local += 1
+
+
+def version_local():
+    # Cambios de permisos hechos por este proceso; no consulta la base
+    return _version_local
+
+
+def version_permisos(conexion):
+    # PRAGMA data_version cambia cuando otra conexión confirma cambios; se
+    # responde desde la cabecera de la base, sin leer páginas de tablas.
+    data_version = conexion.execute("PRAGMA data_version").fetchone()[0]
+    return (_version_local, data_version)
+
+
+def cargar_permisos(conexion, usuario):
+    # Trae rol y fila completa de permisos en una sola consulta
+    cursor = conexion.cursor()
+    cursor.execute('''
+        SELECT roles.nombre,
+               permisos.gestion_profesores,
+               permisos.menu_deportes,
+               permisos.gestion_cuotas_y_socios,
+               permisos.rendicion_cuentas
+        FROM usuarios
+        LEFT JOIN roles ON usuarios.rol_id = roles.id
+        LEFT JOIN permisos ON permisos.rol_id = usuarios.rol_id
+        WHERE usuarios.usuario = ?
+        ORDER BY permisos.id
+        LIMIT 1
+    ''', (usuario,))
+    fila = cursor.fetchone()
+    if not fila:
+        return None, frozenset()
+    rol = fila[0]
+    otorgados = frozenset(
+        permiso for permiso, valor in zip(PERMISOS, fila[1:]) if valor == 1)
+    return rol, otorgados
@@ -0,0 +1,72 @@
+# personas.py
+import threading
+from collections import OrderedDict, namedtuple
+
+DESCUENTO_SOCIO_INVITADO = 30  # por ciento
+CAPACIDAD_CACHE = 4096
+
+# tipo: "Socio", "Invitado" o "No Socio"; socio_dni: quién invita (solo invitados)
+Persona = namedtuple("Persona", "dni tipo descuento socio_dni")
+
+DESCUENTOS = {
+    "Socio": DESCUENTO_SOCIO_INVITADO,
+    "Invitado": DESCUENTO_SOCIO_INVITADO,
+    "No Socio": 0,
+}
+
+# La vista personas (config_db.migracion_personas) une socios, invitados y no
+# socios; el filtro por DNI llega a cada tabla y usa su índice de dni.
+CONSULTA_PERSONA = """
+    SELECT tipo, socio_dni FROM personas
+    WHERE dni = ?
+    ORDER BY prioridad
+    LIMIT 1
+"""
+
+
+class ResolutorPersonas:
+    # Caché LRU de DNI -> Persona. Solo guarda personas encontradas (un DNI
+    # desconocido se vuelve a consultar). Se vacía cuando otra conexión
+    # confirma cambios (PRAGMA data_version) y los servicios invalidan el DNI
+    # que dan de alta o de baja por su propia conexión.
+    def __init__(self, capacidad=CAPACIDAD_CACHE):
+        self.capacidad = capacidad
+        self._cache = OrderedDict()
+        self._versiones = {}
+        self._candado = threading.Lock()
+
+    def resolver(self, conexion, dni):
+        version = conexion.execute("PRAGMA data_version").fetchone()[0]
+        with self._candado:
+            if self._versiones.get(id(conexion)) != version:
+                self._versiones[id(conexion)] = version
+                self._cache.clear()
+            persona = self._cache.get(dni)
+            if persona is not None:
+                self._cache.move_to_end(dni)
+                return persona
+
+        fila = conexion.execute(CONSULTA_PERSONA, (dni,)).fetchone()
+        if fila is None:
+            return None
+        tipo, socio_dni = fila
+        persona = Persona(dni, tipo, DESCUENTOS[tipo], socio_dni)
+        with self._candado:
+            self._cache[dni] = persona
+            if len(self._cache) > self.capacidad:
+                self._cache.popitem(last=False)
+        return persona
+
+    def invalidar(self, dni=None):
+        with self._candado:
+            if dni is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(dni, None)
+
+
+RESOLUTOR = ResolutorPersonas()
+
+
+def resolver_persona(conexion, dni):
+    return RESOLUTOR.resolver(conexion, dni)
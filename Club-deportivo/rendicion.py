@@ -0,0 +1,182 @@
+# rendicion.py
+import os
+from datetime import datetime, timedelta
+
+import conexion_db
+from dinero import Dinero
+from fechas import a_dia, formatear_dia
+from trazas import incorporar, iniciar_proceso_de_trabajo, recolectados, traza, trazar
+
+TIPO_CUOTA_SOCIAL = "Cuota Social"
+PREFIJO_CUOTA = "Cuota "
+
+
+def rango_mes(mes=None):
+    # Devuelve el primer y el último día del mes "MM-AAAA" (o del mes actual)
+    if mes:
+        primer_dia_mes = datetime.strptime(mes, "%m-%Y").replace(day=1)
+    else:
+        primer_dia_mes = datetime.now().replace(day=1)
+    ultimo_dia_mes = (primer_dia_mes + timedelta(days=32)
+                      ).replace(day=1) - timedelta(days=1)
+    return primer_dia_mes.date(), ultimo_dia_mes.date()
+
+
+class LiquidacionMes:
+    # Los montos llegan en centavos enteros: se acumulan como int y los
+    # totales se entregan como Dinero
+    def __init__(self, desde, hasta):
+        self.desde = desde
+        self.hasta = hasta
+        self.pagos_sociales = []
+        self.pagos_deportivos = []
+        self._totales = {}
+        self._total = 0
+
+    def agregar(self, pago):
+        tipo_pago = pago[2]
+        monto = pago[1]
+        if tipo_pago == TIPO_CUOTA_SOCIAL:
+            self.pagos_sociales.append(pago)
+        elif tipo_pago.startswith(PREFIJO_CUOTA):
+            self.pagos_deportivos.append(pago)
+        self._totales[tipo_pago] = self._totales.get(tipo_pago, 0) + monto
+        self._total += monto
+
+    @property
+    def totales_por_tipo(self):
+        return {tipo_pago: Dinero(total) for tipo_pago, total in self._totales.items()}
+
+    @property
+    def total_mes(self):
+        return Dinero(self._total)
+
+    def resumen(self):
+        return sorted(self.totales_por_tipo.items())
+
+
+def liquidar_mes(conexion, desde, hasta):
+    # Una sola pasada por el rango de fechas (usa idx_rendicion_fecha_tipo_monto):
+    # clasifica cada pago y acumula los totales por tipo en el mismo recorrido
+    liquidacion = LiquidacionMes(desde, hasta)
+    cursor = conexion.cursor()
+    cursor.execute("""
+        SELECT dni, monto, tipo_pago, metodo_pago, fecha_pago, tipo_persona
+        FROM rendicion_cuentas
+        WHERE fecha_pago BETWEEN ? AND ?
+        ORDER BY fecha_pago DESC
+    """, (a_dia(desde), a_dia(hasta)))
+    while True:
+        pagos = cursor.fetchmany(1000)
+        if not pagos:
+            break
+        for pago in pagos:
+            liquidacion.agregar(pago)
+    return liquidacion
+
+
+def formatear_pago(pago):
+    dni, monto, tipo_pago, metodo_pago, fecha_pago, tipo_persona = pago
+    return (f"DNI: {dni}\n"
+            f"Tipo de Persona: {tipo_persona}\n"
+            f"Tipo de Pago: {tipo_pago}\n"
+            f"Método de Pago: {metodo_pago}\n"
+            f"Monto: {Dinero(monto):.2f}\n"
+            f"Fecha de Pago: {formatear_dia(fecha_pago)}\n"
+            f"{'-' * 30}\n")
+
+
+@trazar("reporte")
+def escribir_reporte_mes(conexion, mes, nombre_archivo=None):
+    # Escribe reporte_MM-AAAA.txt y devuelve la liquidación usada
+    primer_dia_mes, ultimo_dia_mes = rango_mes(mes)
+    with traza("consulta"):
+        liquidacion = liquidar_mes(conexion, primer_dia_mes, ultimo_dia_mes)
+    nombre_archivo = nombre_archivo or f"reporte_{mes}.txt"
+
+    with open(nombre_archivo, 'w') as archivo:
+        archivo.write(
+            f"--- Reporte de Rendición de Cuentas para {mes} ---\n\n")
+
+        archivo.write("\n--- Detalles de Cuota Social ---\n")
+        archivo.writelines(formatear_pago(pago)
+                           for pago in liquidacion.pagos_sociales)
+
+        archivo.write("\n--- Detalles de Cuota Deportiva ---\n")
+        archivo.writelines(formatear_pago(pago)
+                           for pago in liquidacion.pagos_deportivos)
+
+        # Resumen de pagos
+        archivo.write("\n--- Resumen de Pagos del Mes ---\n")
+        for tipo_pago, total in liquidacion.resumen():
+            archivo.write(f"{tipo_pago}: {total:.2f}\n")
+
+        archivo.write(
+            f"\nTotal de todos los pagos en el mes: {liquidacion.total_mes:.2f}\n")
+    return liquidacion
+
+
+def meses_entre(desde, hasta):
+    # Lista de meses "MM-AAAA" desde `desde` hasta `hasta`, inclusive
+    inicio = datetime.strptime(desde, "%m-%Y")
+    fin = datetime.strptime(hasta, "%m-%Y")
+    if inicio > fin:
+        raise ValueError("El mes inicial debe ser anterior al mes final.")
+    meses = []
+    anio, mes = inicio.year, inicio.month
+    while (anio, mes) <= (fin.year, fin.month):
+        meses.append(f"{mes:02d}-{anio}")
+        anio, mes = (anio + 1, 1) if mes == 12 else (anio, mes + 1)
+    return meses
+
+
+def _reporte_mes_en_proceso(ruta_db, mes):
+    # Se ejecuta en un proceso de trabajo, con su propia conexión de lectura.
+    # Devuelve también sus tramos: el registro de trazas lo escribe el principal
+    conexion = conexion_db.abrir_conexion_lectura(ruta_db)
+    try:
+        liquidacion = escribir_reporte_mes(conexion, mes)
+    finally:
+        conexion.close()
+    return (mes, len(liquidacion.pagos_sociales) + len(liquidacion.pagos_deportivos),
+            dict(liquidacion.totales_por_tipo), liquidacion.total_mes), recolectados()
+
+
+@trazar("reportes_rango")
+def generar_reporte_rango(desde, hasta, procesos=None):
+    # Un reporte por mes en paralelo y un resumen consolidado del período.
+    # multiprocessing se importa acá: es lento de cargar y solo lo usa este reporte
+    from concurrent.futures import ProcessPoolExecutor
+
+    meses = meses_entre(desde, hasta)
+    procesos = procesos or min(len(meses), os.cpu_count() or 1)
+    ruta_db = os.path.abspath(conexion_db.RUTA_DB)
+
+    resultados = []
+    with ProcessPoolExecutor(max_workers=procesos, initializer=iniciar_proceso_de_trabajo) as ejecutor:
+        for resultado, tramos in ejecutor.map(
+                _reporte_mes_en_proceso, [ruta_db] * len(meses), meses):
+            incorporar(tramos)
+            resultados.append(resultado)
+
+    totales_por_tipo = {}
+    total_periodo = 0
+    nombre_archivo = f"reporte_{desde}_a_{hasta}.txt"
+    with open(nombre_archivo, 'w') as archivo:
+        archivo.write(
+            f"--- Reporte Consolidado de Rendición de Cuentas {desde} a {hasta} ---\n\n")
+        archivo.write("--- Totales por Mes ---\n")
+        for mes, cantidad, totales_mes, total_mes in resultados:
+            archivo.write(
+                f"{mes}: {total_mes:.2f} ({cantidad} pagos, ver reporte_{mes}.txt)\n")
+            for tipo_pago, total in totales_mes.items():
+                totales_por_tipo[tipo_pago] = totales_por_tipo.get(
+                    tipo_pago, 0) + total
+            total_periodo += total_mes
+
+        archivo.write("\n--- Resumen de Pagos del Período ---\n")
+        for tipo_pago, total in sorted(totales_por_tipo.items()):
+            archivo.write(f"{tipo_pago}: {total:.2f}\n")
+        archivo.write(
+            f"\nTotal de todos los pagos en el período: {total_periodo:.2f}\n")
+    return nombre_archivo, total_periodo
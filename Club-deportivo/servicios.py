@@ -0,0 +1,357 @@
+# servicios.py
+import sqlite3
+from collections import namedtuple
+from datetime import date, timedelta
+
+from busqueda import buscar_personas
+from catalogo import CATALOGO
+from conexion_db import obtener_conexion, transaccion
+from dinero import Dinero, sql_con_descuento
+from fechas import a_dia, a_fecha
+from personas import RESOLUTOR
+from tickets import AlmacenTickets, renderizar_ticket
+from trazas import trazar_metodos
+from validaciones import validar_campo
+from vencimientos import listar_vencimientos, renovar_vencimientos
+
+MAX_INVITADOS_POR_SOCIO = 3
+DIAS_VENCIMIENTO = 30
+
+# Resultados de las operaciones
+Pago = namedtuple("Pago", "pago_id dni monto tipo_pago metodo_pago fecha_pago fecha_vencimiento tipo_persona")
+Cotizacion = namedtuple("Cotizacion", "dni deporte tipo_persona cuota descuento monto")
+Socio = namedtuple("Socio", "id dni nombre apellido domicilio telefono email fecha_inscripcion cuota_social fecha_vencimiento")
+
+
+class ErrorOperacion(Exception):
+    pass
+
+
+def _normalizar(esquema, **valores):
+    # Aplica las mismas reglas que los formularios a los argumentos de texto
+    return {campo: validar_campo(esquema, campo, valor) for campo, valor in valores.items()}
+
+
+def _monto_positivo(monto, etiqueta):
+    # Acepta Dinero (centavos) o un importe en pesos; devuelve Dinero
+    try:
+        monto = Dinero.desde_pesos(monto)
+    except (TypeError, ValueError):
+        monto = None
+    if monto is None or monto <= 0:
+        raise ErrorOperacion(f"La {etiqueta} debe ser un número positivo.")
+    return monto
+
+
+@trazar_metodos("db")
+class ServicioClub:
+    # Operaciones del club sin input()/print(): reciben argumentos ya tipados,
+    # devuelven resultados y señalan problemas con ErrorValidacion/ErrorOperacion.
+    def __init__(self, conexion=None, tickets=None):
+        self._conexion = conexion
+        self.tickets = tickets or AlmacenTickets()
+
+    @property
+    def conexion(self):
+        return self._conexion or obtener_conexion()
+
+    # --- Socios ---
+
+    def registrar_socio(self, dni, nombre, apellido, domicilio, telefono, email,
+                        fecha_inscripcion, cuota_social, metodo_pago, fecha_pago=None):
+        datos = _normalizar("socio", dni=dni, nombre=nombre, apellido=apellido, domicilio=domicilio,
+                            telefono=telefono, email=email, metodo_pago=metodo_pago)
+        cuota_social = _monto_positivo(cuota_social, "cuota social")
+        fecha_pago = fecha_pago or date.today()
+        fecha_vencimiento = fecha_inscripcion + timedelta(days=DIAS_VENCIMIENTO)
+
+        try:
+            with transaccion(self.conexion) as conexion:
+                conexion.execute("""
+                    INSERT INTO socios (dni, nombre, apellido, domicilio, telefono, email, fecha_inscripcion, cuota_social, fecha_vencimiento)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (datos["dni"], datos["nombre"], datos["apellido"], datos["domicilio"], datos["telefono"],
+                      datos["email"], fecha_inscripcion.isoformat(), cuota_social, a_dia(fecha_vencimiento)))
+                pago_id = self._registrar_pago(conexion, datos["dni"], cuota_social, "Cuota Social",
+                                               datos["metodo_pago"], fecha_pago, fecha_vencimiento, "Socio")
+        except sqlite3.IntegrityError:
+            raise ErrorOperacion(f"Ya existe un socio con DNI {datos['dni']}.")
+        RESOLUTOR.invalidar(datos["dni"])
+        return Pago(pago_id, datos["dni"], cuota_social, "Cuota Social", datos["metodo_pago"],
+                    fecha_pago, fecha_vencimiento, "Socio")
+
+    def buscar_socio(self, dni):
+        fila = self.conexion.execute(
+            "SELECT * FROM socios WHERE dni = ?", (dni,)).fetchone()
+        return Socio(*fila[:8], Dinero(fila[8]), a_fecha(fila[9])) if fila else None
+
+    def modificar_socio(self, dni, **cambios):
+        permitidos = ("nombre", "apellido", "domicilio", "telefono", "email")
+        desconocidos = set(cambios) - set(permitidos) - {"cuota_social"}
+        if desconocidos:
+            raise ErrorOperacion(
+                f"Campos no modificables: {', '.join(sorted(desconocidos))}")
+        valores = _normalizar("socio", **{c: v for c, v in cambios.items() if c in permitidos})
+        if "cuota_social" in cambios:
+            valores["cuota_social"] = _monto_positivo(
+                cambios["cuota_social"], "cuota social")
+        if not valores:
+            return self.buscar_socio(dni) is not None
+
+        asignaciones = ", ".join(f"{campo} = ?" for campo in valores)
+        with transaccion(self.conexion) as conexion:
+            cursor = conexion.execute(
+                f"UPDATE socios SET {asignaciones} WHERE dni = ?", (*valores.values(), dni))
+        return cursor.rowcount > 0
+
+    def eliminar_socio(self, dni):
+        with transaccion(self.conexion) as conexion:
+            cursor = conexion.execute("DELETE FROM socios WHERE dni = ?", (dni,))
+        RESOLUTOR.invalidar(dni)
+        return cursor.rowcount > 0
+
+    def listar_socios(self):
+        return self.conexion.execute("SELECT * FROM socios")
+
+    # --- Invitados ---
+
+    def registrar_invitado(self, socio_dni, dni, nombre, apellido):
+        datos = _normalizar("invitado", socio_dni=socio_dni, dni=dni,
+                            nombre=nombre, apellido=apellido)
+        with transaccion(self.conexion) as conexion:
+            socio = RESOLUTOR.resolver(conexion, datos["socio_dni"])
+            if socio is None or socio.tipo != "Socio":
+                raise ErrorOperacion("Socio no encontrado.")
+            cantidad = conexion.execute(
+                "SELECT COUNT(*) FROM invitados WHERE socio_dni = ?", (datos["socio_dni"],)).fetchone()[0]
+            if cantidad >= MAX_INVITADOS_POR_SOCIO:
+                raise ErrorOperacion(
+                    f"El socio ya tiene el máximo de {MAX_INVITADOS_POR_SOCIO} invitados.")
+            persona = RESOLUTOR.resolver(conexion, datos["dni"])
+            if persona is not None and persona.tipo != "No Socio":
+                raise ErrorOperacion(f"El DNI del invitado ya está registrado como {persona.tipo}.")
+            conexion.execute("""
+                INSERT INTO invitados (nombre, apellido, dni, socio_dni)
+                VALUES (?, ?, ?, ?)
+            """, (datos["nombre"], datos["apellido"], datos["dni"], datos["socio_dni"]))
+        RESOLUTOR.invalidar(datos["dni"])
+
+    def cantidad_invitados(self, socio_dni):
+        # None si el socio no existe
+        fila = self.conexion.execute("""
+            SELECT (SELECT COUNT(*) FROM invitados WHERE socio_dni = socios.dni)
+            FROM socios WHERE dni = ?
+        """, (socio_dni,)).fetchone()
+        return fila[0] if fila else None
+
+    def eliminar_invitado(self, dni):
+        with transaccion(self.conexion) as conexion:
+            cursor = conexion.execute("DELETE FROM invitados WHERE dni = ?", (dni,))
+        RESOLUTOR.invalidar(dni)
+        return cursor.rowcount > 0
+
+    def listar_invitados(self):
+        return self.conexion.execute("SELECT dni, nombre, apellido, socio_dni FROM invitados")
+
+    # --- No socios ---
+
+    def registrar_no_socio(self, dni, nombre, apellido, telefono, email):
+        datos = _normalizar("no_socio", dni=dni, nombre=nombre, apellido=apellido,
+                            telefono=telefono, email=email)
+        try:
+            with transaccion(self.conexion) as conexion:
+                conexion.execute("""
+                    INSERT INTO no_socios (dni, nombre, apellido, telefono, email)
+                    VALUES (?, ?, ?, ?, ?)
+                """, (datos["dni"], datos["nombre"], datos["apellido"], datos["telefono"], datos["email"]))
+        except sqlite3.IntegrityError:
+            raise ErrorOperacion("El DNI ya está registrado como no socio.")
+        RESOLUTOR.invalidar(datos["dni"])
+
+    def existe_no_socio(self, dni):
+        return self.conexion.execute("SELECT 1 FROM no_socios WHERE dni = ?", (dni,)).fetchone() is not None
+
+    def eliminar_no_socio(self, dni):
+        with transaccion(self.conexion) as conexion:
+            cursor = conexion.execute("DELETE FROM no_socios WHERE dni = ?", (dni,))
+        RESOLUTOR.invalidar(dni)
+        return cursor.rowcount > 0
+
+    def listar_no_socios(self):
+        return self.conexion.execute("SELECT * FROM no_socios")
+
+    # --- Profesores ---
+
+    def agregar_profesor(self, dni, nombre, apellido, telefono, domicilio, fecha_ingreso, deporte):
+        datos = _normalizar("profesor", dni=dni, nombre=nombre, apellido=apellido,
+                            telefono=telefono, domicilio=domicilio, deporte=deporte)
+        try:
+            with transaccion(self.conexion) as conexion:
+                conexion.execute("""
+                    INSERT INTO profesores (dni, nombre, apellido, telefono, domicilio, fecha_ingreso, deporte)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, (datos["dni"], datos["nombre"], datos["apellido"], datos["telefono"],
+                      datos["domicilio"], fecha_ingreso.isoformat(), datos["deporte"]))
+        except sqlite3.IntegrityError:
+            raise ErrorOperacion("Ya existe un profesor con ese DNI.")
+
+    def eliminar_profesor(self, dni):
+        with transaccion(self.conexion) as conexion:
+            cursor = conexion.execute("DELETE FROM profesores WHERE dni = ?", (dni,))
+        return cursor.rowcount > 0
+
+    def listar_profesores(self):
+        return self.conexion.execute(
+            "SELECT dni, nombre, apellido, telefono, domicilio, fecha_ingreso, deporte FROM profesores")
+
+    # --- Deportes ---
+
+    def configurar_deporte(self, nombre, dias, horarios, profesor, cupos, cuota):
+        # Alta de un deporte nuevo o cambio de uno existente
+        nombre = validar_campo("deporte", "nombre", nombre)
+        if not dias or not horarios or not profesor:
+            raise ErrorOperacion(
+                "Los días, horarios y profesor no pueden estar vacíos.")
+        if not isinstance(cupos, int) or cupos <= 0:
+            raise ErrorOperacion("Los cupos deben ser un número entero positivo.")
+        try:
+            cuota = Dinero.desde_pesos(cuota)
+        except (TypeError, ValueError):
+            cuota = None
+        if cuota is None or cuota < 0:
+            raise ErrorOperacion("La cuota debe ser un número positivo.")
+        return CATALOGO.guardar(nombre, dias, horarios, profesor, cupos, cuota, self.conexion)
+
+    # --- Pagos ---
+
+    def _registrar_pago(self, conexion, dni, monto, tipo_pago, metodo_pago, fecha_pago,
+                        fecha_vencimiento, tipo_persona):
+        cursor = conexion.execute("""
+            INSERT INTO rendicion_cuentas (dni, monto, tipo_pago, metodo_pago, fecha_pago, tipo_persona, fecha_vencimiento)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (dni, monto, tipo_pago, metodo_pago, a_dia(fecha_pago), tipo_persona,
+              a_dia(fecha_vencimiento)))
+        return cursor.lastrowid
+
+    def _tipo_persona(self, conexion, dni):
+        # Un DNI que no es socio, invitado ni no socio no puede pagar cuotas
+        persona = RESOLUTOR.resolver(conexion, dni)
+        if persona is None:
+            raise ErrorOperacion(
+                f"El DNI {dni} no está registrado como socio, invitado ni no socio.")
+        return persona.tipo, persona.descuento
+
+    def _cotizar(self, conexion, dni, deporte):
+        # Precio y cupo salen del catálogo en memoria, que se relee solo si
+        # otra conexión cambió la base (ver CatalogoDeportes.vigente)
+        tipo_persona, descuento = self._tipo_persona(conexion, dni)
+        datos_deporte = CATALOGO.vigente(deporte, conexion)
+        if datos_deporte is None:
+            raise ErrorOperacion(f"Deporte {deporte} no encontrado.")
+        cuota_deporte, cupos_totales = datos_deporte.cuota, datos_deporte.cupos
+
+        if conexion.execute("SELECT 1 FROM inscripciones WHERE dni_socio = ? AND nombre = ?",
+                            (dni, deporte)).fetchone():
+            raise ErrorOperacion(
+                f"El usuario con DNI {dni} ya está inscrito en {deporte}. No se puede inscribir nuevamente.")
+        inscritos = conexion.execute(
+            "SELECT inscritos FROM deportes WHERE nombre = ?", (deporte,)).fetchone()[0]
+        if inscritos >= cupos_totales:
+            raise ErrorOperacion(f"No hay cupos disponibles para {deporte}.")
+
+        monto = cuota_deporte.con_descuento(descuento)
+        return Cotizacion(dni, deporte, tipo_persona, cuota_deporte, descuento, monto)
+
+    def cotizar_cuota_deportiva(self, dni, deporte):
+        datos = _normalizar("pago", dni=dni, deporte=deporte)
+        return self._cotizar(self.conexion, datos["dni"], datos["deporte"])
+
+    def pagar_cuota_deportiva(self, dni, deporte, metodo_pago, fecha_pago=None, monto_cotizado=None):
+        # monto_cotizado: el importe que confirmó el operador (Cotizacion.monto).
+        # Si la cuota cambió desde la cotización no se cobra nada.
+        datos = _normalizar("pago", dni=dni, deporte=deporte, metodo_pago=metodo_pago)
+        fecha_pago = fecha_pago or date.today()
+        fecha_vencimiento = fecha_pago + timedelta(days=DIAS_VENCIMIENTO)
+        tipo_pago = f"Cuota {datos['deporte']}"
+
+        with transaccion(self.conexion) as conexion:
+            tipo_persona, descuento = self._tipo_persona(conexion, datos["dni"])
+            monto = self._reservar_cupo(conexion, datos["dni"], datos["deporte"], descuento,
+                                        fecha_vencimiento, monto_cotizado)
+            pago_id = self._registrar_pago(conexion, datos["dni"], monto, tipo_pago,
+                                           datos["metodo_pago"], fecha_pago, fecha_vencimiento,
+                                           tipo_persona)
+        return Pago(pago_id, datos["dni"], monto, tipo_pago, datos["metodo_pago"],
+                    fecha_pago, fecha_vencimiento, tipo_persona)
+
+    def _reservar_cupo(self, conexion, dni, deporte, descuento, fecha_vencimiento, monto_cotizado=None):
+        # Un solo INSERT condicional: los controles de duplicado, de cupo y de
+        # precio cotizado se evalúan dentro de la misma sentencia que ocupa el
+        # lugar, bajo el bloqueo de escritura de la transacción, así dos puestos
+        # no pueden tomar el último cupo a la vez. Devuelve el monto inscrito.
+        monto = sql_con_descuento("d.cuota", ":descuento")
+        fila = conexion.execute(f"""
+            INSERT INTO inscripciones (dni_socio, nombre, cuota, fecha_vencimiento)
+            SELECT :dni, d.nombre, {monto}, :vencimiento
+            FROM deportes d
+            WHERE d.nombre = :deporte
+              AND NOT EXISTS (SELECT 1 FROM inscripciones WHERE dni_socio = :dni AND nombre = d.nombre)
+              AND d.inscritos < d.cupos
+              AND (:cotizado IS NULL OR {monto} = :cotizado)
+            RETURNING cuota
+        """, {"dni": dni, "descuento": descuento, "vencimiento": a_dia(fecha_vencimiento),
+              "deporte": deporte, "cotizado": monto_cotizado}).fetchone()
+        if fila:
+            return Dinero(fila[0])
+
+        # No se insertó: averiguar el motivo para informarlo
+        fila = conexion.execute("SELECT cuota FROM deportes WHERE nombre = ?", (deporte,)).fetchone()
+        if not fila:
+            raise ErrorOperacion(f"Deporte {deporte} no encontrado.")
+        if conexion.execute("SELECT 1 FROM inscripciones WHERE dni_socio = ? AND nombre = ?",
+                            (dni, deporte)).fetchone():
+            raise ErrorOperacion(
+                f"El usuario con DNI {dni} ya está inscrito en {deporte}. No se puede inscribir nuevamente.")
+        if monto_cotizado is not None and Dinero(fila[0]).con_descuento(descuento) != monto_cotizado:
+            raise ErrorOperacion(
+                f"La cuota de {deporte} cambió desde la cotización (ahora "
+                f"{Dinero(fila[0]).con_descuento(descuento):.2f}). Vuelva a cotizar el pago.")
+        raise ErrorOperacion(f"No hay cupos disponibles para {deporte}.")
+
+    def emitir_ticket(self, pago):
+        # Renderiza el ticket del pago y lo guarda en el almacén; devuelve (texto, archivo)
+        ticket = renderizar_ticket(pago.dni, pago.monto, pago.tipo_pago, pago.metodo_pago,
+                                   pago.fecha_pago, pago.fecha_vencimiento, pago.tipo_persona)
+        archivo = self.tickets.guardar(self.conexion, pago.pago_id, pago.dni, ticket)
+        return ticket, archivo
+
+    # --- Rendición de cuentas ---
+
+    def liquidacion_mensual(self, mes=None):
+        # rendicion se carga con el primer reporte, no al abrir el menú
+        from rendicion import liquidar_mes, rango_mes
+        primer_dia_mes, ultimo_dia_mes = rango_mes(mes)
+        return liquidar_mes(self.conexion, primer_dia_mes, ultimo_dia_mes)
+
+    # --- Búsqueda ---
+
+    def buscar_personas(self, texto, limite=20):
+        return buscar_personas(texto, self.conexion, limite)
+
+    # --- Vencimientos ---
+
+    def vencimientos(self, dias=0, concepto=None):
+        return listar_vencimientos(self.conexion, dias, concepto=concepto)
+
+    def renovar_vencimientos(self, metodo_pago, dias=0, concepto=None):
+        return renovar_vencimientos(metodo_pago, self.conexion, dias, concepto=concepto)
+
+    def rendimiento_general(self):
+        resumen = self.conexion.execute("""
+            SELECT tipo_pago, SUM(monto)
+            FROM rendicion_cuentas
+            GROUP BY tipo_pago
+        """).fetchall()
+        # Se responde desde idx_rendicion_tipo_monto, sin leer la tabla
+        resumen = [(tipo_pago, Dinero(total)) for tipo_pago, total in resumen]
+        return resumen, sum(total for _, total in resumen)
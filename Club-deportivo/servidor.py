@@ -0,0 +1,372 @@
+# servidor.py
+# Los importes (monto, cuota, cuota_social) viajan en centavos enteros, igual
+# que en la base. Las fechas van como AAAA-MM-DD.
+import argparse
+import asyncio
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from urllib.parse import parse_qs, urlsplit
+
+import conexion_db
+from conexion_db import obtener_conexion, transaccion
+from dinero import Dinero
+from fechas import COLUMNAS_FECHA, a_fecha
+from servicios import ErrorOperacion, ServicioClub
+from validaciones import ErrorValidacion
+
+MAX_OPERACIONES_POR_LOTE = 200
+TAMANO_MAX_CUERPO = 1 << 20
+LIMITE_LISTADO = 100
+
+
+class ErrorHTTP(Exception):
+    def __init__(self, estado, mensaje):
+        super().__init__(mensaje)
+        self.estado = estado
+        self.mensaje = mensaje
+
+
+class EscritorUnico:
+    # Todas las escrituras pasan por una sola tarea y un solo hilo. Las
+    # operaciones encoladas mientras se confirma un lote se agrupan en la
+    # siguiente transacción (group commit); cada una va en su SAVEPOINT, así
+    # que un error de negocio no deshace a las demás.
+    def __init__(self, servicio):
+        self.servicio = servicio
+        self.cola = asyncio.Queue()
+        self.hilo = ThreadPoolExecutor(max_workers=1, thread_name_prefix="escritor")
+        self.tarea = None
+
+    def iniciar(self):
+        self.tarea = asyncio.get_running_loop().create_task(self._procesar())
+
+    async def detener(self):
+        if self.tarea:
+            self.tarea.cancel()
+        self.hilo.shutdown(wait=True)
+
+    async def ejecutar(self, operacion, *args, **kwargs):
+        futuro = asyncio.get_running_loop().create_future()
+        await self.cola.put((operacion, args, kwargs, futuro))
+        return await futuro
+
+    async def _procesar(self):
+        bucle = asyncio.get_running_loop()
+        while True:
+            lote = [await self.cola.get()]
+            while len(lote) < MAX_OPERACIONES_POR_LOTE and not self.cola.empty():
+                lote.append(self.cola.get_nowait())
+            try:
+                resultados = await bucle.run_in_executor(self.hilo, self._confirmar_lote, lote)
+            except Exception as e:
+                resultados = [(False, e)] * len(lote)
+            for (_, _, _, futuro), (correcto, valor) in zip(lote, resultados):
+                if futuro.done():
+                    continue
+                if correcto:
+                    futuro.set_result(valor)
+                else:
+                    futuro.set_exception(valor)
+
+    def _confirmar_lote(self, lote):
+        resultados = []
+        with transaccion(obtener_conexion()) as conexion:
+            for operacion, args, kwargs, _ in lote:
+                try:
+                    with transaccion(conexion):
+                        resultados.append((True, operacion(self.servicio, *args, **kwargs)))
+                except Exception as e:
+                    resultados.append((False, e))
+        return resultados
+
+
+def _json_por_defecto(valor):
+    if isinstance(valor, date):
+        return valor.isoformat()
+    raise TypeError(f"No serializable: {type(valor).__name__}")
+
+
+def _fecha(texto, campo):
+    try:
+        return date.fromisoformat(texto)
+    except (TypeError, ValueError):
+        raise ErrorValidacion(campo, f"La fecha {campo} debe tener formato AAAA-MM-DD.")
+
+
+def _centavos(valor, campo):
+    if not isinstance(valor, int) or isinstance(valor, bool):
+        raise ErrorValidacion(campo, f"El campo {campo} debe ser un importe entero en centavos.")
+    return Dinero(valor)
+
+
+def _requeridos(cuerpo, *campos):
+    faltantes = [campo for campo in campos if campo not in cuerpo]
+    if faltantes:
+        raise ErrorHTTP(400, f"Faltan campos: {', '.join(faltantes)}")
+    return [cuerpo[campo] for campo in campos]
+
+
+def _paginar(cursor, consulta):
+    try:
+        limite = int(consulta.get("limite", [LIMITE_LISTADO])[0])
+        desde = int(consulta.get("desde", [0])[0])
+    except ValueError:
+        raise ErrorHTTP(400, "limite y desde deben ser números enteros.")
+    columnas = [descripcion[0] for descripcion in cursor.description]
+    filas = cursor.fetchmany(desde + limite)[desde:]
+    return [_con_fechas(dict(zip(columnas, fila))) for fila in filas]
+
+
+def _con_fechas(registro):
+    # Número de día de la base -> date, que _json_por_defecto escribe en ISO
+    for columna in COLUMNAS_FECHA:
+        if columna in registro:
+            registro[columna] = a_fecha(registro[columna])
+    return registro
+
+
+# --- Lecturas: se ejecutan en el grupo de hilos lectores ---
+
+def _leer_socios(servicio, consulta):
+    return _paginar(servicio.listar_socios(), consulta)
+
+
+def _leer_socio(servicio, dni):
+    socio = servicio.buscar_socio(dni)
+    if socio is None:
+        raise ErrorHTTP(404, "Socio no encontrado.")
+    return socio._asdict()
+
+
+def _leer_invitados(servicio, consulta):
+    return _paginar(servicio.listar_invitados(), consulta)
+
+
+def _leer_no_socios(servicio, consulta):
+    return _paginar(servicio.listar_no_socios(), consulta)
+
+
+def _leer_personas(servicio, consulta):
+    texto = consulta.get("q", [""])[0]
+    return [resultado._asdict() for resultado in servicio.buscar_personas(texto)]
+
+
+def _leer_deportes(servicio, consulta):
+    cursor = servicio.conexion.execute("""
+        SELECT nombre, dias, horarios, profesor, cupos, cuota, inscritos
+        FROM deportes
+        ORDER BY nombre
+    """)
+    return _paginar(cursor, consulta)
+
+
+def _leer_reporte_mensual(servicio, consulta):
+    mes = consulta.get("mes", [None])[0]
+    try:
+        liquidacion = servicio.liquidacion_mensual(mes)
+    except ValueError:
+        raise ErrorHTTP(400, "El mes debe tener formato MM-AAAA.")
+    columnas = ("dni", "monto", "tipo_pago", "metodo_pago", "fecha_pago", "tipo_persona")
+    return {
+        "desde": liquidacion.desde,
+        "hasta": liquidacion.hasta,
+        "pagos_sociales": [_con_fechas(dict(zip(columnas, pago))) for pago in liquidacion.pagos_sociales],
+        "pagos_deportivos": [_con_fechas(dict(zip(columnas, pago))) for pago in liquidacion.pagos_deportivos],
+        "resumen": dict(liquidacion.resumen()),
+        "total_mes": liquidacion.total_mes,
+    }
+
+
+# --- Escrituras: se encolan en el escritor único ---
+
+def _crear_socio(servicio, cuerpo):
+    dni, nombre, apellido, domicilio, telefono, email, fecha_inscripcion, cuota_social, metodo_pago = _requeridos(
+        cuerpo, "dni", "nombre", "apellido", "domicilio", "telefono", "email",
+        "fecha_inscripcion", "cuota_social", "metodo_pago")
+    pago = servicio.registrar_socio(dni, nombre, apellido, domicilio, telefono, email,
+                                    _fecha(fecha_inscripcion, "fecha_inscripcion"),
+                                    _centavos(cuota_social, "cuota_social"), metodo_pago)
+    servicio.emitir_ticket(pago)
+    return pago._asdict()
+
+
+def _modificar_socio(servicio, dni, cuerpo):
+    if "cuota_social" in cuerpo:
+        cuerpo = dict(cuerpo, cuota_social=_centavos(cuerpo["cuota_social"], "cuota_social"))
+    if not servicio.modificar_socio(dni, **cuerpo):
+        raise ErrorHTTP(404, "Socio no encontrado.")
+    return servicio.buscar_socio(dni)._asdict()
+
+
+def _eliminar(metodo, mensaje):
+    def eliminar(servicio, dni):
+        if not getattr(servicio, metodo)(dni):
+            raise ErrorHTTP(404, mensaje)
+        return {"eliminado": dni}
+    return eliminar
+
+
+def _crear_invitado(servicio, cuerpo):
+    servicio.registrar_invitado(*_requeridos(cuerpo, "socio_dni", "dni", "nombre", "apellido"))
+    return {"registrado": cuerpo["dni"]}
+
+
+def _crear_no_socio(servicio, cuerpo):
+    servicio.registrar_no_socio(*_requeridos(cuerpo, "dni", "nombre", "apellido", "telefono", "email"))
+    return {"registrado": cuerpo["dni"]}
+
+
+def _pagar_cuota_deportiva(servicio, cuerpo):
+    pago = servicio.pagar_cuota_deportiva(*_requeridos(cuerpo, "dni", "deporte", "metodo_pago"))
+    servicio.emitir_ticket(pago)
+    return pago._asdict()
+
+
+# (método, patrón de ruta, tipo, función); tipo "lectura" o "escritura"
+RUTAS = [
+    ("GET", r"/socios", "lectura", _leer_socios),
+    ("GET", r"/socios/(\d+)", "lectura", _leer_socio),
+    ("POST", r"/socios", "escritura", _crear_socio),
+    ("PATCH", r"/socios/(\d+)", "escritura", _modificar_socio),
+    ("DELETE", r"/socios/(\d+)", "escritura", _eliminar("eliminar_socio", "Socio no encontrado.")),
+    ("GET", r"/invitados", "lectura", _leer_invitados),
+    ("POST", r"/invitados", "escritura", _crear_invitado),
+    ("DELETE", r"/invitados/(\d+)", "escritura",
+     _eliminar("eliminar_invitado", "El invitado no está registrado.")),
+    ("GET", r"/no_socios", "lectura", _leer_no_socios),
+    ("POST", r"/no_socios", "escritura", _crear_no_socio),
+    ("DELETE", r"/no_socios/(\d+)", "escritura",
+     _eliminar("eliminar_no_socio", "El no socio no está registrado.")),
+    ("GET", r"/personas", "lectura", _leer_personas),
+    ("GET", r"/deportes", "lectura", _leer_deportes),
+    ("POST", r"/pagos/cuota_deportiva", "escritura", _pagar_cuota_deportiva),
+    ("GET", r"/reportes/mensual", "lectura", _leer_reporte_mensual),
+]
+RUTAS = [(metodo, re.compile(f"^{patron}$"), tipo, funcion) for metodo, patron, tipo, funcion in RUTAS]
+
+ESTADOS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 409: "Conflict", 413: "Payload Too Large",
+           500: "Internal Server Error"}
+
+
+class ServidorClub:
+    def __init__(self, lectores=4):
+        # Un solo servicio: su conexión es la del hilo que lo usa (obtener_conexion),
+        # así cada hilo lector tiene la suya y el escritor la propia.
+        self.servicio = ServicioClub()
+        self.lectores = ThreadPoolExecutor(max_workers=lectores, thread_name_prefix="lector")
+        self.escritor = EscritorUnico(self.servicio)
+
+    async def despachar(self, metodo, ruta, consulta, cuerpo):
+        rutas_coincidentes = [(m, p.match(ruta), t, f) for m, p, t, f in RUTAS if p.match(ruta)]
+        if not rutas_coincidentes:
+            raise ErrorHTTP(404, "Ruta no encontrada.")
+        for metodo_ruta, coincidencia, tipo, funcion in rutas_coincidentes:
+            if metodo_ruta != metodo:
+                continue
+            argumentos = list(coincidencia.groups())
+            if tipo == "lectura":
+                if not argumentos:
+                    argumentos = [consulta]
+                bucle = asyncio.get_running_loop()
+                return 200, await bucle.run_in_executor(
+                    self.lectores, funcion, self.servicio, *argumentos)
+            if metodo in ("POST", "PATCH"):
+                if not isinstance(cuerpo, dict):
+                    raise ErrorHTTP(400, "El cuerpo debe ser un objeto JSON.")
+                argumentos.append(cuerpo)
+            return (201 if metodo == "POST" else 200), await self.escritor.ejecutar(funcion, *argumentos)
+        raise ErrorHTTP(405, "Método no permitido.")
+
+    async def atender(self, lector, escritor):
+        try:
+            while True:
+                linea = await lector.readline()
+                if not linea:
+                    break
+                try:
+                    metodo, objetivo, _ = linea.decode("latin-1").split(" ", 2)
+                except ValueError:
+                    break
+                cabeceras = {}
+                while True:
+                    cabecera = await lector.readline()
+                    if cabecera in (b"\r\n", b"\n", b""):
+                        break
+                    nombre, _, valor = cabecera.decode("latin-1").partition(":")
+                    cabeceras[nombre.strip().lower()] = valor.strip()
+
+                estado, respuesta = await self._responder(metodo, objetivo, cabeceras, lector)
+                datos = json.dumps(respuesta, ensure_ascii=False,
+                                   default=_json_por_defecto).encode("utf-8")
+                seguir = cabeceras.get("connection", "").lower() != "close"
+                escritor.write(
+                    f"HTTP/1.1 {estado} {ESTADOS.get(estado, '')}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(datos)}\r\n"
+                    f"Connection: {'keep-alive' if seguir else 'close'}\r\n\r\n".encode("latin-1") + datos)
+                await escritor.drain()
+                if not seguir:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            escritor.close()
+
+    async def _responder(self, metodo, objetivo, cabeceras, lector):
+        try:
+            longitud = int(cabeceras.get("content-length", 0))
+            if longitud > TAMANO_MAX_CUERPO:
+                raise ErrorHTTP(413, "Cuerpo demasiado grande.")
+            cuerpo = None
+            if longitud:
+                try:
+                    cuerpo = json.loads(await lector.readexactly(longitud))
+                except ValueError:
+                    raise ErrorHTTP(400, "El cuerpo no es JSON válido.")
+            partes = urlsplit(objetivo)
+            return await self.despachar(metodo.upper(), partes.path.rstrip("/") or "/",
+                                        parse_qs(partes.query), cuerpo)
+        except ErrorHTTP as e:
+            return e.estado, {"error": e.mensaje}
+        except ErrorValidacion as e:
+            return 400, {"error": e.mensaje, "campo": e.campo}
+        except ErrorOperacion as e:
+            return 409, {"error": str(e)}
+        except Exception as e:
+            return 500, {"error": f"Error interno: {e}"}
+
+    async def servir(self, host, puerto):
+        self.escritor.iniciar()
+        servidor = await asyncio.start_server(self.atender, host, puerto)
+        print(f"Servidor del club escuchando en http://{host}:{puerto}")
+        try:
+            async with servidor:
+                await servidor.serve_forever()
+        finally:
+            await self.escritor.detener()
+            self.lectores.shutdown(wait=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="API HTTP/JSON local para varios puestos de recepción.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8080)
+    parser.add_argument("--lectores", type=int, default=4,
+                        help="Hilos con conexión de lectura")
+    parser.add_argument("--db", help="Ruta de la base de datos")
+    args = parser.parse_args()
+
+    if args.db:
+        conexion_db.configurar_ruta_db(args.db)
+    try:
+        asyncio.run(ServidorClub(args.lectores).servir(args.host, args.puerto))
+    except KeyboardInterrupt:
+        print("Servidor detenido.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+# tickets.py
+import os
+
+from conexion_db import transaccion
+from dinero import Dinero
+from trazas import trazar
+
+DIRECTORIO_TICKETS = 'tickets'
+TAMANO_MAX_SEGMENTO = 4 * 1024 * 1024  # 4 MB por archivo de segmento
+
+
+def renderizar_ticket(dni, monto, tipo_pago, metodo_pago, fecha_pago, fecha_vencimiento, tipo_persona):
+    return f"""
+            ===========================================
+                    TICKET DE PAGO
+            ===========================================
+            DNI: {dni}
+            Tipo de Persona: {tipo_persona}
+            Tipo de Pago: {tipo_pago}
+            Método de Pago: {metodo_pago}
+            Monto Pagado: ${Dinero(monto):.2f}
+            Fecha de Pago: {fecha_pago}
+            Fecha de Vencimiento: {fecha_vencimiento}
+            ===========================================
+            ¡Gracias por realizar el pago!
+            ===========================================
+            """
+
+
+class AlmacenTickets:
+    # Los tickets se agregan al final de archivos de segmento; la tabla
+    # `tickets` guarda dónde quedó cada uno, por id de pago y por DNI.
+    def __init__(self, directorio=DIRECTORIO_TICKETS, tamano_max_segmento=TAMANO_MAX_SEGMENTO):
+        self.directorio = directorio
+        self.tamano_max_segmento = tamano_max_segmento
+        self._segmento = None
+
+    def _ruta_segmento(self, segmento):
+        return os.path.join(self.directorio, f"segmento_{segmento:05d}.txt")
+
+    def _segmento_actual(self):
+        if self._segmento is None:
+            os.makedirs(self.directorio, exist_ok=True)
+            numeros = [int(nombre[9:14]) for nombre in os.listdir(self.directorio)
+                       if nombre.startswith("segmento_") and nombre.endswith(".txt")]
+            self._segmento = max(numeros, default=1)
+        try:
+            if os.path.getsize(self._ruta_segmento(self._segmento)) >= self.tamano_max_segmento:
+                self._segmento += 1
+        except FileNotFoundError:
+            pass
+        return self._segmento
+
+    def _agregar(self, datos):
+        segmento = self._segmento_actual()
+        descriptor = os.open(self._ruta_segmento(segmento),
+                             os.O_WRONLY | os.O_CREAT | os.O_APPEND | getattr(os, 'O_BINARY', 0), 0o644)
+        try:
+            # Con O_APPEND la escritura queda al final aunque otro puesto esté escribiendo
+            os.write(descriptor, datos)
+            fin = os.lseek(descriptor, 0, os.SEEK_CUR)
+        finally:
+            os.close(descriptor)
+        return segmento, fin - len(datos)
+
+    @trazar("ticket")
+    def guardar(self, conexion, pago_id, dni, ticket):
+        datos = ticket.encode('utf-8')
+        segmento, desplazamiento = self._agregar(datos)
+        with transaccion(conexion):
+            conexion.execute("""
+                INSERT OR REPLACE INTO tickets (pago_id, dni, segmento, desplazamiento, longitud)
+                VALUES (?, ?, ?, ?, ?)
+            """, (pago_id, dni, segmento, desplazamiento, len(datos)))
+        return self._ruta_segmento(segmento)
+
+    @trazar("tickets_lote")
+    def guardar_lote(self, conexion, tickets):
+        # tickets: [(pago_id, dni, texto)]. Se escriben en bloques de hasta un
+        # segmento y se indexan todos en una sola transacción.
+        indices = []
+        bloque = []
+        tamano_bloque = 0
+        for pago_id, dni, ticket in tickets:
+            datos = ticket.encode('utf-8')
+            bloque.append((pago_id, dni, datos))
+            tamano_bloque += len(datos)
+            if tamano_bloque >= self.tamano_max_segmento:
+                indices.extend(self._agregar_bloque(bloque))
+                bloque = []
+                tamano_bloque = 0
+        if bloque:
+            indices.extend(self._agregar_bloque(bloque))
+        with transaccion(conexion):
+            conexion.executemany("""
+                INSERT OR REPLACE INTO tickets (pago_id, dni, segmento, desplazamiento, longitud)
+                VALUES (?, ?, ?, ?, ?)
+            """, indices)
+        return len(indices)
+
+    def _agregar_bloque(self, bloque):
+        segmento, desplazamiento = self._agregar(b"".join(datos for _, _, datos in bloque))
+        for pago_id, dni, datos in bloque:
+            yield pago_id, dni, segmento, desplazamiento, len(datos)
+            desplazamiento += len(datos)
+
+    def obtener(self, conexion, pago_id):
+        fila = conexion.execute(
+            "SELECT segmento, desplazamiento, longitud FROM tickets WHERE pago_id = ?", (pago_id,)).fetchone()
+        if not fila:
+            return None
+        segmento, desplazamiento, longitud = fila
+        with open(self._ruta_segmento(segmento), 'rb') as archivo:
+            archivo.seek(desplazamiento)
+            return archivo.read(longitud).decode('utf-8')
+
+    def listar_por_dni(self, conexion, dni):
+        cursor = conexion.execute("""
+            SELECT t.pago_id, r.tipo_pago, r.fecha_pago, r.monto
+            FROM tickets t
+            LEFT JOIN rendicion_cuentas r ON r.id = t.pago_id
+            WHERE t.dni = ?
+            ORDER BY t.pago_id DESC
+        """, (dni,))
+        return [(pago_id, tipo_pago, fecha_pago, None if monto is None else Dinero(monto))
+                for pago_id, tipo_pago, fecha_pago, monto in cursor]
@@ -0,0 +1,244 @@
+# trazas.py
+# Tiempos por acción de los menús. Se activa con CLUB_TRAZAS=1; apagadas,
+# trazar() devuelve la función sin tocar y traza() un contexto vacío.
+# Cada acción del menú es un tramo raíz; lo que hace adentro (base de datos,
+# tickets, reportes) son tramos hijos. Otras variables:
+#   CLUB_TRAZAS_LOG        archivo del registro rotativo (trazas.log)
+#   CLUB_TRAZAS_VOLCAR     cada cuántas acciones se escriben los histogramas (50)
+# Los procesos de trabajo (ProcessPoolExecutor) no escriben el registro: varios
+# procesos rotando el mismo archivo lo pisan. Se crean con
+# initializer=iniciar_proceso_de_trabajo, devuelven recolectados() junto con su
+# resultado y el proceso principal los suma con incorporar().
+import atexit
+import contextlib
+import functools
+import os
+import threading
+import time
+from collections import deque
+
+ACTIVADAS = os.environ.get("CLUB_TRAZAS", "").lower() in ("1", "si", "true")
+RUTA_LOG = os.environ.get("CLUB_TRAZAS_LOG", "trazas.log")
+VOLCAR_CADA = int(os.environ.get("CLUB_TRAZAS_VOLCAR", "50"))
+TAMANO_MAX_LOG = 1024 * 1024  # 1 MB por archivo, se guardan 5 anteriores
+ARCHIVOS_ANTERIORES = 5
+MUESTRAS_POR_TRAMO = 1024
+LIMITES_MS = (1, 10, 100, 1000, 10000)
+
+_local = threading.local()
+_candado = threading.Lock()
+_estadisticas = {}
+_acciones = 0
+_registro = None
+_en_trabajo = False
+_recolectados = []
+_NULA = contextlib.nullcontext()
+
+
+class Estadistica:
+    __slots__ = ("cantidad", "maximo", "cubetas", "muestras")
+
+    def __init__(self):
+        self.cantidad = 0
+        self.maximo = 0.0
+        self.cubetas = [0] * (len(LIMITES_MS) + 1)
+        self.muestras = deque(maxlen=MUESTRAS_POR_TRAMO)
+
+    def agregar(self, ms):
+        self.cantidad += 1
+        self.muestras.append(ms)
+        if ms > self.maximo:
+            self.maximo = ms
+        cubeta = 0
+        while cubeta < len(LIMITES_MS) and ms >= LIMITES_MS[cubeta]:
+            cubeta += 1
+        self.cubetas[cubeta] += 1
+
+    def percentil(self, p):
+        muestras = sorted(self.muestras)
+        if not muestras:
+            return 0.0
+        return muestras[min(len(muestras) - 1, int(len(muestras) * p))]
+
+
+class _Tramo:
+    __slots__ = ("ruta", "inicio", "hijos", "error")
+
+    def __init__(self, nombre):
+        pila = _pila()
+        self.ruta = f"{pila[-1].ruta}/{nombre}" if pila else nombre
+        self.hijos = None
+        self.error = False
+
+    def __enter__(self):
+        _pila().append(self)
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, tipo, valor, rastro):
+        ms = (time.perf_counter() - self.inicio) * 1000
+        pila = _pila()
+        pila.pop()
+        self.error = tipo is not None
+        if _en_trabajo:
+            # hijos queda en None para los tramos hijos; el raíz lleva los suyos
+            _recolectados.append((self.ruta, ms, self.error, None if pila else (self.hijos or {})))
+        else:
+            _anotar(self.ruta, ms)
+        if pila:
+            _sumar_hijo(pila[0], self.ruta, ms)
+        elif not _en_trabajo:
+            _registrar_accion(self.ruta, ms, self.error, self.hijos)
+        return False
+
+
+def _pila():
+    pila = getattr(_local, "pila", None)
+    if pila is None:
+        pila = _local.pila = []
+    return pila
+
+
+def _anotar(ruta, ms):
+    with _candado:
+        estadistica = _estadisticas.get(ruta)
+        if estadistica is None:
+            estadistica = _estadisticas[ruta] = Estadistica()
+        estadistica.agregar(ms)
+
+
+def _sumar_hijo(raiz, ruta, ms):
+    # Los hijos se acumulan en el tramo raíz para una sola línea por acción
+    if raiz.hijos is None:
+        raiz.hijos = {}
+    cantidad, total = raiz.hijos.get(ruta, (0, 0.0))
+    raiz.hijos[ruta] = (cantidad + 1, total + ms)
+
+
+def _registro_listo():
+    global _registro
+    if _registro is None:
+        # logging se carga con la primera acción registrada: no suma al arranque
+        import logging.handlers
+        registro = logging.getLogger("club.trazas")
+        if not registro.handlers:
+            manejador = logging.handlers.RotatingFileHandler(
+                RUTA_LOG, maxBytes=TAMANO_MAX_LOG, backupCount=ARCHIVOS_ANTERIORES, encoding="utf-8")
+            manejador.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            registro.addHandler(manejador)
+            registro.setLevel(logging.INFO)
+            registro.propagate = False
+        _registro = registro
+    return _registro
+
+
+def _registrar_accion(ruta_accion, ms, error, hijos):
+    global _acciones
+    mensaje = f"{ruta_accion} {ms:.1f} ms" + (" (error)" if error else "")
+    if hijos:
+        prefijo = len(ruta_accion) + 1
+        mensaje += " | " + "; ".join(
+            f"{ruta[prefijo:]} {total:.1f} ms" + (f" x{cantidad}" if cantidad > 1 else "")
+            for ruta, (cantidad, total) in hijos.items())
+    _registro_listo().info(mensaje)
+
+    with _candado:
+        _acciones += 1
+        volcar = VOLCAR_CADA > 0 and _acciones % VOLCAR_CADA == 0
+    if volcar:
+        volcar_histogramas()
+
+
+def traza(nombre):
+    # with traza("reporte"): ...
+    return _Tramo(nombre) if ACTIVADAS else _NULA
+
+
+def trazar(nombre=None):
+    # Decorador: el tramo lleva el nombre de la función si no se indica otro
+    def decorador(funcion):
+        if not ACTIVADAS:
+            return funcion
+        etiqueta = nombre or funcion.__name__
+
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            with _Tramo(etiqueta):
+                return funcion(*args, **kwargs)
+        return envoltura
+    return decorador
+
+
+def trazar_metodos(prefijo):
+    # Decorador de clase: un tramo "prefijo.metodo" por cada método público
+    def decorador(clase):
+        if not ACTIVADAS:
+            return clase
+        for nombre, valor in list(vars(clase).items()):
+            if not nombre.startswith("_") and callable(valor):
+                setattr(clase, nombre, trazar(f"{prefijo}.{nombre}")(valor))
+        return clase
+    return decorador
+
+
+def iniciar_proceso_de_trabajo():
+    # initializer de ProcessPoolExecutor. Con fork el proceso hereda la pila
+    # del que lo creó: se vacía para que sus tramos empiecen en la raíz
+    global _en_trabajo
+    _en_trabajo = True
+    _local.pila = []
+    _recolectados.clear()
+
+
+def recolectados():
+    # Tramos cerrados en este proceso de trabajo desde la última llamada, en el
+    # orden en que terminaron; fuera de un proceso de trabajo la lista es vacía
+    tramos = list(_recolectados)
+    _recolectados.clear()
+    return tramos
+
+
+def incorporar(tramos):
+    # Suma los tramos de un proceso de trabajo como hijos del tramo abierto; sin
+    # tramo abierto, cada raíz del proceso de trabajo cuenta como una acción
+    pila = _pila()
+    prefijo = f"{pila[-1].ruta}/" if pila else ""
+    for ruta, ms, error, hijos in tramos:
+        ruta = prefijo + ruta
+        _anotar(ruta, ms)
+        if pila:
+            _sumar_hijo(pila[0], ruta, ms)
+        elif hijos is not None:
+            _registrar_accion(ruta, ms, error, hijos)
+
+
+def histogramas():
+    # [(ruta, cantidad, p50_ms, p95_ms, p99_ms, max_ms, cubetas)] ordenado por ruta
+    with _candado:
+        return sorted((ruta, e.cantidad, e.percentil(0.50), e.percentil(0.95), e.percentil(0.99),
+                       e.maximo, list(e.cubetas))
+                      for ruta, e in _estadisticas.items())
+
+
+def volcar_histogramas():
+    filas = histogramas()
+    if not filas or _en_trabajo:
+        return
+    etiquetas = [f"<{limite}ms" for limite in LIMITES_MS] + [f">={LIMITES_MS[-1]}ms"]
+    lineas = ["histogramas por acción:"]
+    for ruta, cantidad, p50, p95, p99, maximo, cubetas in filas:
+        lineas.append(
+            f"    {ruta} n={cantidad} p50={p50:.1f} p95={p95:.1f} p99={p99:.1f} máx={maximo:.1f} ms "
+            + " ".join(f"{etiqueta}:{n}" for etiqueta, n in zip(etiquetas, cubetas) if n))
+    _registro_listo().info("\n".join(lineas))
+
+
+def reiniciar():
+    global _acciones
+    with _candado:
+        _estadisticas.clear()
+        _acciones = 0
+
+
+if ACTIVADAS:
+    atexit.register(volcar_histogramas)
@@ -0,0 +1,195 @@
+# validaciones.py
+import re
+from datetime import datetime
+
+from catalogo import CATALOGO
+from dinero import Dinero
+
+# Patrones compilados una sola vez y compartidos por formularios e importación
+PATRON_DNI = re.compile(r"^\d{7,8}$")
+PATRON_NOMBRE = re.compile("^[a-zA-ZáéíóúÁÉÍÓÚñÑ ]+$")
+# Los deportes admiten números: "Futbol 5"
+PATRON_DEPORTE = re.compile("^[a-zA-ZáéíóúÁÉÍÓÚñÑ0-9 ]+$")
+PATRON_TELEFONO = re.compile(r"^\d{7,}$")
+PATRON_EMAIL = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+METODOS_PAGO = ('Efectivo', 'Credito', 'Debito', 'Transferencia')
+
+
+class ErrorValidacion(ValueError):
+    def __init__(self, campo, mensaje):
+        super().__init__(mensaje)
+        self.campo = campo
+        self.mensaje = mensaje
+
+
+# Reglas de cada tipo de dato. Reciben el texto ingresado y devuelven el valor
+# normalizado, o lanzan ValueError con el mensaje para el operador.
+
+def validar_dni(dni):
+    dni = dni.strip()
+    if not PATRON_DNI.match(dni):
+        raise ValueError(
+            "El DNI debe contener solo números y tener entre 7 y 8 dígitos.")
+    return dni
+
+
+def validar_nombre(valor, etiqueta="nombre"):
+    valor = valor.strip().capitalize()
+    if not PATRON_NOMBRE.match(valor) or len(valor) < 2:
+        raise ValueError(
+            f"El {etiqueta} debe contener solo letras (incluyendo tildes y ñ) y tener al menos 2 caracteres.")
+    return valor
+
+
+def validar_nombre_deporte(nombre):
+    nombre = nombre.strip().capitalize()
+    if not PATRON_DEPORTE.match(nombre) or len(nombre) < 2:
+        raise ValueError(
+            "El nombre del deporte debe contener solo letras, números y espacios, y tener al menos 2 caracteres.")
+    return nombre
+
+
+def validar_telefono(telefono):
+    telefono = telefono.strip()
+    if not PATRON_TELEFONO.match(telefono):
+        raise ValueError(
+            "El teléfono debe contener solo números y tener al menos 7 dígitos.")
+    return telefono
+
+
+def validar_domicilio(domicilio):
+    domicilio = domicilio.strip().capitalize()
+    if len(domicilio) < 5:
+        raise ValueError("El domicilio debe tener al menos 5 caracteres.")
+    return domicilio
+
+
+def validar_email(email):
+    email = email.strip()
+    if not PATRON_EMAIL.match(email):
+        raise ValueError("El formato del email es incorrecto.")
+    return email
+
+
+def validar_fecha(fecha):
+    try:
+        return datetime.strptime(fecha.strip(), "%d/%m/%Y").date()
+    except ValueError:
+        raise ValueError("Formato de fecha inválido. Debe ser dd/mm/yyyy.")
+
+
+def validar_monto(monto, etiqueta="monto"):
+    # Devuelve el importe en centavos (Dinero)
+    try:
+        valor = Dinero.desde_pesos(monto)
+    except ValueError:
+        raise ValueError(f"El {etiqueta} debe ser un número.")
+    if valor <= 0:
+        raise ValueError(f"El {etiqueta} debe ser un número positivo.")
+    return valor
+
+
+def validar_metodo_pago(metodo_pago):
+    metodo_pago = metodo_pago.strip().capitalize()
+    if metodo_pago not in METODOS_PAGO:
+        raise ValueError(
+            f"Método de pago no válido. Debe ser uno de: {', '.join(METODOS_PAGO)}.")
+    return metodo_pago
+
+
+def validar_deporte(deporte):
+    # Los deportes válidos son los del catálogo (tabla deportes)
+    return CATALOGO.validar(deporte)
+
+
+class Campo:
+    def __init__(self, validador, **parametros):
+        self.validador = validador
+        self.parametros = parametros
+
+    def validar(self, valor):
+        return self.validador(valor if valor is not None else "", **self.parametros)
+
+
+# Esquemas de registro: campo -> regla. El orden de los campos es el de las columnas.
+ESQUEMAS = {
+    "socio": {
+        "dni": Campo(validar_dni),
+        "nombre": Campo(validar_nombre),
+        "apellido": Campo(validar_nombre, etiqueta="apellido"),
+        "domicilio": Campo(validar_domicilio),
+        "telefono": Campo(validar_telefono),
+        "email": Campo(validar_email),
+        "fecha_inscripcion": Campo(validar_fecha),
+        "cuota_social": Campo(validar_monto, etiqueta="cuota social"),
+        "metodo_pago": Campo(validar_metodo_pago),
+    },
+    "no_socio": {
+        "dni": Campo(validar_dni),
+        "nombre": Campo(validar_nombre),
+        "apellido": Campo(validar_nombre, etiqueta="apellido"),
+        "telefono": Campo(validar_telefono),
+        "email": Campo(validar_email),
+    },
+    "invitado": {
+        "socio_dni": Campo(validar_dni),
+        "dni": Campo(validar_dni),
+        "nombre": Campo(validar_nombre),
+        "apellido": Campo(validar_nombre, etiqueta="apellido"),
+    },
+    "profesor": {
+        "dni": Campo(validar_dni),
+        "nombre": Campo(validar_nombre),
+        "apellido": Campo(validar_nombre, etiqueta="apellido"),
+        "telefono": Campo(validar_telefono),
+        "domicilio": Campo(validar_domicilio),
+        "fecha_ingreso": Campo(validar_fecha),
+        "deporte": Campo(validar_deporte),
+    },
+    "deporte": {
+        "nombre": Campo(validar_nombre_deporte),
+    },
+    "pago": {
+        "dni": Campo(validar_dni),
+        "deporte": Campo(validar_deporte),
+        "metodo_pago": Campo(validar_metodo_pago),
+    },
+}
+
+
+def validar_campo(esquema, campo, valor):
+    # Valida un solo dato; lanza ErrorValidacion con el nombre del campo
+    try:
+        return ESQUEMAS[esquema][campo].validar(valor)
+    except ValueError as e:
+        raise ErrorValidacion(campo, str(e)) from None
+
+
+def validar_registro(esquema, datos):
+    # Devuelve (valores_normalizados, errores) con errores = {campo: mensaje}
+    valores = {}
+    errores = {}
+    for campo, regla in ESQUEMAS[esquema].items():
+        try:
+            valores[campo] = regla.validar(datos.get(campo))
+        except ValueError as e:
+            errores[campo] = str(e)
+    return valores, errores
+
+
+def validar_lote(esquema, registros):
+    # Acepta una lista de registros (dicts) o columnas {campo: [valores]}.
+    # Devuelve (validos, rechazados): [(indice, valores)] y [(indice, errores)].
+    if isinstance(registros, dict):
+        campos = list(registros)
+        registros = (dict(zip(campos, fila)) for fila in zip(*registros.values()))
+    validos = []
+    rechazados = []
+    for indice, datos in enumerate(registros):
+        valores, errores = validar_registro(esquema, datos)
+        if errores:
+            rechazados.append((indice, errores))
+        else:
+            validos.append((indice, valores))
+    return validos, rechazados
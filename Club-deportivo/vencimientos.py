@@ -0,0 +1,138 @@
+# vencimientos.py
+import argparse
+from collections import namedtuple
+from datetime import date
+
+from conexion_db import obtener_conexion, transaccion
+from dinero import Dinero
+from fechas import a_dia, a_fecha
+from validaciones import validar_campo
+
+DIAS_RENOVACION = 30
+CONCEPTOS = ("social", "deportiva")
+TAMANO_LOTE = 1000
+
+Vencimiento = namedtuple("Vencimiento", "dni concepto fecha_vencimiento monto")
+
+# Ambas consultas recorren el índice de fecha_vencimiento desde el principio
+# hasta la fecha límite: solo se leen las filas vencidas o por vencer.
+CONSULTA_SOCIALES = """
+    SELECT dni, 'Cuota Social', fecha_vencimiento, cuota_social
+    FROM socios
+    WHERE fecha_vencimiento <= ?
+    ORDER BY fecha_vencimiento
+"""
+
+CONSULTA_DEPORTIVAS = """
+    SELECT dni_socio, 'Cuota ' || nombre, fecha_vencimiento, cuota
+    FROM inscripciones
+    WHERE fecha_vencimiento <= ?
+    ORDER BY fecha_vencimiento
+"""
+
+# Renovación en bloque: la nueva fecha se cuenta desde el vencimiento si aún no
+# pasó, o desde la fecha de pago si ya estaba vencida. Las fechas son números
+# de día (ver fechas.py): sumar la extensión es una suma entera. El tipo de
+# persona sale de la vista personas, la misma clasificación que definió el
+# descuento de i.cuota al inscribirse.
+RENOVAR_SOCIALES = ("""
+    INSERT INTO rendicion_cuentas (dni, monto, tipo_pago, metodo_pago, fecha_pago, tipo_persona, fecha_vencimiento)
+    SELECT dni, cuota_social, 'Cuota Social', :metodo_pago, :fecha_pago, 'Socio',
+           max(fecha_vencimiento, :fecha_pago) + :extension
+    FROM socios
+    WHERE fecha_vencimiento <= :limite
+""", """
+    UPDATE socios SET fecha_vencimiento = max(fecha_vencimiento, :fecha_pago) + :extension
+    WHERE fecha_vencimiento <= :limite
+""")
+
+RENOVAR_DEPORTIVAS = ("""
+    INSERT INTO rendicion_cuentas (dni, monto, tipo_pago, metodo_pago, fecha_pago, tipo_persona, fecha_vencimiento)
+    SELECT i.dni_socio, i.cuota, 'Cuota ' || i.nombre, :metodo_pago, :fecha_pago,
+           COALESCE((SELECT p.tipo FROM personas p WHERE p.dni = i.dni_socio
+                     ORDER BY p.prioridad LIMIT 1), 'No Socio'),
+           max(i.fecha_vencimiento, :fecha_pago) + :extension
+    FROM inscripciones i
+    WHERE i.fecha_vencimiento <= :limite
+""", """
+    UPDATE inscripciones SET fecha_vencimiento = max(fecha_vencimiento, :fecha_pago) + :extension
+    WHERE fecha_vencimiento <= :limite
+""")
+
+
+def _consultas(concepto, sociales, deportivas):
+    if concepto not in (None,) + CONCEPTOS:
+        raise ValueError(f"Concepto no válido: {concepto}")
+    if concepto in (None, "social"):
+        yield sociales
+    if concepto in (None, "deportiva"):
+        yield deportivas
+
+
+def listar_vencimientos(conexion=None, dias=0, hoy=None, concepto=None):
+    # Cuotas vencidas o que vencen dentro de `dias` días, por fecha
+    conexion = conexion or obtener_conexion()
+    limite = a_dia(hoy or date.today()) + dias
+    for consulta in _consultas(concepto, CONSULTA_SOCIALES, CONSULTA_DEPORTIVAS):
+        cursor = conexion.execute(consulta, (limite,))
+        while True:
+            filas = cursor.fetchmany(TAMANO_LOTE)
+            if not filas:
+                break
+            for dni, concepto_pago, fecha_vencimiento, monto in filas:
+                yield Vencimiento(dni, concepto_pago, a_fecha(fecha_vencimiento), Dinero(monto))
+
+
+def renovar_vencimientos(metodo_pago, conexion=None, dias=0, fecha_pago=None, concepto=None):
+    # Renueva todas las cuotas vencidas o por vencer y registra sus pagos en una
+    # sola transacción. Devuelve (cantidad_renovada, total_cobrado).
+    metodo_pago = validar_campo("pago", "metodo_pago", metodo_pago)
+    fecha_pago = fecha_pago or date.today()
+    parametros = {
+        "metodo_pago": metodo_pago,
+        "fecha_pago": a_dia(fecha_pago),
+        "extension": DIAS_RENOVACION,
+        "limite": a_dia(fecha_pago) + dias,
+    }
+    cantidad = 0
+    with transaccion(conexion) as conexion:
+        primer_pago = conexion.execute(
+            "SELECT COALESCE(MAX(id), 0) FROM rendicion_cuentas").fetchone()[0]
+        for insertar, actualizar in _consultas(concepto, RENOVAR_SOCIALES, RENOVAR_DEPORTIVAS):
+            cantidad += conexion.execute(insertar, parametros).rowcount
+            conexion.execute(actualizar, parametros)
+        total = conexion.execute(
+            "SELECT COALESCE(SUM(monto), 0) FROM rendicion_cuentas WHERE id > ?",
+            (primer_pago,)).fetchone()[0]
+    return cantidad, Dinero(total)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cuotas vencidas y por vencer.")
+    subcomandos = parser.add_subparsers(dest="accion", required=True)
+    listar = subcomandos.add_parser("listar", help="Listar cuotas vencidas o por vencer")
+    renovar = subcomandos.add_parser("renovar", help="Renovar en bloque y registrar los pagos")
+    for subcomando in (listar, renovar):
+        subcomando.add_argument("--dias", type=int, default=0,
+                                help="Incluir las que vencen dentro de estos días")
+        subcomando.add_argument("--concepto", choices=CONCEPTOS)
+    renovar.add_argument("--metodo", default="Efectivo", help="Método de pago")
+    args = parser.parse_args()
+
+    if args.accion == "listar":
+        hoy = date.today()
+        cantidad = 0
+        for vencimiento in listar_vencimientos(dias=args.dias, concepto=args.concepto):
+            estado = "VENCIDA" if vencimiento.fecha_vencimiento < hoy else "por vencer"
+            print(f"{vencimiento.dni}\t{vencimiento.concepto}\t"
+                  f"{vencimiento.fecha_vencimiento.strftime('%d/%m/%Y')}\t"
+                  f"${vencimiento.monto:.2f}\t{estado}")
+            cantidad += 1
+        print(f"{cantidad} cuotas vencidas o por vencer.")
+    else:
+        cantidad, total = renovar_vencimientos(args.metodo, dias=args.dias, concepto=args.concepto)
+        print(f"{cantidad} cuotas renovadas por un total de ${total:.2f}.")
+
+
+if __name__ == "__main__":
+    main()